@@ -0,0 +1,156 @@
+"""
+Benchmark da decodificação IBM float (formato SEG-Y 1).
+
+Compara o caminho atual do obspy (_read_segy + np.array dos traços) com o
+leitor mapeado + ibm_float.ibm_to_ieee nos arquivos de Data/Sismica Ativa,
+convertidos para IBM float em um diretório temporário, e o decodificador
+isolado contra obspy.io.segy.unpack em um buffer sintético.
+
+Uso:
+    python benchmarks/bench_ibm.py [--data-dir DIR] [--repeat N] [--synthetic-mb MB] [--json SAIDA]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from seispro.ibm_float import ibm_to_ieee, ieee_to_ibm  # noqa: E402
+from seispro.segy_mmap import open_segy_memmap  # noqa: E402
+from seispro.segy_scan import list_segy_paths, scan_segy_header  # noqa: E402
+
+
+def convert_to_ibm(src_path, dst_path):
+    """
+    Copia um SEG-Y trocando as amostras por IBM float e o código de formato para 1.
+    """
+    data, _, info = open_segy_memmap(src_path)
+    buf = np.fromfile(src_path, dtype=np.uint8)
+    traces = buf[info['data_offset']:].view(np.dtype({
+        'names': ['data'],
+        'formats': [('>u4', (info['num_samples'],))],
+        'offsets': [240],
+        'itemsize': info['trace_size'],
+    }))
+    traces['data'] = ieee_to_ibm(np.asarray(data, dtype=np.float64))
+    buf[3224:3226] = np.frombuffer(np.array(1, dtype='>i2').tobytes(), dtype=np.uint8)
+    buf.tofile(dst_path)
+
+
+def measure(func, repeat):
+    """
+    Retorna (melhor tempo em s, pico de memória em bytes) de func().
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def bench_files(paths, repeat):
+    from obspy.io.segy.segy import _read_segy
+
+    sample_bytes = 0
+    for path in paths:
+        info = scan_segy_header(path)
+        sample_bytes += info['num_traces'] * (info['trace_size'] - 240)
+
+    def obspy_path():
+        for path in paths:
+            segy_file = _read_segy(path)
+            np.array([trace.data for trace in segy_file.traces])
+
+    def memmap_path():
+        for path in paths:
+            data, _, _ = open_segy_memmap(path)
+            np.asarray(data)
+
+    results = []
+    for name, func in (('obspy _read_segy', obspy_path), ('memmap + ibm_to_ieee', memmap_path)):
+        seconds, peak = measure(func, repeat)
+        results.append({
+            'case': f"arquivos: {name}",
+            'files': len(paths),
+            'megabytes': sample_bytes / 1e6,
+            'seconds': seconds,
+            'mb_per_s': sample_bytes / 1e6 / seconds,
+            'peak_memory_mb': peak / 1e6,
+        })
+    return results
+
+
+def bench_decoder(megabytes, repeat):
+    from obspy.io.segy.unpack import unpack_4byte_ibm
+
+    count = int(megabytes * 1e6) // 4
+    rng = np.random.default_rng(0)
+    raw = ieee_to_ibm(rng.standard_normal(count).astype(np.float32) * 1e3).astype('>u4').tobytes()
+    out = np.empty(count, dtype=np.float32)
+
+    cases = (
+        ('obspy unpack_4byte_ibm', lambda: unpack_4byte_ibm(io.BytesIO(raw), count, '>')),
+        ('ibm_to_ieee', lambda: ibm_to_ieee(raw)),
+        ('ibm_to_ieee (out=)', lambda: ibm_to_ieee(raw, out=out)),
+    )
+    results = []
+    for name, func in cases:
+        seconds, peak = measure(func, repeat)
+        results.append({
+            'case': f"decodificador: {name}",
+            'files': 0,
+            'megabytes': len(raw) / 1e6,
+            'seconds': seconds,
+            'mb_per_s': len(raw) / 1e6 / seconds,
+            'peak_memory_mb': peak / 1e6,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da decodificação IBM float.")
+    parser.add_argument('--data-dir', default=os.path.join(ROOT, 'Data', 'Sismica Ativa'))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--synthetic-mb', type=float, default=64.0)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ibm_paths = []
+        for path in list_segy_paths(args.data_dir):
+            dst_path = os.path.join(tmp_dir, os.path.basename(path))
+            convert_to_ibm(path, dst_path)
+            ibm_paths.append(dst_path)
+        if ibm_paths:
+            results += bench_files(ibm_paths, args.repeat)
+    results += bench_decoder(args.synthetic_mb, args.repeat)
+
+    print(f"{'caso':<42} {'MB':>9} {'tempo (s)':>10} {'MB/s':>9} {'pico (MB)':>10}")
+    for r in results:
+        print(f"{r['case']:<42} {r['megabytes']:>9.2f} {r['seconds']:>10.4f} {r['mb_per_s']:>9.1f} {r['peak_memory_mb']:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
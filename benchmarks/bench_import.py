@@ -0,0 +1,123 @@
+"""
+Benchmark do tempo de inicialização da linha de comando.
+
+Mede `python -X importtime -c "import seispro.cli"` (tempo acumulado de cada
+módulo importado) e o tempo total de `python -m seispro --help`, e falha se a
+inicialização passar do limite ou se algum módulo pesado (numpy, matplotlib,
+obspy, scipy, rich) for importado antes de uma etapa precisar dele.
+
+Uso:
+    python benchmarks/bench_import.py [--repeat N] [--max-ms MS] [--top N] [--json SAIDA]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+
+HEAVY_MODULES = ('numpy', 'matplotlib', 'obspy', 'scipy', 'rich')
+
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC + os.pathsep + env.get('PYTHONPATH', '')
+    env.pop('PYTHONIMPORTTIME', None)
+    return env
+
+
+def parse_importtime(stderr):
+    """
+    Converte a saída de -X importtime em {módulo: (próprio µs, acumulado µs)}.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        modules[name] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def measure_importtime(module, repeat):
+    """
+    Retorna o resultado de -X importtime da execução com menor tempo acumulado de `module`.
+    """
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            env=_env(), capture_output=True, text=True, check=True,
+        )
+        modules = parse_importtime(proc.stderr)
+        if best is None or modules[module][1] < best[module][1]:
+            best = modules
+    return best
+
+
+def measure_command(args, repeat):
+    """
+    Retorna o melhor tempo de parede (s) de `python args`.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, env=_env(), capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização do seispro.")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=150.0, help="Limite para `python -m seispro --help` (ms)")
+    parser.add_argument('--top', type=int, default=10, help="Quantos módulos mais lentos mostrar")
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args()
+
+    modules = measure_importtime('seispro.cli', args.repeat)
+    baseline = measure_command(['-c', 'pass'], args.repeat)
+    help_seconds = measure_command(['-m', 'seispro', '--help'], args.repeat)
+    heavy = sorted({name.split('.')[0] for name in modules} & set(HEAVY_MODULES))
+
+    print(f"{'módulo':<40} {'próprio (ms)':>13} {'acumulado (ms)':>15}")
+    slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (own, cumulative) in slowest:
+        print(f"{name:<40} {own / 1000:>13.2f} {cumulative / 1000:>15.2f}")
+    print()
+    print(f"import seispro.cli (acumulado): {modules['seispro.cli'][1] / 1000:.2f} ms")
+    print(f"python -c pass:                 {baseline * 1000:.2f} ms")
+    print(f"python -m seispro --help:       {help_seconds * 1000:.2f} ms (limite {args.max_ms:g} ms)")
+
+    failures = []
+    if heavy:
+        failures.append(f"módulos pesados importados na inicialização: {', '.join(heavy)}")
+    if help_seconds * 1000 > args.max_ms:
+        failures.append(f"--help levou {help_seconds * 1000:.1f} ms, acima do limite de {args.max_ms:g} ms")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'import_cli_ms': modules['seispro.cli'][1] / 1000,
+                'interpreter_ms': baseline * 1000,
+                'help_ms': help_seconds * 1000,
+                'max_ms': args.max_ms,
+                'heavy_modules': heavy,
+                'modules': {name: {'self_us': own, 'cumulative_us': cumulative} for name, (own, cumulative) in modules.items()},
+                'failures': failures,
+            }, f, indent=2, ensure_ascii=False)
+
+    for failure in failures:
+        print(f"FALHA: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
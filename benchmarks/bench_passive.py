@@ -0,0 +1,108 @@
+"""
+Benchmark do modo passivo (seispro.passive).
+
+Processa um registro contínuo sintético (ruído com eventos esparsos) de N
+canais a 500 Hz, janela a janela, e informa quantas vezes mais rápido que o
+tempo real o processamento roda em um núcleo e quanto levaria um dia inteiro.
+Com --segy o registro é antes gravado em arquivos SEG-Y de um minuto em um
+diretório temporário, para medir também a leitura mapeada.
+
+Uso:
+    python benchmarks/bench_passive.py [--hours H] [--channels N] [--fs HZ] [--window S] [--segy] [--json SAIDA]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from seispro.passive import PassiveProcessor, iter_windows, list_passive_paths, open_window_stream  # noqa: E402
+from seispro.segy_write import write_segy  # noqa: E402
+
+SEGMENT_SECONDS = 60
+
+
+def synthetic_segments(hours, channels, fs, seed=0):
+    """
+    Segmentos de um minuto: ruído gaussiano com um evento de 10 Hz a cada ~5 min.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(SEGMENT_SECONDS * fs)
+    t = np.arange(n) / fs
+    for _ in range(int(hours * 3600 / SEGMENT_SECONDS)):
+        block = rng.standard_normal((channels, n), dtype=np.float32)
+        if rng.random() < SEGMENT_SECONDS / 300:
+            onset = rng.uniform(5, SEGMENT_SECONDS - 10)
+            event = np.exp(-np.maximum(t - onset, 0) / 2) * np.sin(2 * np.pi * 10 * t) * (t >= onset)
+            block += (20 * event).astype(np.float32)
+        yield fs, block
+
+
+def run(windows, channels, fs):
+    processor = PassiveProcessor(channels, fs, 1.0, 20.0)
+    start = time.perf_counter()
+    count = 0
+    for window in windows:
+        processor.process(window)
+        count += 1
+    return time.perf_counter() - start, count, processor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do processamento passivo em janelas.")
+    parser.add_argument('--hours', type=float, default=1.0)
+    parser.add_argument('--channels', type=int, default=24)
+    parser.add_argument('--fs', type=float, default=500.0)
+    parser.add_argument('--window', type=float, default=10.0, help="Janela em segundos")
+    parser.add_argument('--segy', action='store_true', help="Lê o registro de arquivos SEG-Y temporários")
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    if args.segy:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i, (fs, block) in enumerate(synthetic_segments(args.hours, args.channels, args.fs)):
+                write_segy(os.path.join(tmp_dir, f"{i:05d}.SEGY"), block, int(round(1e6 / fs)))
+            fs, channels, windows = open_window_stream(list_passive_paths(tmp_dir), args.window)
+            seconds, count, processor = run(windows, channels, fs)
+        case = 'SEG-Y mapeado'
+    else:
+        # os segmentos são gerados antes, para medir só o processamento
+        segments = list(synthetic_segments(args.hours, args.channels, args.fs))
+        seconds, count, processor = run(iter_windows(iter(segments), int(args.window * args.fs)), args.channels, args.fs)
+        case = 'memória'
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    realtime = processor.seconds / seconds
+    result = {
+        'case': case,
+        'channels': args.channels,
+        'fs': args.fs,
+        'record_hours': processor.seconds / 3600,
+        'windows': count,
+        'seconds': seconds,
+        'samples_per_s': processor.samples * args.channels / seconds,
+        'realtime_factor': realtime,
+        'day_seconds': 86400 / realtime,
+        'peak_memory_mb': peak / 1e6,
+    }
+    print(f"{case}: {result['record_hours']:.2f} h x {args.channels} canais a {args.fs:g} Hz em {seconds:.2f} s")
+    print(f"  {result['samples_per_s'] / 1e6:.1f} M amostras/s, {realtime:.0f}x tempo real, "
+          f"1 dia em {result['day_seconds']:.0f} s, pico {result['peak_memory_mb']:.1f} MB")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
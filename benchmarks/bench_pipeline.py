@@ -0,0 +1,286 @@
+"""
+Benchmark e teste de regressão do pipeline leitura/filtro/gráfico.
+
+Gera um levantamento SEG-Y sintético do tamanho pedido (modelling.write_synthetic_survey)
+e mede, para cada etapa, o melhor tempo de --repeat medidas (etapas rápidas são
+repetidas em laço em cada medida) e o pico de memória alocada (tracemalloc) de
+uma execução extra:
+
+- varredura dos cabeçalhos (scan_segy_header) e índice do diretório a frio;
+- decodificação completa para float32 (read_segy_file);
+- filtro passa-banda + envoltória (filter_and_envelope);
+- espectrograma de todos os traços (stft_power);
+- renderização da colagem com savefig (primeiro arquivo);
+- com --legacy, as funções do src/nSeis.py (read_segy_file com o obspy e a
+  colagem com um Line2D por traço, imshow da matriz inteira e specgram), para
+  comparação.
+
+Com --data-dir os arquivos são copiados para um diretório temporário, para que
+o índice medido a frio não apague o .seispro_index.json do diretório original.
+
+Os resultados vão para JSON com --json. Com --baseline o resultado é comparado
+com um JSON anterior e o script termina com código 1 se alguma etapa ficar mais
+lenta (ou usar mais memória) que o baseline além de --tolerance.
+
+Uso:
+    python benchmarks/bench_pipeline.py [--files N] [--traces N] [--samples N] [--repeat N] [--legacy]
+                                        [--json SAIDA] [--baseline ARQUIVO] [--tolerance FRAÇÃO]
+"""
+
+import argparse
+import ast
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from seispro.filtering import filter_and_envelope  # noqa: E402
+from seispro.modelling import write_synthetic_survey  # noqa: E402
+from seispro.plots import plot_seismic_collage_with_spectrogram  # noqa: E402
+from seispro.reader import read_segy_file  # noqa: E402
+from seispro.segy_index import INDEX_FILE_NAME, load_directory_index  # noqa: E402
+from seispro.segy_scan import list_segy_paths, sampling_parameters, scan_segy_header  # noqa: E402
+from seispro.spectrogram import default_nfft, stft_power  # noqa: E402
+
+# Cada medida repete a etapa até durar pelo menos isto (s), como o timeit
+MIN_TIMING_SECONDS = 0.05
+# Diferenças mínimas para contar como regressão
+MIN_TIME_REGRESSION_S = 0.001
+MIN_MEMORY_REGRESSION_MB = 1.0
+
+
+def measure(func, repeat):
+    """
+    Retorna (melhor tempo por execução em s, pico de memória alocada em MB) de func().
+    Etapas rápidas são repetidas em laço até cada medida passar de MIN_TIMING_SECONDS.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIMING_SECONDS:
+            break
+        number *= 10 if elapsed < MIN_TIMING_SECONDS / 10 else 2
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / (1024 * 1024)
+
+
+def generate_survey(directory, files, traces, samples, sample_interval):
+    """
+    Levantamento sintético: `files` tiros de `traces` receptores a 5 m, com ruído.
+    """
+    receivers = np.arange(traces) * 5.0
+    sources = -5.0 + np.arange(files) * 10.0
+    return write_synthetic_survey(directory, sources, receivers, [500.0, 1500.0, 2500.0], [20.0, 60.0],
+                                  num_samples=samples, sample_interval=sample_interval, noise=0.05)
+
+
+def load_legacy():
+    """
+    Funções do src/nSeis.py. O script no fim do arquivo (que pergunta o arquivo e os
+    parâmetros) não é executado: só os imports e as definições de funções.
+    """
+    path = os.path.join(ROOT, 'src', 'nSeis.py')
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    tree.body = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))]
+    namespace = {'__name__': 'nSeis', '__file__': path}
+    exec(compile(tree, path, 'exec'), namespace)
+    return namespace
+
+
+def copy_data_dir(data_dir, tmp_dir):
+    """
+    Copia os SEG-Y de `data_dir` para um diretório temporário.
+    """
+    directory = os.path.join(tmp_dir, 'dados')
+    os.makedirs(directory)
+    for path in list_segy_paths(data_dir):
+        shutil.copy2(path, directory)
+    return list_segy_paths(directory)
+
+
+def run_cases(paths, repeat, legacy, tmp_dir):
+    directory = os.path.dirname(paths[0])
+    info = scan_segy_header(paths[0])
+    sampling = sampling_parameters(info)
+    fs = sampling['sample_rate']
+    nfft = default_nfft(info['num_samples'])
+    noverlap = nfft * 3 // 4
+    decoded = [np.ascontiguousarray(read_segy_file(path)[0], dtype=np.float32) for path in paths]
+    output_file = os.path.join(tmp_dir, 'colagem.png')
+
+    def scan():
+        for path in paths:
+            scan_segy_header(path)
+
+    def cold_index():
+        index_path = os.path.join(directory, INDEX_FILE_NAME)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        load_directory_index(directory)
+
+    def decode():
+        for path in paths:
+            np.ascontiguousarray(read_segy_file(path)[0], dtype=np.float32)
+
+    def filter_envelope():
+        for data in decoded:
+            filter_and_envelope(data, 10.0, 30.0, fs)
+
+    def spectrogram():
+        for data in decoded:
+            stft_power(data, nfft, noverlap, fs)
+
+    def render():
+        plot_seismic_collage_with_spectrogram(decoded[0], traces_to_plot=[0, 1, 2, 3, 4, 5, 6], cmap='gray', fs=fs, nfft=nfft, noverlap=noverlap, output_file=output_file, show=False, delay=sampling['delay'])
+
+    cases = [
+        ('varredura dos cabeçalhos', len(paths), scan),
+        ('índice do diretório (frio)', len(paths), cold_index),
+        ('decodificação completa', len(paths), decode),
+        ('filtro + envoltória', len(paths), filter_envelope),
+        ('espectrograma', len(paths), spectrogram),
+        ('renderização (colagem)', 1, render),
+    ]
+    if legacy:
+        nseis = load_legacy()
+
+        def legacy_collage():
+            # a função do nSeis.py chama plt.show() (nada no Agg) e não fecha a figura
+            nseis['plot_seismic_collage_with_spectrogram'](decoded[0], traces_to_plot=[0, 1, 2, 3, 4, 5, 6], cmap='gray', fs=fs, nfft=nfft, noverlap=noverlap, output_file=output_file)
+            plt.close('all')
+
+        cases += [
+            ('legado: leitura obspy', len(paths), lambda: [nseis['read_segy_file'](path) for path in paths]),
+            ('legado: colagem (nSeis)', 1, legacy_collage),
+        ]
+
+    megabytes = sum(data.nbytes for data in decoded) / (1024 * 1024)
+    results = []
+    for name, files, func in cases:
+        seconds, peak = measure(func, repeat)
+        results.append({
+            'case': name,
+            'files': files,
+            'megabytes': megabytes * files / len(paths),
+            'seconds': seconds,
+            'mb_per_s': megabytes * files / len(paths) / seconds if seconds else None,
+            'peak_memory_mb': peak,
+        })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara com o baseline. Retorna [(caso, métrica, atual, baseline, razão)] das regressões.
+    """
+    reference = {r['case']: r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = reference.get(result['case'])
+        if base is None:
+            continue
+        result['baseline_seconds'] = base['seconds']
+        result['ratio'] = result['seconds'] / base['seconds'] if base['seconds'] else None
+        slower = result['seconds'] - base['seconds'] > MIN_TIME_REGRESSION_S
+        if slower and result['ratio'] is not None and result['ratio'] > 1 + tolerance:
+            regressions.append((result['case'], 'tempo (s)', result['seconds'], base['seconds'], result['ratio']))
+        memory = result['peak_memory_mb'] - base['peak_memory_mb']
+        if memory > MIN_MEMORY_REGRESSION_MB and result['peak_memory_mb'] > base['peak_memory_mb'] * (1 + tolerance):
+            regressions.append((result['case'], 'pico (MB)', result['peak_memory_mb'], base['peak_memory_mb'], result['peak_memory_mb'] / base['peak_memory_mb']))
+    return regressions
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark e regressão do pipeline leitura/filtro/gráfico.")
+    parser.add_argument('--files', type=int, default=8, help="Arquivos (tiros) sintéticos (padrão: 8)")
+    parser.add_argument('--traces', type=int, default=96, help="Traços por arquivo (padrão: 96)")
+    parser.add_argument('--samples', type=int, default=2000, help="Amostras por traço (padrão: 2000)")
+    parser.add_argument('--sample-interval', type=int, default=2000, help="Intervalo de amostragem em µs (padrão: 2000)")
+    parser.add_argument('--data-dir', help="Usa os SEG-Y deste diretório em vez do levantamento sintético")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy', action='store_true', help="Mede também o caminho antigo do nSeis.py (obspy)")
+    parser.add_argument('--json', dest='json_path')
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Piora relativa aceita antes de acusar regressão (padrão: 0.25)")
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    config = {key: getattr(args, key) for key in ('files', 'traces', 'samples', 'sample_interval', 'data_dir')}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.data_dir:
+            paths = copy_data_dir(args.data_dir, tmp_dir)
+        else:
+            start = time.perf_counter()
+            paths = generate_survey(os.path.join(tmp_dir, 'sintetico'), args.files, args.traces, args.samples, args.sample_interval)
+            print(f"{len(paths)} arquivo(s) sintético(s) de {args.traces} x {args.samples} gerados em {time.perf_counter() - start:.2f} s")
+        if not paths:
+            print("Nenhum arquivo SEG-Y para medir.")
+            return 1
+        results = run_cases(paths, args.repeat, args.legacy, tmp_dir)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != config:
+            print(f"Atenção: configuração diferente do baseline ({baseline.get('config')})")
+        regressions = compare(results, baseline, args.tolerance)
+
+    print(f"{'caso':<30} {'arquivos':>8} {'MB':>8} {'tempo (s)':>10} {'MB/s':>9} {'pico (MB)':>10} {'x baseline':>10}")
+    for r in results:
+        ratio = f"{r['ratio']:.2f}" if r.get('ratio') else "-"
+        print(f"{r['case']:<30} {r['files']:>8} {r['megabytes']:>8.1f} {r['seconds']:>10.4f} {r['mb_per_s'] or 0:>9.1f} {r['peak_memory_mb']:>10.2f} {ratio:>10}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'config': config, 'environment': environment(), 'results': results}, f, indent=2, ensure_ascii=False)
+
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}:")
+        for case, metric, current, base, ratio in regressions:
+            print(f"  {case}: {metric} {current:.4f} (baseline {base:.4f}, {ratio:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
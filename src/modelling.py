@@ -1,50 +1,65 @@
-import matplotlib.pyplot as plt
-import numpy as np
+"""
+Modelo de camadas planas e gerador de levantamentos sintéticos.
 
+Sem argumentos mostra a fonte, os geofones e as camadas. Com --output-dir grava
+um arquivo SEG-Y por tiro, no layout de Data/Sismica Ativa, para testes de
+regressão e de desempenho da leitura e dos gráficos.
 
-def model_geophones_and_layers(num_geophones=8, num_layers=3, layer_depths=None):
-    """
-    Modela geofones e fonte, com camadas horizontais abaixo.
-    """
-    if layer_depths is None:
-        layer_depths = [-100, -200, -300]  
+Uso:
+    python src/modelling.py
+    python src/modelling.py --output-dir Data/Sintetico --shots 1000 --receivers 24
+"""
 
-    
-    geophone_positions = np.linspace(300, 1500, num_geophones)  
-    source_position = 50  
+import argparse
+import os
+import sys
+import time
 
-    return geophone_positions, source_position, layer_depths
+import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def plot_geophones_and_layers(geophones, source, layers):
-    fig, ax = plt.subplots(figsize=(8, 6))
+from seispro.modelling import model_geophones_and_layers, plot_geophones_and_layers, write_synthetic_survey  # noqa: E402
 
-    
-    ax.plot(source, 0, 'ro', markersize=10, label="Fonte (*)")
-    ax.text(source - 10, 10, '*', fontsize=15, color='red')
 
-    
-    ax.plot(geophones, np.zeros_like(geophones), 'gv', markersize=8, label="Geofones (x)")
-    for x in geophones:
-        ax.text(x - 5, 10, 'x', fontsize=12, color='green')
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Modelo de camadas e levantamento sísmico sintético.")
+    parser.add_argument("--output-dir", help="Diretório dos SEG-Y sintéticos (sem ele, só mostra o modelo)")
+    parser.add_argument("--shots", type=int, default=10, help="Número de tiros (padrão: 10)")
+    parser.add_argument("--receivers", type=int, default=24, help="Receptores por tiro (padrão: 24)")
+    parser.add_argument("--receiver-spacing", type=float, default=5.0, help="Espaçamento dos receptores em m (padrão: 5)")
+    parser.add_argument("--shot-spacing", type=float, default=10.0, help="Espaçamento dos tiros em m (padrão: 10)")
+    parser.add_argument("--velocities", type=float, nargs='+', default=[500.0, 1500.0, 2500.0, 3500.0], help="Velocidade de cada camada em m/s, da superfície para baixo")
+    parser.add_argument("--depths", type=float, nargs='+', default=[20.0, 60.0, 150.0], help="Profundidade de cada interface em m")
+    parser.add_argument("--samples", type=int, default=2000, help="Amostras por traço (padrão: 2000)")
+    parser.add_argument("--sample-interval", type=int, default=2000, help="Intervalo de amostragem em µs (padrão: 2000)")
+    parser.add_argument("--frequency", type=float, default=30.0, help="Frequência de pico da Ricker em Hz (padrão: 30)")
+    parser.add_argument("--noise", type=float, default=0.0, help="Ruído gaussiano relativo ao pico de cada traço")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Número de processos")
+    return parser.parse_args(argv)
 
-    
-    for i, depth in enumerate(layers):
-        ax.axhline(depth, color='black', linestyle='--')
-        ax.text(20, depth + 10, f'Camada {i+1}', fontsize=10, color='black')
 
-    
-    ax.set_xlim(0, 1800)
-    ax.set_ylim(layers[-1] - 50, 50)  
-    ax.set_xlabel("Posição (m)", fontsize=12)
-    ax.set_ylabel("Profundidade (m)", fontsize=12)
-    ax.set_title("Fonte, Geofones e Camadas", fontsize=14, fontweight='bold')
-    ax.legend()
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.output_dir:
+        geophones, source, layers = model_geophones_and_layers()
+        plot_geophones_and_layers(geophones, source, layers)
+        return 0
 
-  
-    plt.grid(False)
-    plt.show()
+    # os receptores ficam fixos e os tiros andam ao longo da linha a partir do primeiro receptor
+    receivers = np.arange(args.receivers) * args.receiver_spacing
+    sources = -args.receiver_spacing + np.arange(args.shots) * args.shot_spacing
+    start = time.perf_counter()
+    paths = write_synthetic_survey(
+        args.output_dir, sources, receivers, args.velocities, args.depths,
+        num_samples=args.samples, sample_interval=args.sample_interval, max_workers=args.workers,
+        frequency=args.frequency, noise=args.noise,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths)} arquivo(s) gravado(s) em {args.output_dir} em {elapsed:.2f} s "
+          f"({len(paths) * args.receivers / elapsed:.0f} traços/s)")
+    return 0
 
-geophones, source, layers = model_geophones_and_layers()
 
-plot_geophones_and_layers(geophones, source, layers)
+if __name__ == "__main__":
+    sys.exit(main())
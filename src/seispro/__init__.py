@@ -0,0 +1,6 @@
+"""
+SEis-PRO: análise e visualização de dados sísmicos SEGY.
+
+Os submódulos são importados sob demanda (ex.: `from seispro.segy_mmap import
+open_segy_memmap`); o pacote em si não carrega numpy nem matplotlib.
+"""
@@ -0,0 +1,582 @@
+"""
+Modo interativo: escolha do diretório, do arquivo SEGY e do gráfico.
+
+Numpy, matplotlib e os módulos de processamento só são importados depois que o
+arquivo é escolhido, para que a listagem do diretório apareça logo.
+"""
+
+import os
+import struct
+
+from rich import print
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+from rich.tree import Tree
+
+from .instrument import StageProfiler, timed
+from .segy_index import load_directory_index, read_xref, validate_against_xref
+from .segy_scan import sampling_parameters, scan_segy_header
+
+
+console = Console()
+
+def list_segy_files_with_sizes(directory):
+    """
+    Lista os arquivos SEGY com tamanho em MB e o resumo dos cabeçalhos, vindo do
+    índice do diretório (só arquivos novos ou modificados são relidos).
+    """
+    return [
+        (info['file'], info['size'] / (1024 * 1024), info)
+        for info in load_directory_index(directory)
+    ]
+
+def get_segy_file_info(file_path):
+    info = scan_segy_header(file_path)
+    return info['num_traces'], info['num_samples']
+
+def generate_directory_header(directory):
+    """
+    Mostra a tabela com o conteúdo do diretório SEGY (arquivo, tamanho, número de traces e amostras).
+    """
+    segy_files = list_segy_files_with_sizes(directory)
+    xref = read_xref(directory)
+    
+    console.print(Panel(f"[bold blue]Diretório: {directory}", title="Informação do Diretório", title_align="left"))
+    
+    table = Table(title="Conteúdo do Diretório SEGY")
+    table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Tamanho (MB)", justify="center", style="green")
+    table.add_column("Número de Traces", justify="center", style="magenta")
+    table.add_column("Amostras por Trace", justify="center", style="yellow")
+    if xref:
+        table.add_column("Instrumento", justify="left", style="white")
+        table.add_column("Amostragem (µs)", justify="center", style="green")
+        table.add_column("Data/Hora", justify="center", style="blue")
+        table.add_column("Validação", justify="left")
+
+    for filename, size, info in segy_files:
+        if 'error' in info:
+            row = [filename, f"{size:.2f}", "[red]erro[/red]", "[red]erro[/red]"]
+        else:
+            row = [filename, f"{size:.2f}", str(info['num_traces']), str(info['num_samples'])]
+
+        if xref:
+            entry = xref.get(os.path.splitext(filename)[0], {})
+            if 'instrument' in entry:
+                row += [entry['instrument'], str(entry['sample_interval']), f"{entry['date']} {entry['time']}"]
+            else:
+                row += ["-", "-", info.get('acquired') or "-"]
+            problems = validate_against_xref(info, xref)
+            row.append("[red]" + "; ".join(problems) + "[/red]" if problems else "[green]OK[/green]")
+
+        table.add_row(*row)
+    
+    console.print(table)
+
+def list_segy_files(directory):
+    segy_files = [f for f in os.listdir(directory) if f.endswith('.SEGY') or f.endswith('.SGY')]
+    return sorted(segy_files)
+
+def show_segy_files_in_multi_column_table(segy_files, num_columns=4):
+    """
+    Exibe os arquivos SEGY em uma tabela formatada com múltiplas colunas.
+    """
+    console.print(Panel("[bold blue]Arquivos SEGY encontrados (em colunas):[/bold blue]"))
+
+    
+    table = Table(title="Escolha o Arquivo SEGY", show_header=True, header_style="bold cyan")
+    for i in range(num_columns):
+        table.add_column(f"Dados SEGY {i + 1}", justify="left", style="blue")
+
+    
+    num_files = len(segy_files)
+    rows = (num_files + num_columns - 1) // num_columns  
+
+    for row in range(rows):
+        row_data = []
+        for col in range(num_columns):
+            file_idx = row + col * rows
+            if file_idx < num_files:
+                row_data.append(f"{file_idx}: {segy_files[file_idx]}")
+            else:
+                row_data.append("") 
+        table.add_row(*row_data)
+
+    console.print(table)
+
+def choose_segy_file_with_multi_columns(directory, num_columns=4):
+    """
+    Exibe a tabela com arquivos SEGY em múltiplas colunas para escolha do usuário.
+    """
+    segy_files = list_segy_files(directory)
+    if not segy_files:
+        raise FileNotFoundError(f"Nenhum arquivo SEGY encontrado no diretório: {directory}")
+
+    # Exibe a tabela com arquivos SEGY encontrados, organizados em múltiplas colunas
+    show_segy_files_in_multi_column_table(segy_files, num_columns)
+
+    while True:
+        try:
+            file_idx = int(input("Digite o número do arquivo SEGY para carregar: "))
+            if file_idx < 0 or file_idx >= len(segy_files):
+                raise IndexError("Índice de arquivo SEGY inválido.")
+            return os.path.join(directory, segy_files[file_idx])
+        except ValueError:
+            print("Por favor, insira um número válido.")
+        except IndexError as e:
+            print(e)
+
+def choose_segy_file_with_header(directory):
+    """
+    Exibe a tabela com arquivos SEGY para escolha do usuário.
+    """
+    segy_files = list_segy_files(directory)
+    if not segy_files:
+        raise FileNotFoundError(f"Nenhum arquivo SEGY encontrado no diretório: {directory}")
+
+   
+    show_segy_files_in_table(segy_files)
+
+    while True:
+        try:
+            file_idx = int(input("Digite o número do arquivo SEGY para carregar: "))
+            if file_idx < 0 or file_idx >= len(segy_files):
+                raise IndexError("Índice de arquivo SEGY inválido.")
+            return os.path.join(directory, segy_files[file_idx])
+        except ValueError:
+            print("Por favor, insira um número válido.")
+        except IndexError as e:
+            print(e)
+
+def ask_plot_choice():
+    tree = Tree("[bold blue]Escolha o tipo de gráfico para plotar:[/bold blue]")
+    tree.add("[green]1: Colagem de gráficos sísmicos[/green]")
+    tree.add("[green]2: Gráfico de Dados Filtrados com Envoltória[/green]")
+    tree.add("[green]3: Gather Filtrado com Envoltória (todos os traços)[/green]")
+    tree.add("[green]4: Espectro Médio e Amplitude f-x do Gather[/green]")
+    tree.add("[green]5: Análise de Velocidade (Semblance e NMO)[/green]")
+    tree.add("[green]6: Visualizador Interativo da Seção (zoom e pan)[/green]")
+    console.print(tree)
+
+    while True:
+        try:
+            choice = int(input("Escolha (1 a 6): "))
+            if choice not in [1, 2, 3, 4, 5, 6]:
+                raise ValueError("Escolha inválida. Selecione de 1 a 6")
+            return choice
+        except ValueError as e:
+            print(e)
+
+def ask_plot_parameters(sampling):
+    """
+    Pergunta os parâmetros da colagem. Os padrões vêm dos cabeçalhos do arquivo.
+    """
+    from .spectrogram import default_nfft
+
+    tree = Tree("[bold blue]Parâmetros para o gráfico de colagem sísmica[/bold blue]")
+    cmap = input("Digite o cmap para o gráfico (ENTER para padrão: gray): ") or 'gray'
+    tree.add(f"[green]Cmap: {cmap}[/green]")
+
+    default_fs = sampling['sample_rate']
+    num_samples = sampling['num_samples']
+    default_nfft_value = default_nfft(num_samples)
+    default_noverlap = default_nfft_value * 3 // 4
+    try:
+        fs = float(input(f"Digite o fator de amostragem (Fs) (ENTER para padrão do cabeçalho: {default_fs:g}): ") or default_fs)
+        nfft = int(input(f"Digite o tamanho da janela de FFT (NFFT) (ENTER para padrão: {default_nfft_value}): ") or default_nfft_value)
+        noverlap = int(input(f"Digite o valor de sobreposição (noverlap) (ENTER para padrão: {default_noverlap}): ") or default_noverlap)
+        if not 0 < nfft <= num_samples or not 0 <= noverlap < nfft:
+            raise ValueError
+    except ValueError:
+        console.print(f"[bold red]Valores inválidos fornecidos (NFFT deve ser no máximo {num_samples} e noverlap menor que NFFT), usando padrões.[/bold red]")
+        fs, nfft, noverlap = default_fs, default_nfft_value, default_noverlap
+
+    tree.add(f"[green]Fs: {fs}[/green]")
+    tree.add(f"[green]NFFT: {nfft}[/green]")
+    tree.add(f"[green]Noverlap: {noverlap}[/green]")
+
+    console.print(tree)
+    return cmap, fs, nfft, noverlap
+
+def ask_filter_parameters(sampling):
+    """
+    Pergunta a banda do filtro e a janela de tempo. Por padrão a janela cobre o traço inteiro.
+    """
+    tree = Tree("[bold blue]Parâmetros de Filtro[/bold blue]")
+
+    start_default = sampling['delay']
+    end_default = sampling['delay'] + sampling['duration']
+    try:
+        freqmin = float(input("Digite a frequência mínima para o filtro (Hz): ") or 10)
+        freqmax = float(input(f"Digite a frequência máxima para o filtro (Hz) (Nyquist: {sampling['sample_rate'] / 2:g}): ") or 30)
+        time_start = float(input(f"Tempo de início da visualização (s) (ENTER para padrão: {start_default:g}): ") or start_default)
+        time_end = float(input(f"Tempo de término da visualização (s) (ENTER para padrão: {end_default:g}): ") or end_default)
+    except ValueError:
+        console.print("[bold red]Valores inválidos fornecidos, usando padrões.[/bold red]")
+        freqmin, freqmax = 10, 30
+        time_start, time_end = start_default, end_default
+
+    tree.add(f"[green]Frequência mínima: {freqmin} Hz[/green]")
+    tree.add(f"[green]Frequência máxima: {freqmax} Hz[/green]")
+    tree.add(f"[green]Início do tempo: {time_start} s[/green]")
+    tree.add(f"[green]Fim do tempo: {time_end} s[/green]")
+
+    console.print(tree)
+    return freqmin, freqmax, (time_start, time_end)
+
+def ask_velocity_parameters():
+    """
+    Pergunta a faixa e o número de velocidades da semblance e a janela de tempo.
+    """
+    tree = Tree("[bold blue]Parâmetros da Análise de Velocidade[/bold blue]")
+    try:
+        vmin = float(input("Digite a velocidade mínima (m/s) (ENTER para padrão: 200): ") or 200)
+        vmax = float(input("Digite a velocidade máxima (m/s) (ENTER para padrão: 4000): ") or 4000)
+        num_velocities = int(input("Digite o número de velocidades (ENTER para padrão: 100): ") or 100)
+        window = float(input("Digite a janela da semblance (s) (ENTER para padrão: 0.02): ") or 0.02)
+        if not 0 < vmin < vmax or num_velocities < 2 or window < 0:
+            raise ValueError
+    except ValueError:
+        console.print("[bold red]Valores inválidos fornecidos, usando padrões.[/bold red]")
+        vmin, vmax, num_velocities, window = 200.0, 4000.0, 100, 0.02
+
+    tree.add(f"[green]Velocidades: {vmin} a {vmax} m/s ({num_velocities})[/green]")
+    tree.add(f"[green]Janela: {window} s[/green]")
+
+    console.print(tree)
+    return vmin, vmax, num_velocities, window
+
+def ask_gain_parameters():
+    """
+    Pergunta o condicionamento do gather antes da colagem (AGC, balanceamento e
+    filtro f-k). Retorna as opções de seispro.gain ou None.
+    """
+    if (input("Aplicar ganho (AGC) e filtro f-k antes da colagem? (s/N): ") or 'n').strip().lower() != 's':
+        return None
+
+    tree = Tree("[bold blue]Parâmetros do Ganho e do Filtro f-k[/bold blue]")
+    try:
+        agc_window = float(input("Digite a janela do AGC (s) (ENTER para padrão: 0.25, 0 sem AGC): ") or 0.25)
+        balance = (input("Balancear os traços pelo RMS? (s/N): ") or 'n').strip().lower() == 's'
+        vmin = float(input("Digite a velocidade aparente mínima do f-k (m/s) (ENTER para padrão: 0, sem filtro): ") or 0)
+        if agc_window < 0 or vmin < 0:
+            raise ValueError
+    except ValueError:
+        console.print("[bold red]Valores inválidos fornecidos, usando padrões.[/bold red]")
+        agc_window, balance, vmin = 0.25, False, 0.0
+
+    tree.add(f"[green]AGC: {f'{agc_window} s' if agc_window else 'não'}[/green]")
+    tree.add(f"[green]Balanceamento: {'sim' if balance else 'não'}[/green]")
+    tree.add(f"[green]Filtro f-k: {f'rejeita abaixo de {vmin} m/s' if vmin else 'não'}[/green]")
+    console.print(tree)
+    return {'agc_window': agc_window or None, 'balance': balance, 'vmin': vmin or None}
+
+def ask_trace_spacing():
+    """
+    Pergunta o espaçamento entre traços do filtro f-k. Retorna None (sem f-k) se
+    nada ou um valor inválido for digitado.
+    """
+    try:
+        dx = float(input("Digite o espaçamento entre traços (m) (ENTER para seguir sem o filtro f-k): ") or 0)
+    except ValueError:
+        dx = 0
+    if dx <= 0:
+        console.print("[bold yellow]Sem espaçamento entre traços: seguindo sem o filtro f-k.[/bold yellow]")
+        return None
+    return dx
+
+def ask_passive_parameters():
+    """
+    Pergunta a janela, a banda do filtro e o histórico do modo passivo.
+    """
+    tree = Tree("[bold blue]Parâmetros do Modo Passivo[/bold blue]")
+    try:
+        window = float(input("Digite a duração de cada janela (s) (ENTER para padrão: 10): ") or 10)
+        freqmin = float(input("Digite a frequência mínima para o filtro (Hz) (ENTER para padrão: 1): ") or 1)
+        freqmax = float(input("Digite a frequência máxima para o filtro (Hz) (ENTER para padrão: 20): ") or 20)
+        history = float(input("Digite o histórico recente exibido (s) (ENTER para padrão: 600): ") or 600)
+        if window <= 0 or history <= 0:
+            raise ValueError
+    except ValueError:
+        console.print("[bold red]Valores inválidos fornecidos, usando padrões.[/bold red]")
+        window, freqmin, freqmax, history = 10.0, 1.0, 20.0, 600.0
+
+    tree.add(f"[green]Janela: {window} s[/green]")
+    tree.add(f"[green]Frequência mínima: {freqmin} Hz[/green]")
+    tree.add(f"[green]Frequência máxima: {freqmax} Hz[/green]")
+    tree.add(f"[green]Histórico: {history} s[/green]")
+
+    console.print(tree)
+    return window, freqmin, freqmax, history
+
+def passive_main(directory, profile_json=None, trace_memory=False):
+    """
+    Processa todos os arquivos do diretório passivo como um registro contínuo.
+    """
+    from .passive import list_passive_paths
+    from .passive_mode import stream_passive_record, summary_tree
+    from .plots import plot_passive_summary
+
+    try:
+        paths = list_passive_paths(directory)
+    except OSError:
+        paths = []
+    if not paths:
+        console.print(f"[bold red]Nenhum arquivo SEG-Y ou miniSEED encontrado no diretório: {directory}[/bold red]")
+        return
+
+    console.print(Panel(f"[bold blue]Diretório: {directory}\n{len(paths)} arquivo(s), de {os.path.basename(paths[0])} a {os.path.basename(paths[-1])}", title="Registro Passivo", title_align="left"))
+    window, freqmin, freqmax, history = ask_passive_parameters()
+    cmap = input("Digite o cmap para o gráfico (ENTER para padrão: inferno): ") or 'inferno'
+    output_file = input("Digite o nome do arquivo de saída (com extensão .png) (padrão: 'PASSIVA.png'): ") or 'PASSIVA.png'
+
+    profiler = StageProfiler(os.path.basename(directory), trace_memory=trace_memory)
+    try:
+        with console.status("[bold blue]Processando...[/bold blue]") as status:
+            processor, seconds = stream_passive_record(paths, window, freqmin, freqmax, history, profiler=profiler, status=status)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Erro no registro passivo: {e}[/bold red]")
+        return
+    console.print(summary_tree(paths, processor, seconds))
+
+    plot_passive_summary(processor, cmap=cmap, output_file=output_file, title=f"Registro: {directory}", profiler=profiler)
+    console.print(profiler.table())
+    if profile_json:
+        profiler.write_json(profile_json)
+
+def ask_survey_view(survey):
+    """
+    Pergunta qual gather do cubo mostrar. Retorna (dados, rótulo do eixo x, título)
+    ou None se a escolha não puder ser atendida.
+    """
+    n_shots, n_traces, _ = survey.shape
+    tree = Tree("[bold blue]Escolha o gather do levantamento:[/bold blue]")
+    tree.add("[green]1: Tiro comum[/green]")
+    tree.add("[green]2: Receptor comum (um canal de todos os tiros)[/green]")
+    tree.add("[green]3: Afastamento comum[/green]")
+    console.print(tree)
+    try:
+        choice = int(input("Escolha (1 a 3): "))
+        if choice == 1:
+            shot = int(input(f"Digite o tiro (1 a {n_shots}): "))
+            if not 1 <= shot <= n_shots:
+                raise ValueError
+            return survey.shot(shot - 1), "Traços", f"Tiro {survey.shots[shot - 1]['file']}"
+        if choice == 2:
+            trace = int(input(f"Digite o canal (1 a {n_traces}): "))
+            if not 1 <= trace <= n_traces:
+                raise ValueError
+            return survey.common_receiver(trace - 1), "Tiros", f"Receptor comum: canal {trace}"
+        if choice == 3:
+            if survey.offsets is None:
+                console.print("[bold red]Os cabeçalhos do levantamento não têm afastamentos nem coordenadas.[/bold red]")
+                return None
+            offset = float(input("Digite o afastamento (m): "))
+            data, offsets, _ = survey.common_offset(offset)
+            return data, "Tiros", f"Afastamento comum: {offset:g} m (de {offsets.min():g} a {offsets.max():g} m)"
+        raise ValueError
+    except ValueError:
+        console.print("[bold red]Escolha inválida.[/bold red]")
+        return None
+
+def survey_main(directory, profile_json=None, trace_memory=False):
+    """
+    Abre todos os tiros do diretório como um cubo (gravado na primeira vez ou quando
+    algum arquivo muda) e mostra gathers de tiro, receptor ou afastamento comum.
+    """
+    from .segy_scan import list_segy_paths
+    from .survey import Survey, default_survey_dir, ingest_survey, survey_is_current
+    from .viewer import show_section
+
+    paths = list_segy_paths(directory)
+    survey_dir = default_survey_dir(directory)
+    profiler = StageProfiler(os.path.basename(directory), console=console, trace_memory=trace_memory)
+    if not survey_is_current(survey_dir, paths):
+        with console.status(f"[bold blue]Empilhando {len(paths)} tiro(s)...[/bold blue]"), timed(profiler, "ingestão"):
+            results = ingest_survey(paths, survey_dir)
+        for result in results:
+            if 'error' in result:
+                console.print(f"[bold red]{result['file']} ficou de fora: {result['error']}[/bold red]")
+    survey = Survey(survey_dir)
+    n_shots, n_traces, n_samples = survey.shape
+    console.print(Panel(f"[bold blue]{n_shots} tiros x {n_traces} traços x {n_samples} amostras em {survey_dir}", title="Levantamento", title_align="left"))
+
+    while True:
+        view = ask_survey_view(survey)
+        if view is not None:
+            data, xlabel, title = view
+            cmap = input("Digite o cmap para o gráfico (ENTER para padrão: gray): ") or 'gray'
+            show_section(data, survey.sample_rate, delay=survey.delay, cmap=cmap, segy_file_name=title, profiler=profiler, xlabel=xlabel)
+            console.print(profiler.table())
+            if profile_json:
+                profiler.write_json(profile_json)
+        if (input("Mostrar outro gather do levantamento? (s/N): ") or 'n').strip().lower() != 's':
+            break
+
+def main(profile_json=None, trace_memory=False, cache=None, max_memory_mb=None):
+    current_directory = os.getcwd()
+    console.print(f"[bold blue]Diretório Atual: {current_directory}[/bold blue]\n")
+    
+    naval_data_directory = os.path.join(current_directory, "Data")
+
+    options = {
+        1: "Sismica Ativa",
+        2: "Sismica Passiva"
+    }
+
+    console.print("[bold green]Selecione o tipo de dados sísmicos:[/bold green]")
+    for key, value in options.items():
+        console.print(f"{key}: [cyan]{value}[/cyan]")
+
+    while True:
+        try:
+            choice = int(input("Escolha (1 ou 2): "))
+            if choice not in options:
+                raise ValueError("Escolha inválida. Selecione 1 ou 2.")
+            
+            selected_directory = os.path.join(naval_data_directory, options[choice])
+            break
+        except ValueError as e:
+            print(e)
+
+    if choice == 2:
+        # Registros contínuos: todos os arquivos do diretório são processados em janelas
+        passive_main(selected_directory, profile_json, trace_memory)
+        return
+
+    generate_directory_header(selected_directory)
+
+    if (input("Abrir todos os tiros como um levantamento (tiro, receptor e afastamento comum)? (s/N): ") or 'n').strip().lower() == 's':
+        survey_main(selected_directory, profile_json, trace_memory)
+        return
+
+    # Um cabeçalho ilegível (formato desconhecido, intervalo de amostragem inválido)
+    # volta para a escolha do arquivo em vez de encerrar o programa
+    while True:
+        segy_file_path = choose_segy_file_with_multi_columns(selected_directory, num_columns=4)
+        segy_file_name = os.path.basename(segy_file_path)
+
+        console.print(f"[bold green]Arquivo SEGY selecionado: {segy_file_name}[/bold green]")
+
+        try:
+            info = scan_segy_header(segy_file_path)
+            sampling = sampling_parameters(info)
+            break
+        except (OSError, ValueError, struct.error) as e:
+            console.print(f"[bold red]Erro ao ler os cabeçalhos de {segy_file_name}: {e}[/bold red]")
+    console.print(
+        f"[blue]Amostragem do cabeçalho: {sampling['sample_interval']} µs ({sampling['sample_rate']:g} Hz), "
+        f"{sampling['num_traces']} traços x {sampling['num_samples']} amostras, {sampling['duration']:g} s[/blue]"
+    )
+    for problem in validate_against_xref(info, read_xref(selected_directory)):
+        console.print(f"[bold red]Atenção: {problem}[/bold red]")
+
+    from .plots import (
+        plot_filtered_data_with_envelope,
+        plot_gather_filtered_with_envelope,
+        plot_gather_spectra,
+        plot_seismic_collage_with_spectrogram,
+        plot_velocity_analysis,
+    )
+    from .gain import trace_spacing
+    from .picking import pick_first_breaks
+    from .reader import fits_in_memory, read_and_decode
+    from .velocity import file_offsets
+    from .viewer import show_section
+
+    # O arquivo é lido uma vez; novos gráficos reaproveitam os dados e o cache de espectrogramas
+    data = None
+    while True:
+        plot_choice = ask_plot_choice()
+        profiler = StageProfiler(segy_file_name, console=console, trace_memory=trace_memory)
+
+        if plot_choice == 1:
+            cmap, fs, nfft, noverlap = ask_plot_parameters(sampling)
+            output_file = input("Digite o nome do arquivo de saída (com extensão .png) (padrão: 'SEIS.png'): ") or 'SEIS.png'
+            overlay_picks = (input("Marcar as primeiras quebras automáticas (STA/LTA) no wiggle? (s/N): ") or 'n').strip().lower() == 's'
+            gain = ask_gain_parameters()
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            streaming = not fits_in_memory(data.shape, max_memory_mb)
+            if gain and gain['vmin']:
+                dx = None
+                if streaming:
+                    console.print(f"[bold red]O filtro f-k precisa do gather inteiro na memória (limite: {max_memory_mb:g} MB): seguindo sem o f-k.[/bold red]")
+                else:
+                    offsets, offsets_source = file_offsets(segy_file_path, data.shape[0])
+                    if offsets_source == 'modelo':
+                        console.print("[bold yellow]Cabeçalhos sem afastamentos: a geometria padrão do modelo não serve para as velocidades do filtro f-k.[/bold yellow]")
+                        dx = ask_trace_spacing()
+                    else:
+                        dx = trace_spacing(offsets)
+                if dx:
+                    gain['dx'] = dx
+                else:
+                    gain['vmin'] = None
+            # fora da memória o gather condicionado fica em .npy ao lado da figura
+            gain_out = f"{os.path.splitext(output_file)[0]}_ganho.npy" if gain and streaming else None
+            picks = None
+            if overlay_picks:
+                with timed(profiler, "picking"):
+                    picks = pick_first_breaks(data, fs, delay=sampling['delay'])
+            plot_seismic_collage_with_spectrogram(data, traces_to_plot=[0, 1, 2, 3, 4, 5, 6], cmap=cmap, fs=fs, nfft=nfft, noverlap=noverlap, output_file=output_file, segy_file_name=segy_file_name, profiler=profiler, source=segy_file_path, delay=sampling['delay'], picks=picks, gain=gain, gain_out=gain_out)
+
+        elif plot_choice == 2:
+            sample_rate = sampling['sample_rate']
+            freqmin, freqmax, time_window = ask_filter_parameters(sampling)
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            plot_filtered_data_with_envelope(data[0], sample_rate, freqmin=freqmin, freqmax=freqmax, time_window=time_window, profiler=profiler, delay=sampling['delay'])
+
+        elif plot_choice == 3:
+            sample_rate = sampling['sample_rate']
+            freqmin, freqmax, time_window = ask_filter_parameters(sampling)
+            output_file = input("Digite o nome do arquivo de saída (com extensão .png) (padrão: 'GATHER.png'): ") or 'GATHER.png'
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            filtered_out = envelope_out = None
+            if not fits_in_memory(data.shape, max_memory_mb):
+                # fora da memória o filtrado e a envoltória saem em resolução total em .npy
+                stem = os.path.splitext(output_file)[0]
+                filtered_out, envelope_out = f"{stem}_filtrado.npy", f"{stem}_envoltoria.npy"
+                console.print(f"[blue]Gather maior que {max_memory_mb:g} MB: processado em blocos, saídas em {filtered_out} e {envelope_out}[/blue]")
+            plot_gather_filtered_with_envelope(data, sample_rate, freqmin=freqmin, freqmax=freqmax, time_window=time_window, output_file=output_file, segy_file_name=segy_file_name, profiler=profiler, delay=sampling['delay'], filtered_out=filtered_out, envelope_out=envelope_out)
+
+        elif plot_choice == 4:
+            sample_rate = sampling['sample_rate']
+            cmap = input("Digite o cmap para o gráfico (ENTER para padrão: inferno): ") or 'inferno'
+            output_file = input("Digite o nome do arquivo de saída (com extensão .png) (padrão: 'ESPECTRO.png'): ") or 'ESPECTRO.png'
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            plot_gather_spectra(data, sample_rate, cmap=cmap, output_file=output_file, segy_file_name=segy_file_name, profiler=profiler)
+
+        elif plot_choice == 5:
+            sample_rate = sampling['sample_rate']
+            vmin, vmax, num_velocities, window = ask_velocity_parameters()
+            output_file = input("Digite o nome do arquivo de saída (com extensão .png) (padrão: 'VELOCIDADE.png'): ") or 'VELOCIDADE.png'
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            if not fits_in_memory(data.shape, max_memory_mb):
+                console.print(f"[bold red]A análise de velocidade precisa do gather inteiro na memória (limite: {max_memory_mb:g} MB). Aumente --max-memory-mb.[/bold red]")
+            else:
+                offsets, offsets_source = file_offsets(segy_file_path, data.shape[0])
+                if offsets_source == 'modelo':
+                    console.print("[bold yellow]Cabeçalhos sem geometria: afastamentos da geometria padrão do modelo.[/bold yellow]")
+                plot_velocity_analysis(data, offsets, sample_rate, vmin, vmax, num_velocities, window, output_file=output_file, segy_file_name=segy_file_name, profiler=profiler, delay=sampling['delay'], offsets_source=offsets_source)
+
+        elif plot_choice == 6:
+            cmap = input("Digite o cmap para o gráfico (ENTER para padrão: gray): ") or 'gray'
+            mode = 'rms' if (input("Exibir o RMS em vez do pico de cada célula? (s/N): ") or 'n').strip().lower() == 's' else 'pico'
+            if data is None:
+                data, _ = read_and_decode(segy_file_path, profiler, cache, max_memory_mb)
+            # a pirâmide fica na entrada do arquivo no cache e é reaproveitada nas próximas vezes
+            pyramid_dir = cache.pyramid_dir(segy_file_path) if cache is not None else None
+            show_section(data, sampling['sample_rate'], delay=sampling['delay'], pyramid_dir=pyramid_dir, cmap=cmap, mode=mode, segy_file_name=segy_file_name, profiler=profiler)
+
+        console.print(profiler.table())
+        if profile_json:
+            profiler.write_json(profile_json)
+
+        if (input("Gerar outro gráfico deste arquivo? (s/N): ") or 'n').strip().lower() != 's':
+            break
@@ -0,0 +1,209 @@
+"""
+Modo em lote: gera o gráfico escolhido para cada arquivo SEGY em um pool de
+processos, sem interação, e mostra o tempo de cada etapa.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib.pyplot as plt
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+from .decode_cache import DecodedCache
+from .gain import trace_spacing
+from .instrument import StageProfiler, timed, write_profiles_json
+from .pick_command import picking_options
+from .picking import pick_first_breaks
+from .plots import (
+    plot_filtered_data_with_envelope,
+    plot_gather_filtered_with_envelope,
+    plot_gather_spectra,
+    plot_seismic_collage_with_spectrogram,
+    plot_velocity_analysis,
+)
+from .reader import fits_in_memory, read_and_decode
+from .segy_index import read_xref, validate_against_xref
+from .segy_scan import resolve_segy_paths, sampling_parameters, scan_segy_header
+from .spectrogram import default_nfft
+from .velocity import file_offsets
+
+
+console = Console()
+
+def _init_batch_worker():
+    plt.switch_backend("Agg")
+
+def gain_options(args, segy_file_path, num_traces, streaming=False):
+    """
+    Opções de condicionamento (seispro.gain) da colagem a partir dos argumentos,
+    ou None se nenhuma foi pedida. O espaçamento do f-k vem de --trace-spacing ou
+    dos afastamentos nos cabeçalhos do arquivo.
+    """
+    options = {}
+    if args.agc:
+        options['agc_window'] = args.agc
+    if args.balance:
+        options['balance'] = True
+    if args.fk_vmin or args.fk_vmax:
+        if streaming:
+            raise ValueError("o filtro f-k precisa do gather inteiro na memória; aumente --max-memory-mb")
+        dx = args.trace_spacing
+        if not dx:
+            offsets, offsets_source = file_offsets(segy_file_path, num_traces)
+            if offsets_source == 'modelo':
+                # a geometria do modelo não é a do levantamento: as velocidades não teriam sentido
+                raise ValueError("cabeçalhos sem afastamentos: informe o espaçamento entre traços do filtro f-k com --trace-spacing")
+            dx = trace_spacing(offsets)
+        options.update(vmin=args.fk_vmin, vmax=args.fk_vmax, dx=dx)
+    return options or None
+
+
+def render_segy_file(segy_file_path, args):
+    """
+    Gera o gráfico escolhido para um arquivo, sem interação.
+    Retorna (arquivo de saída, segundos, perfil das etapas).
+    """
+    start = time.perf_counter()
+    segy_file_name = os.path.basename(segy_file_path)
+    stem = os.path.splitext(segy_file_name)[0]
+    profiler = StageProfiler(segy_file_name, trace_memory=args.trace_memory)
+    cache = None if args.no_cache else DecodedCache(args.cache_dir, args.cache_max_mb)
+    data, info = read_and_decode(segy_file_path, profiler, cache, args.max_memory_mb)
+    # acima de --max-memory-mb os modos percorrem os dados mapeados em blocos
+    streaming = not fits_in_memory(data.shape, args.max_memory_mb)
+
+    sampling = sampling_parameters(info)
+    fs = args.fs or sampling['sample_rate']
+    nfft = min(args.nfft or default_nfft(sampling['num_samples']), sampling['num_samples'])
+    noverlap = args.noverlap if args.noverlap is not None and args.noverlap < nfft else nfft * 3 // 4
+    time_window = tuple(args.time_window) if args.time_window else None
+    delay = sampling['delay']
+
+    if args.plot == "colagem":
+        output_file = os.path.join(args.output_dir, f"{stem}_colagem.png")
+        # fora da memória o gather condicionado fica em .npy ao lado da figura
+        gain_out = os.path.join(args.output_dir, f"{stem}_ganho.npy") if streaming and (args.agc or args.balance) else None
+        picks = None
+        if args.overlay_picks:
+            with timed(profiler, "picking"):
+                picks = pick_first_breaks(data, fs, delay=delay, **picking_options(args))
+        plot_seismic_collage_with_spectrogram(data, traces_to_plot=[0, 1, 2, 3, 4, 5, 6], cmap=args.cmap, fs=fs, nfft=nfft, noverlap=noverlap, output_file=output_file, segy_file_name=segy_file_name, show=False, profiler=profiler, source=segy_file_path, delay=delay, picks=picks, gain=gain_options(args, segy_file_path, data.shape[0], streaming), spectrogram_average=args.spectrogram_average, gain_out=gain_out)
+    elif args.plot == "gather":
+        output_file = os.path.join(args.output_dir, f"{stem}_gather.png")
+        # fora da memória o filtrado e a envoltória saem em resolução total em .npy
+        filtered_out = os.path.join(args.output_dir, f"{stem}_filtrado.npy") if streaming else None
+        envelope_out = os.path.join(args.output_dir, f"{stem}_envoltoria.npy") if streaming else None
+        plot_gather_filtered_with_envelope(data, fs, freqmin=args.freqmin, freqmax=args.freqmax, time_window=time_window, cmap=args.cmap, output_file=output_file, segy_file_name=segy_file_name, show=False, profiler=profiler, delay=delay, filtered_out=filtered_out, envelope_out=envelope_out)
+    elif args.plot == "velocidade":
+        if streaming:
+            raise ValueError(f"a análise de velocidade precisa do gather inteiro na memória ({data.shape[0] * data.shape[1] * 4 / (1024 * 1024):.0f} MB); aumente --max-memory-mb")
+        output_file = os.path.join(args.output_dir, f"{stem}_velocidade.png")
+        offsets, offsets_source = file_offsets(segy_file_path, data.shape[0])
+        vmin, vmax = args.velocity_range
+        plot_velocity_analysis(data, offsets, fs, vmin, vmax, args.num_velocities, output_file=output_file, segy_file_name=segy_file_name, show=False, profiler=profiler, delay=delay, offsets_source=offsets_source)
+    elif args.plot == "espectro":
+        output_file = os.path.join(args.output_dir, f"{stem}_espectro.png")
+        plot_gather_spectra(data, fs, cmap=args.cmap, output_file=output_file, segy_file_name=segy_file_name, show=False, profiler=profiler)
+    else:
+        output_file = os.path.join(args.output_dir, f"{stem}_filtro.png")
+        plot_filtered_data_with_envelope(data[0], fs, freqmin=args.freqmin, freqmax=args.freqmax, time_window=time_window, output_file=output_file, show=False, profiler=profiler, delay=delay)
+
+    return output_file, time.perf_counter() - start, profiler.to_dict()
+
+def stage_summary_table(profiles, trace_memory=False):
+    """
+    Soma o tempo de cada etapa em todos os arquivos do lote.
+    """
+    totals, rss, peaks = {}, {}, {}
+    for profile in profiles:
+        for record in profile['stages']:
+            stage = record['stage']
+            totals[stage] = totals.get(stage, 0.0) + record['seconds']
+            rss[stage] = max(rss.get(stage, 0.0), record['max_rss_mb'] or 0.0)
+            peaks[stage] = max(peaks.get(stage, 0.0), record.get('peak_memory_mb', 0.0))
+
+    table = Table(title="Tempo por etapa (todos os arquivos)")
+    table.add_column("Etapa", justify="left", style="cyan")
+    table.add_column("Tempo total (s)", justify="right", style="magenta")
+    table.add_column("Média (s)", justify="right", style="yellow")
+    table.add_column("RSS máximo (MB)", justify="right", style="blue")
+    if trace_memory:
+        table.add_column("Pico alocado (MB)", justify="right", style="green")
+    for stage, seconds in totals.items():
+        row = [stage, f"{seconds:.3f}", f"{seconds / len(profiles):.3f}", f"{rss[stage]:.1f}"]
+        if trace_memory:
+            row.append(f"{peaks[stage]:.1f}")
+        table.add_row(*row)
+    return table
+
+def warn_header_mismatches(segy_files):
+    """
+    Compara os cabeçalhos de cada arquivo do lote com o Xref.txt do seu diretório.
+    """
+    xrefs = {}
+    for path in segy_files:
+        directory = os.path.dirname(path)
+        if directory not in xrefs:
+            xrefs[directory] = read_xref(directory)
+        try:
+            problems = validate_against_xref(scan_segy_header(path), xrefs[directory])
+        except (OSError, ValueError) as e:
+            problems = [str(e)]
+        for problem in problems:
+            console.print(f"[bold red]Atenção: {os.path.basename(path)}: {problem}[/bold red]")
+
+def run_batch(args):
+    """
+    Processa todos os arquivos do lote em um pool de processos e mostra o tempo de cada um.
+    """
+    plt.switch_backend("Agg")
+    segy_files = resolve_segy_paths(args.batch)
+    if not segy_files:
+        console.print(f"[bold red]Nenhum arquivo SEGY encontrado em: {args.batch}[/bold red]")
+        return 1
+
+    warn_header_mismatches(segy_files)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    workers = max(1, min(args.workers, len(segy_files)))
+    console.print(f"[bold blue]Processando {len(segy_files)} arquivo(s) com {workers} processo(s)...[/bold blue]")
+
+    table = Table(title="Processamento em lote")
+    table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Saída", justify="left", style="green")
+    table.add_column("Tempo (s)", justify="right", style="magenta")
+
+    start = time.perf_counter()
+    timings, failures, profiles = [], [], []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        futures = {executor.submit(render_segy_file, path, args): path for path in segy_files}
+        for future in as_completed(futures):
+            segy_file_name = os.path.basename(futures[future])
+            try:
+                output_file, seconds, profile = future.result()
+            except Exception as e:
+                failures.append(segy_file_name)
+                table.add_row(segy_file_name, f"[red]erro: {e}[/red]", "-")
+                continue
+            timings.append(seconds)
+            profiles.append(profile)
+            table.add_row(segy_file_name, output_file, f"{seconds:.2f}")
+    elapsed = time.perf_counter() - start
+
+    console.print(table)
+    summary = Tree("[bold blue]Resumo[/bold blue]")
+    summary.add(f"[green]Arquivos processados: {len(timings)}[/green]")
+    summary.add(f"[red]Falhas: {len(failures)}[/red]")
+    summary.add(f"[green]Tempo total: {elapsed:.2f} s[/green]")
+    if timings:
+        summary.add(f"[green]Tempo médio por arquivo: {sum(timings) / len(timings):.2f} s[/green]")
+    console.print(summary)
+
+    if profiles:
+        console.print(stage_summary_table(profiles, args.trace_memory))
+    if args.profile_json:
+        write_profiles_json(args.profile_json, profiles)
+    return 1 if failures else 0
@@ -0,0 +1,56 @@
+"""
+Manutenção do cache de matrizes decodificadas: aquecimento de um diretório
+inteiro e poda das entradas antigas.
+"""
+
+import os
+
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+from .decode_cache import DecodedCache
+from .segy_scan import resolve_segy_paths
+
+
+console = Console()
+
+def run_cache_command(args):
+    """
+    Executa --cache-warm e/ou --cache-prune e mostra o estado final do cache.
+    """
+    cache = DecodedCache(args.cache_dir, args.cache_max_mb)
+    failures = 0
+
+    if args.cache_prune:
+        removed, freed = cache.prune(drop_stale=True)
+        console.print(f"[bold blue]Poda: {removed} entrada(s) removida(s), {freed / (1024 * 1024):.1f} MB liberados[/bold blue]")
+
+    if args.cache_warm:
+        segy_files = resolve_segy_paths(args.cache_warm)
+        if not segy_files:
+            console.print(f"[bold red]Nenhum arquivo SEGY encontrado em: {args.cache_warm}[/bold red]")
+            return 1
+        console.print(f"[bold blue]Aquecendo o cache com {len(segy_files)} arquivo(s)...[/bold blue]")
+
+        table = Table(title="Aquecimento do cache")
+        table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+        table.add_column("Situação", justify="left", style="green")
+        table.add_column("Tempo (s)", justify="right", style="magenta")
+        for path, seconds, status in cache.warm(segy_files, max_workers=args.workers):
+            if status == 'hit':
+                status = "já no cache"
+            elif status == 'stored':
+                status = "guardado"
+            else:
+                failures += 1
+                status = f"[red]erro: {status}[/red]"
+            table.add_row(os.path.basename(path), status, f"{seconds:.3f}")
+        console.print(table)
+
+    entries = cache.entries()
+    summary = Tree(f"[bold blue]Cache: {cache.directory}[/bold blue]")
+    summary.add(f"[green]Entradas: {len(entries)}[/green]")
+    summary.add(f"[green]Tamanho: {sum(e[1] for e in entries) / (1024 * 1024):.1f} MB de {cache.max_bytes / (1024 * 1024):.0f} MB[/green]")
+    console.print(summary)
+    return 1 if failures else 0
@@ -0,0 +1,234 @@
+"""
+Processamento em blocos de gathers maiores que a memória.
+
+A matriz (n_traces, n_samples) pode ser um np.memmap, um IBMTraceArray ou um
+array comum: ela é percorrida em blocos de traços (e, opcionalmente, de
+amostras), e só um bloco fica decodificado em float32 por vez. Em uma única
+passada são acumuladas as estatísticas globais (máximo, RMS e percentis de
+|amplitude| por um histograma logarítmico de tamanho fixo), aplicados filtro
+e ganho, montada uma matriz reduzida para exibição e, se pedido, gravada a
+saída em resolução total em um arquivo .npy mapeado.
+"""
+
+import numpy as np
+from scipy.signal import hilbert, sosfilt
+
+from .filtering import bandpass_gather, bandpass_sos
+
+# Histograma de |amplitude| pelos 16 bits altos do float32: como os padrões de bits
+# de floats positivos são ordenados, cada classe cobre 1/128 de oitava (~0,5%)
+HISTOGRAM_SHIFT = 16
+HISTOGRAM_BINS = 1 << (31 - HISTOGRAM_SHIFT)
+
+
+def iter_blocks(data, chunk_traces=256, chunk_samples=None):
+    """
+    Percorre `data` em blocos float32: (fatia de traços, fatia de amostras, bloco).
+    Sem `chunk_samples` cada bloco tem os traços inteiros.
+    """
+    n_traces, n_samples = data.shape
+    chunk_samples = chunk_samples or n_samples
+    for start in range(0, n_traces, chunk_traces):
+        rows = slice(start, min(start + chunk_traces, n_traces))
+        for sample_start in range(0, n_samples, chunk_samples):
+            cols = slice(sample_start, min(sample_start + chunk_samples, n_samples))
+            yield rows, cols, np.asarray(data[rows, cols], dtype=np.float32)
+
+
+class RunningStats:
+    """
+    Estatísticas de amplitude acumuladas bloco a bloco, com memória constante.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        self.histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def update(self, block):
+        block = np.asarray(block)
+        if block.size == 0:
+            return
+        self.count += block.size
+        self.minimum = min(self.minimum, float(block.min()))
+        self.maximum = max(self.maximum, float(block.max()))
+        flat = block.ravel()
+        self.sum += float(np.add.reduce(flat, dtype=np.float64))
+        self.sum_squares += float(np.einsum('i,i->', flat, flat, dtype=np.float64))
+
+        bits = np.abs(flat.astype(np.float32, copy=False)).view(np.uint32) >> HISTOGRAM_SHIFT
+        self.histogram += np.bincount(bits, minlength=HISTOGRAM_BINS)[:HISTOGRAM_BINS]
+
+    def percentile(self, q):
+        """
+        Percentil `q` (0 a 100) de |amplitude|, com a resolução do histograma (~0,5%).
+        """
+        if self.count == 0:
+            return 0.0
+        cumulative = np.cumsum(self.histogram)
+        index = min(int(np.searchsorted(cumulative, q / 100.0 * self.count)), HISTOGRAM_BINS - 1)
+        if index == 0:
+            return 0.0
+        # centro da classe
+        bits = np.array([(index << HISTOGRAM_SHIFT) | (1 << (HISTOGRAM_SHIFT - 1))], dtype=np.uint32)
+        return float(bits.view(np.float32)[0])
+
+    def result(self, percentiles=(50, 90, 99, 99.9)):
+        if self.count == 0:
+            return {'count': 0, 'min': 0.0, 'max': 0.0, 'max_abs': 0.0, 'mean': 0.0, 'rms': 0.0, 'percentiles': {}}
+        return {
+            'count': self.count,
+            'min': self.minimum,
+            'max': self.maximum,
+            'max_abs': max(abs(self.minimum), abs(self.maximum)),
+            'mean': self.sum / self.count,
+            'rms': float(np.sqrt(self.sum_squares / self.count)),
+            'percentiles': {q: self.percentile(q) for q in percentiles},
+        }
+
+
+def gather_statistics(data, chunk_traces=256, chunk_samples=None, percentiles=(50, 90, 99, 99.9)):
+    """
+    Máximo, RMS, média e percentis de |amplitude| de todo o gather em uma passada.
+    """
+    stats = RunningStats()
+    for _, _, block in iter_blocks(data, chunk_traces, chunk_samples):
+        stats.update(block)
+    return stats.result(percentiles)
+
+
+def display_factors(shape, max_traces=2000, max_samples=2000):
+    """
+    Fatores de redução (traços, amostras) para a matriz de exibição caber em
+    max_traces x max_samples.
+    """
+    n_traces, n_samples = shape
+    return max(1, -(-n_traces // max_traces)), max(1, -(-n_samples // max_samples))
+
+
+def _reduce_groups(x, factor, axis, op):
+    """
+    Reduz grupos consecutivos de `factor` elementos ao longo de `axis` com `op`
+    (np.maximum ou np.minimum), combinando fatias com passo `factor`.
+    """
+    if factor == 1:
+        return x
+    pad = -x.shape[axis] % factor
+    if pad:
+        widths = [(0, 0), (0, 0)]
+        widths[axis] = (0, pad)
+        x = np.pad(x, widths, mode='edge')
+    index = [slice(None), slice(None)]
+    index[axis] = slice(0, None, factor)
+    out = x[tuple(index)].copy()
+    for offset in range(1, factor):
+        index[axis] = slice(offset, None, factor)
+        op(out, x[tuple(index)], out=out)
+    return out
+
+
+def peak_decimate(block, trace_factor, sample_factor):
+    """
+    Reduz o bloco tomando, em cada grupo trace_factor x sample_factor, a amostra de
+    maior |amplitude| (com o sinal), para não apagar os picos na exibição.
+    """
+    if trace_factor == 1 and sample_factor == 1:
+        return block
+    high = _reduce_groups(_reduce_groups(block, sample_factor, 1, np.maximum), trace_factor, 0, np.maximum)
+    low = _reduce_groups(_reduce_groups(block, sample_factor, 1, np.minimum), trace_factor, 0, np.minimum)
+    return np.where(np.abs(low) > np.abs(high), low, high)
+
+
+def _open_output(out, shape):
+    if isinstance(out, str):
+        return np.lib.format.open_memmap(out, mode='w+', dtype=np.float32, shape=shape)
+    return out
+
+
+def process_gather(data, fs, freqmin=None, freqmax=None, corners=2, gain_power=0.0, delay=0.0,
+                   chunk_traces=256, chunk_samples=None, out=None, envelope=False, envelope_out=None,
+                   max_display=(2000, 2000), percentiles=(50, 90, 99, 99.9)):
+    """
+    Filtra (passa-banda, se freqmin/freqmax forem dados) e aplica o ganho t**gain_power
+    bloco a bloco, acumulando as estatísticas do resultado e montando a matriz reduzida
+    para exibição, tudo em uma passada.
+
+    Por padrão cada bloco tem os traços inteiros e o filtro é de fase zero. Com
+    `chunk_samples` o tempo também é dividido e o filtro passa a ser causal, com o
+    estado das seções de segunda ordem levado de um bloco ao seguinte (igual ao
+    sosfilt no traço inteiro).
+
+    `out` (array, np.memmap ou caminho .npy) recebe a saída em resolução total.
+    Com `envelope` a envoltória do resultado é calculada no mesmo bloco (que então
+    precisa dos traços inteiros), reduzida em 'envelope_display' e, se for dado,
+    gravada em `envelope_out`.
+    Retorna um dicionário com 'stats', 'display' e os fatores de redução.
+    """
+    n_traces, n_samples = data.shape
+    trace_factor, sample_factor = display_factors(data.shape, *max_display)
+    # os blocos precisam conter grupos inteiros da redução
+    chunk_traces = max(trace_factor, chunk_traces // trace_factor * trace_factor)
+    if chunk_samples:
+        chunk_samples = max(sample_factor, chunk_samples // sample_factor * sample_factor)
+
+    bandpass = freqmin is not None and freqmax is not None
+    sos = bandpass_sos(float(freqmin), float(freqmax), float(fs), int(corners)) if bandpass else None
+    time_chunked = bool(chunk_samples) and chunk_samples < n_samples
+    if envelope and time_chunked:
+        raise ValueError("A envoltória precisa dos traços inteiros: não divida o tempo (chunk_samples).")
+
+    out = _open_output(out, data.shape)
+    envelope_out = _open_output(envelope_out, data.shape) if envelope else None
+    display = np.empty((-(-n_traces // trace_factor), -(-n_samples // sample_factor)), dtype=np.float32)
+    envelope_display = np.empty_like(display) if envelope else None
+    stats = RunningStats()
+    zi = None
+
+    for rows, cols, block in iter_blocks(data, chunk_traces, chunk_samples):
+        if bandpass:
+            if time_chunked:
+                if cols.start == 0:
+                    zi = np.zeros((sos.shape[0], block.shape[0], 2))
+                filtered, zi = sosfilt(sos, block, axis=-1, zi=zi)
+                block = filtered.astype(np.float32)
+            else:
+                block = bandpass_gather(block, freqmin, freqmax, fs, corners)
+        if gain_power:
+            t = delay + np.arange(cols.start, cols.stop) / fs
+            # sem filtro o bloco é uma vista dos dados de entrada: não escrever nele
+            block = block * (np.abs(t) ** gain_power).astype(np.float32)
+
+        stats.update(block)
+        if out is not None:
+            out[rows, cols] = block
+        cells = (slice(rows.start // trace_factor, -(-rows.stop // trace_factor)),
+                 slice(cols.start // sample_factor, -(-cols.stop // sample_factor)))
+        display[cells] = peak_decimate(block, trace_factor, sample_factor)
+        if envelope:
+            block_envelope = np.abs(hilbert(block, axis=-1)).astype(np.float32)
+            if envelope_out is not None:
+                envelope_out[rows, cols] = block_envelope
+            envelope_display[cells] = peak_decimate(block_envelope, trace_factor, sample_factor)
+
+    for output in (out, envelope_out):
+        if isinstance(output, np.memmap):
+            output.flush()
+    return {
+        'stats': stats.result(percentiles),
+        'display': display,
+        'envelope_display': envelope_display,
+        'trace_factor': trace_factor,
+        'sample_factor': sample_factor,
+        'out': out,
+        'envelope_out': envelope_out,
+    }
+
+
+def display_gather(data, chunk_traces=256, max_display=(2000, 2000), percentiles=(50, 90, 99, 99.9)):
+    """
+    Matriz reduzida para exibição e estatísticas do gather sem processamento.
+    """
+    return process_gather(data, fs=1.0, chunk_traces=chunk_traces, max_display=max_display, percentiles=percentiles)
@@ -0,0 +1,107 @@
+"""
+Ponto de entrada da linha de comando.
+
+Só a biblioteca padrão é importada aqui: o modo interativo e o modo em lote
+carregam numpy, matplotlib e rich quando são escolhidos, e `--help` responde
+sem esperar por eles.
+"""
+
+import argparse
+import os
+import sys
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Análise e visualização de dados sísmicos SEGY. Sem argumentos, abre o modo interativo."
+    )
+    parser.add_argument("--batch", metavar="CAMINHO", help="Diretório ou padrão glob de arquivos SEGY para processar sem interação")
+    parser.add_argument("--convert-seg2", metavar="CAMINHO", help="Diretório ou padrão glob de arquivos SEG-2 (.dat) para converter em SEG-Y")
+    parser.add_argument("--passive", metavar="CAMINHO", help="Diretório ou padrão glob de um registro passivo contínuo (SEG-Y ou miniSEED) para processar em janelas")
+    parser.add_argument("--window", type=float, default=10.0, help="Janela do modo passivo em s (padrão: 10)")
+    parser.add_argument("--history", type=float, default=600.0, help="Histórico recente guardado no modo passivo em s (padrão: 600)")
+    parser.add_argument("--pick-first-breaks", metavar="CAMINHO", help="Diretório ou padrão glob de arquivos SEGY para o picking automático das primeiras quebras")
+    parser.add_argument("--pick-method", choices=["sta_lta", "energia"], default="sta_lta", help="Detector das primeiras quebras (padrão: sta_lta)")
+    parser.add_argument("--sta", type=float, default=0.02, help="Janela curta do STA/LTA em s (padrão: 0.02)")
+    parser.add_argument("--lta", type=float, default=0.2, help="Janela longa do STA/LTA em s (padrão: 0.2)")
+    parser.add_argument("--energy-window", type=float, default=0.05, help="Janela da razão de energia em s (padrão: 0.05)")
+    parser.add_argument("--pick-threshold", type=float, help="Limiar do detector (padrão: 4 para sta_lta, 10 para energia)")
+    parser.add_argument("--picks-out", metavar="ARQUIVO", help="Arquivo dos picks, .csv ou .npz (padrão: primeiras_quebras.csv no diretório de saída)")
+    parser.add_argument("--overlay-picks", action="store_true", help="Sobrepõe as primeiras quebras ao wiggle da colagem no modo em lote")
+    parser.add_argument("--view", metavar="ARQUIVO", help="Abre um arquivo SEGY no visualizador interativo (zoom e pan sobre a pirâmide de decimação)")
+    parser.add_argument("--view-mode", choices=["pico", "rms"], default="pico", help="Valor exibido no visualizador: extremo de maior amplitude ou RMS (padrão: pico)")
+    parser.add_argument("--ingest-survey", metavar="CAMINHO", help="Diretório ou padrão glob de tiros SEGY para empilhar em um cubo (tiros x traços x amostras)")
+    parser.add_argument("--survey-out", metavar="DIR", help="Diretório do cubo do levantamento (padrão: .seispro_cubo no diretório dos tiros)")
+    parser.add_argument("--segy-dir", default=os.path.join("Data", "Sismica Ativa"), help="Diretório dos SEG-Y convertidos (padrão: Data/Sismica Ativa)")
+    parser.add_argument("--plot", choices=["colagem", "filtro", "gather", "espectro", "velocidade"], default="colagem", help="Tipo de gráfico (padrão: colagem)")
+    parser.add_argument("--cmap", default="gray")
+    parser.add_argument("--fs", type=float, help="Fator de amostragem (Hz) (padrão: do cabeçalho de cada arquivo)")
+    parser.add_argument("--nfft", type=int, help="Janela da FFT (padrão: calculada pelo número de amostras)")
+    parser.add_argument("--noverlap", type=int, help="Sobreposição (padrão: 3/4 de NFFT)")
+    parser.add_argument("--spectrogram-average", action="store_true", help="Espectrograma da colagem como média dos traços exibidos, em vez de um só traço")
+    parser.add_argument("--freqmin", type=float, default=10.0, help="Frequência mínima do filtro (Hz)")
+    parser.add_argument("--freqmax", type=float, default=30.0, help="Frequência máxima do filtro (Hz)")
+    parser.add_argument("--agc", type=float, metavar="SEGUNDOS", help="Janela do AGC (s) aplicado ao gather antes da colagem")
+    parser.add_argument("--balance", action="store_true", help="Balanceia os traços (divide cada um pelo seu RMS) antes da colagem")
+    parser.add_argument("--fk-vmin", type=float, metavar="M/S", help="Filtro f-k antes da colagem: rejeita eventos com velocidade aparente abaixo desta (ex.: ground roll)")
+    parser.add_argument("--fk-vmax", type=float, metavar="M/S", help="Filtro f-k antes da colagem: rejeita eventos com velocidade aparente acima desta")
+    parser.add_argument("--trace-spacing", type=float, metavar="M", help="Espaçamento entre traços do filtro f-k em m (padrão: dos afastamentos nos cabeçalhos; obrigatório se eles não tiverem a geometria)")
+    parser.add_argument("--velocity-range", type=float, nargs=2, default=[200.0, 4000.0], metavar=("VMIN", "VMAX"), help="Faixa de velocidades da semblance em m/s (padrão: 200 4000)")
+    parser.add_argument("--num-velocities", type=int, default=100, help="Número de velocidades da semblance (padrão: 100)")
+    parser.add_argument("--time-window", type=float, nargs=2, metavar=("INICIO", "FIM"), help="Janela de tempo em s (padrão: traço inteiro)")
+    parser.add_argument("--output-dir", default="plots_batch", help="Diretório dos gráficos gerados")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Número de processos")
+    parser.add_argument("--profile-json", metavar="ARQUIVO", help="Grava o tempo e a memória de cada etapa em JSON")
+    parser.add_argument("--max-memory-mb", type=float, default=1024.0, help="Acima deste tamanho decodificado (MB) o arquivo é processado em blocos, sem carregar tudo (padrão: 1024)")
+    parser.add_argument("--no-cache", action="store_true", help="Não usa o cache de matrizes decodificadas")
+    parser.add_argument("--cache-dir", help="Diretório do cache (padrão: $SEISPRO_CACHE_DIR ou ~/.cache/seispro)")
+    parser.add_argument("--cache-max-mb", type=float, default=2048.0, help="Tamanho máximo do cache em MB (padrão: 2048)")
+    parser.add_argument("--cache-warm", metavar="CAMINHO", help="Decodifica e guarda no cache os arquivos SEGY de um diretório ou padrão glob")
+    parser.add_argument("--cache-prune", action="store_true", help="Remove do cache as entradas de arquivos alterados ou apagados e aplica o limite de tamanho")
+    parser.add_argument("--trace-memory", action="store_true", help="Mede o pico de memória alocada por etapa com tracemalloc (mais lento)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.convert_seg2:
+        from .convert import run_conversion
+
+        return run_conversion(args)
+    if args.cache_warm or args.cache_prune:
+        from .cache_command import run_cache_command
+
+        return run_cache_command(args)
+    if args.ingest_survey:
+        from .survey_command import run_ingest
+
+        return run_ingest(args)
+    if args.pick_first_breaks:
+        from .pick_command import run_picking
+
+        return run_picking(args)
+    if args.view:
+        from .view_command import run_view
+
+        return run_view(args)
+    if args.passive:
+        from .passive_mode import run_passive
+
+        return run_passive(args)
+    if args.batch:
+        from .batch import run_batch
+
+        return run_batch(args)
+
+    from .app import main as interactive_main
+
+    cache = None
+    if not args.no_cache:
+        from .decode_cache import DecodedCache
+
+        cache = DecodedCache(args.cache_dir, args.cache_max_mb)
+    interactive_main(profile_json=args.profile_json, trace_memory=args.trace_memory, cache=cache, max_memory_mb=args.max_memory_mb)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
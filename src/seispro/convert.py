@@ -0,0 +1,58 @@
+"""
+Modo de conversão: transforma os arquivos SEG-2 de uma pasta de aquisição em
+SEG-Y rev1, em um pool de processos, e mostra o resultado de cada arquivo.
+"""
+
+import os
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+from .seg2 import convert_seg2_files, resolve_seg2_files
+
+
+console = Console()
+
+def run_conversion(args):
+    """
+    Converte os arquivos SEG-2 de args.convert_seg2 para args.segy_dir.
+    """
+    seg2_files = resolve_seg2_files(args.convert_seg2)
+    if not seg2_files:
+        console.print(f"[bold red]Nenhum arquivo SEG-2 encontrado em: {args.convert_seg2}[/bold red]")
+        return 1
+
+    workers = max(1, min(args.workers, len(seg2_files)))
+    console.print(f"[bold blue]Convertendo {len(seg2_files)} arquivo(s) para {args.segy_dir} com {workers} processo(s)...[/bold blue]")
+
+    start = time.perf_counter()
+    results = convert_seg2_files(seg2_files, args.segy_dir, max_workers=workers)
+    elapsed = time.perf_counter() - start
+
+    table = Table(title="Conversão SEG-2 → SEG-Y")
+    table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Saída", justify="left", style="green")
+    table.add_column("Traços", justify="center", style="magenta")
+    table.add_column("Amostras", justify="center", style="yellow")
+    table.add_column("Amostragem (µs)", justify="center", style="green")
+    table.add_column("Data/Hora", justify="center", style="blue")
+    failures = 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            table.add_row(result['file'], f"[red]erro: {result['error']}[/red]", "-", "-", "-", "-")
+            continue
+        table.add_row(
+            result['file'], os.path.basename(result['output']), str(result['num_traces']),
+            str(result['num_samples']), str(result['sample_interval']), result['acquired'] or "-",
+        )
+    console.print(table)
+
+    summary = Tree("[bold blue]Resumo[/bold blue]")
+    summary.add(f"[green]Arquivos convertidos: {len(results) - failures}[/green]")
+    summary.add(f"[red]Falhas: {failures}[/red]")
+    summary.add(f"[green]Tempo total: {elapsed:.2f} s[/green]")
+    console.print(summary)
+    return 1 if failures else 0
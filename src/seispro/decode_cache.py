@@ -0,0 +1,216 @@
+"""
+Cache em disco das matrizes já decodificadas.
+
+Cada arquivo SEG-Y lido é guardado como `data.npy` (float32, traços x amostras),
+`headers.npy` (cabeçalhos de traço estruturados) e `info.json` (resumo dos
+cabeçalhos) em um subdiretório cujo nome é o hash do caminho, do tamanho e do
+mtime do arquivo de origem; um arquivo alterado ganha outra chave e a entrada
+antiga sai pela poda. Na leitura os .npy são abertos com np.load(mmap_mode='r'),
+sem copiar as amostras para a memória.
+
+A pirâmide de decimação do visualizador (seispro.pyramid) é gravada na mesma
+entrada, ao lado da matriz, e sai junto com ela.
+
+O tamanho total é limitado: o mtime de `info.json` marca o último acesso e as
+entradas menos usadas são removidas primeiro (LRU).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_MAX_MB = 2048.0
+STORE_CHUNK_TRACES = 256
+
+DATA_FILE_NAME = 'data.npy'
+HEADERS_FILE_NAME = 'headers.npy'
+INFO_FILE_NAME = 'info.json'
+
+
+def default_cache_dir():
+    """
+    Diretório do cache: $SEISPRO_CACHE_DIR ou seispro/ dentro de $XDG_CACHE_HOME (~/.cache).
+    """
+    if os.environ.get('SEISPRO_CACHE_DIR'):
+        return os.environ['SEISPRO_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'seispro')
+
+
+def _source_stat(file_path):
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+
+def cache_key(file_path):
+    """
+    Chave da entrada: hash do caminho absoluto, do tamanho e do mtime do arquivo.
+    """
+    path, size, mtime_ns = _source_stat(file_path)
+    return hashlib.sha1(f"{path}\0{size}\0{mtime_ns}".encode('utf-8')).hexdigest()
+
+
+class DecodedCache:
+    """
+    Cache LRU em disco de (dados float32, cabeçalhos, resumo) por arquivo SEG-Y,
+    limitado a `max_mb` megabytes.
+    """
+
+    def __init__(self, directory=None, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    def _entry_dir(self, key):
+        return os.path.join(self.directory, key)
+
+    def load(self, file_path, mmap_mode='r'):
+        """
+        Retorna (dados, cabeçalhos, resumo) do cache ou None se o arquivo não estiver
+        no cache (ou tiver mudado desde que foi guardado).
+        """
+        try:
+            entry = self._entry_dir(cache_key(file_path))
+            with open(os.path.join(entry, INFO_FILE_NAME), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+            for name in ('source', 'source_size', 'source_mtime_ns'):
+                info.pop(name, None)
+            data = np.load(os.path.join(entry, DATA_FILE_NAME), mmap_mode=mmap_mode)
+            headers_path = os.path.join(entry, HEADERS_FILE_NAME)
+            headers = np.load(headers_path, mmap_mode=mmap_mode) if os.path.exists(headers_path) else None
+            os.utime(os.path.join(entry, INFO_FILE_NAME))
+        except (OSError, ValueError):
+            return None
+        return data, headers, info
+
+    def pyramid_dir(self, file_path):
+        """
+        Diretório da entrada do arquivo, onde fica a pirâmide de decimação, ou None se
+        o arquivo não estiver no cache.
+        """
+        try:
+            entry = self._entry_dir(cache_key(file_path))
+        except OSError:
+            return None
+        return entry if os.path.isdir(entry) else None
+
+    def store(self, file_path, data, headers, info):
+        """
+        Guarda a matriz decodificada (e os cabeçalhos, se forem um array estruturado) e
+        aplica o limite de tamanho. Falhas de escrita são ignoradas: o cache é só um atalho.
+        """
+        try:
+            key = cache_key(file_path)
+            entry = self._entry_dir(key)
+            tmp_entry = f"{entry}.tmp{os.getpid()}"
+            os.makedirs(tmp_entry, exist_ok=True)
+            cached = np.lib.format.open_memmap(os.path.join(tmp_entry, DATA_FILE_NAME), mode='w+', dtype=np.float32, shape=data.shape)
+            # cópia em blocos de traços, para não decodificar o arquivo inteiro de uma vez
+            for start in range(0, data.shape[0], STORE_CHUNK_TRACES):
+                cached[start:start + STORE_CHUNK_TRACES] = data[start:start + STORE_CHUNK_TRACES]
+            cached.flush()
+            del cached
+            if isinstance(headers, np.ndarray) and headers.dtype.names:
+                np.save(os.path.join(tmp_entry, HEADERS_FILE_NAME), np.asarray(headers))
+            path, size, mtime_ns = _source_stat(file_path)
+            with open(os.path.join(tmp_entry, INFO_FILE_NAME), 'w', encoding='utf-8') as f:
+                json.dump(dict(info, source=path, source_size=size, source_mtime_ns=mtime_ns), f)
+            try:
+                os.rename(tmp_entry, entry)
+            except OSError:
+                # Outro processo guardou o mesmo arquivo primeiro
+                shutil.rmtree(tmp_entry, ignore_errors=True)
+        except OSError:
+            return
+        self.prune()
+
+    def entries(self):
+        """
+        Lista as entradas do cache: (chave, bytes, último acesso, resumo).
+        """
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for key in names:
+            entry = self._entry_dir(key)
+            info_path = os.path.join(entry, INFO_FILE_NAME)
+            if '.tmp' in key or not os.path.exists(info_path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(entry))
+                with open(info_path, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+                entries.append((key, size, os.path.getmtime(info_path), info))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def total_bytes(self):
+        return sum(size for _, size, _, _ in self.entries())
+
+    def prune(self, max_bytes=None, drop_stale=False):
+        """
+        Remove as entradas menos usadas até o cache caber em `max_bytes` (padrão: o limite
+        do cache). Com `drop_stale`, remove antes as entradas cujo arquivo de origem sumiu
+        ou mudou. Retorna (entradas removidas, bytes liberados).
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        removed, freed = 0, 0
+
+        if drop_stale:
+            kept = []
+            for entry in entries:
+                info = entry[3]
+                try:
+                    stale = _source_stat(info['source']) != (info['source'], info['source_size'], info['source_mtime_ns'])
+                except (OSError, KeyError):
+                    stale = True
+                if stale:
+                    shutil.rmtree(self._entry_dir(entry[0]), ignore_errors=True)
+                    removed, freed = removed + 1, freed + entry[1]
+                else:
+                    kept.append(entry)
+            entries = kept
+
+        total = sum(size for _, size, _, _ in entries)
+        for key, size, _, _ in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+            removed, freed = removed + 1, freed + size
+        return removed, freed
+
+    def clear(self):
+        return self.prune(max_bytes=0)
+
+    def warm(self, file_paths, max_workers=None):
+        """
+        Decodifica e guarda no cache os arquivos que ainda não estão nele. Retorna uma
+        lista de (arquivo, segundos, 'hit' | 'stored' | mensagem de erro).
+        """
+        from .reader import read_segy_file
+
+        def warm_one(path):
+            start = time.perf_counter()
+            if os.path.isdir(self._entry_dir(cache_key(path))):
+                return path, time.perf_counter() - start, 'hit'
+            try:
+                data, headers, info = read_segy_file(path)
+                self.store(path, data, headers, info)
+            except (OSError, ValueError, struct.error) as e:
+                return path, time.perf_counter() - start, str(e)
+            return path, time.perf_counter() - start, 'stored'
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(warm_one, file_paths))
@@ -0,0 +1,186 @@
+"""
+Ganho e filtragem para exibição: AGC, balanceamento de traços e filtro f-k.
+
+As operações valem para um array (..., n_traces, n_samples), ou seja, um gather
+ou um bloco de tiros do cubo do levantamento de uma vez:
+
+- filtro f-k: FFT 2-D (traços x amostras) de cada gather, máscara pela
+  velocidade aparente |f / k| com rampa cosseno (rejeita os eventos mais lentos
+  que `vmin`, como o ground roll, e opcionalmente os mais rápidos que `vmax`)
+  e FFT inversa;
+- AGC: cada amostra é dividida pelo RMS de uma janela deslizante centrada nela,
+  com as somas na janela tiradas de somas acumuladas dos quadrados;
+- balanceamento: cada traço é dividido pelo seu RMS.
+
+O AGC e o balanceamento valem traço a traço, então o gather é percorrido em
+blocos de traços e pode estar mapeado do disco; o f-k precisa do gather inteiro.
+Um GatherConditioner aloca os buffers de trabalho de um formato de bloco e é
+reaproveitado entre os blocos ou tiros de uma chamada. Entre chamadas só ficam
+guardados o tamanho das FFTs com zeros (next_fast_len) e a máscara f-k; o
+scipy.fft guarda os planos dos tamanhos já usados.
+"""
+
+import functools
+
+import numpy as np
+from scipy import fft as sp_fft
+
+# Fração dos traços acrescentada com zeros antes da FFT f-k, contra o
+# rebatimento espacial dos eventos nas bordas do gather
+FK_TRACE_PADDING = 0.5
+
+
+def trace_spacing(offsets, default=1.0):
+    """
+    Espaçamento entre traços (m): mediana das diferenças não nulas dos afastamentos.
+    """
+    if offsets is None:
+        return default
+    steps = np.abs(np.diff(np.asarray(offsets, dtype=np.float64)))
+    steps = steps[steps > 0]
+    return float(np.median(steps)) if len(steps) else default
+
+
+def _cosine_ramp(x, start, stop):
+    """
+    0 até `start`, 1 a partir de `stop` e meio cosseno entre eles.
+    """
+    ramp = np.clip((x - start) / (stop - start), 0.0, 1.0)
+    return 0.5 - 0.5 * np.cos(np.pi * ramp)
+
+
+def fk_mask(n_traces, n_samples, dt, dx, vmin=None, vmax=None, taper=0.1):
+    """
+    Máscara (n_traces, n_samples // 2 + 1) para o rfft2 de um gather: passa as
+    velocidades aparentes entre `vmin` e `vmax` (m/s), com rampas de largura
+    relativa `taper`. A componente f = 0, k = 0 sempre passa.
+    """
+    k = np.abs(np.fft.fftfreq(n_traces, dx))[:, None]
+    f = np.fft.rfftfreq(n_samples, dt)[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        velocity = np.where(k > 0, f / k, np.inf)
+    mask = np.ones(velocity.shape)
+    if vmin:
+        mask *= _cosine_ramp(velocity, vmin * (1 - taper), vmin)
+    if vmax:
+        mask *= 1 - _cosine_ramp(velocity, vmax, vmax * (1 + taper))
+    mask[0, 0] = 1.0
+    return mask.astype(np.float32)
+
+
+@functools.lru_cache(maxsize=4)
+def _fk_plan(n_traces, n_samples, dt, dx, vmin, vmax, taper):
+    """
+    Tamanho das FFTs com zeros e máscara f-k (somente leitura) de um formato de gather.
+    """
+    fft_shape = (sp_fft.next_fast_len(n_traces + int(np.ceil(n_traces * FK_TRACE_PADDING))), sp_fft.next_fast_len(n_samples, real=True))
+    mask = fk_mask(*fft_shape, dt, dx, vmin, vmax, taper)
+    mask.setflags(write=False)
+    return fft_shape, mask
+
+
+class GatherConditioner:
+    """
+    F-k, AGC e balanceamento de blocos (..., n_traces, n_samples) com formato fixo.
+    `agc_window` é a janela do AGC em s; sem `vmin`/`vmax` não há filtro f-k.
+
+    O resultado de cada chamada é o buffer interno, sobrescrito na chamada seguinte.
+    Blocos com menos elementos no primeiro eixo (o último bloco de traços ou de
+    tiros) usam o começo dos buffers.
+    """
+
+    def __init__(self, shape, dt, dx=1.0, agc_window=None, balance=False, vmin=None, vmax=None, taper=0.1, workers=1):
+        self.shape = tuple(shape)
+        n_traces, n_samples = self.shape[-2:]
+        self.workers = workers
+        self.balance = balance
+        self.agc_half = min(max(1, int(round(agc_window / dt / 2))), (n_samples - 1) // 2) if agc_window else None
+        self.fft_shape = None
+        if vmin or vmax:
+            self.fft_shape, self.mask = _fk_plan(n_traces, n_samples, dt, dx, vmin, vmax, taper)
+        self.out = np.empty(self.shape, dtype=np.float32)
+        if self.agc_half:
+            half = self.agc_half
+            self.cumulative = np.zeros(self.shape[:-1] + (n_samples + 1,))
+            self.power = np.empty(self.shape)
+            samples = np.arange(n_samples)
+            self.counts = (np.minimum(samples + half + 1, n_samples) - np.maximum(samples - half, 0)).astype(np.float64)
+
+    def __call__(self, data):
+        """
+        Condiciona `data`, do formato do bloco ou com menos elementos no primeiro eixo.
+        """
+        count = data.shape[0]
+        out = self.out[:count]
+        np.copyto(out, data, casting='unsafe')
+        n_traces, n_samples = out.shape[-2:]
+
+        if self.fft_shape is not None:
+            spectrum = sp_fft.rfft2(out, s=self.fft_shape, axes=(-2, -1), workers=self.workers)
+            spectrum *= self.mask
+            out[...] = sp_fft.irfft2(spectrum, s=self.fft_shape, axes=(-2, -1), workers=self.workers)[..., :n_traces, :n_samples]
+
+        if self.agc_half:
+            half = self.agc_half
+            cumulative = self.cumulative[:count]
+            rms = self.power[:count]
+            np.square(out, out=rms)
+            np.cumsum(rms, axis=-1, out=cumulative[..., 1:])
+            # soma na janela [j - half, j + half] cortada nas bordas do traço
+            np.copyto(rms[..., :half], cumulative[..., half + 1:2 * half + 1])
+            np.subtract(cumulative[..., 2 * half + 1:], cumulative[..., :n_samples - 2 * half], out=rms[..., half:n_samples - half])
+            np.subtract(cumulative[..., n_samples:], cumulative[..., n_samples - 2 * half:n_samples - half], out=rms[..., n_samples - half:])
+            rms /= self.counts
+            np.sqrt(rms, out=rms)
+            np.divide(out, rms, out=out, where=rms > 0, casting='unsafe')
+
+        if self.balance:
+            rms = np.sqrt(np.einsum('...ij,...ij->...i', out, out, dtype=np.float64) / n_samples)[..., None]
+            np.divide(out, rms, out=out, where=rms > 0, casting='unsafe')
+        return out
+
+
+def condition_gather(data, fs, dx=1.0, chunk_traces=256, out=None, **options):
+    """
+    Aplica GatherConditioner(agc_window, balance, vmin, vmax, taper) ao gather.
+
+    Sem filtro f-k o gather é percorrido em blocos de `chunk_traces` traços, com um
+    só bloco decodificado por vez, então `data` pode estar mapeado do disco; o f-k
+    precisa do gather inteiro na memória. `out` (array, np.memmap ou caminho .npy)
+    recebe o resultado; sem ele um array novo é alocado.
+    """
+    n_traces, n_samples = data.shape
+    if options.get('vmin') or options.get('vmax'):
+        chunk_traces = n_traces
+    chunk_traces = max(1, min(chunk_traces, n_traces))
+    conditioner = GatherConditioner((chunk_traces, n_samples), 1.0 / fs, float(dx), **options)
+    if isinstance(out, str):
+        out = np.lib.format.open_memmap(out, mode='w+', dtype=np.float32, shape=data.shape)
+    elif out is None:
+        if chunk_traces == n_traces:
+            # um só bloco: o buffer do condicionador já é o resultado
+            return conditioner(np.asarray(data))
+        out = np.empty(data.shape, dtype=np.float32)
+    for start in range(0, n_traces, chunk_traces):
+        out[start:start + chunk_traces] = conditioner(np.asarray(data[start:start + chunk_traces]))
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def condition_shots(cube, fs, dx=1.0, chunk_shots=4, out=None, **options):
+    """
+    Condiciona um cubo (tiros, traços, amostras) em blocos de `chunk_shots` tiros,
+    com um só condicionador. `out` (array ou np.memmap do mesmo formato) recebe o
+    resultado; sem ele um array novo é alocado.
+    """
+    n_shots = cube.shape[0]
+    chunk_shots = max(1, min(chunk_shots, n_shots))
+    conditioner = GatherConditioner((chunk_shots,) + tuple(cube.shape[1:]), 1.0 / fs, dx, **options)
+    if out is None:
+        out = np.empty(cube.shape, dtype=np.float32)
+    for start in range(0, n_shots, chunk_shots):
+        out[start:start + chunk_shots] = conditioner(cube[start:start + chunk_shots])
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
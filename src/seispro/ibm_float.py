@@ -0,0 +1,162 @@
+"""
+Decodificação vetorizada de IBM float (formato SEG-Y 1) para IEEE float32.
+
+A conversão trabalha diretamente nos bits de arrays uint32: a mantissa de
+24 bits é convertida para float32 (operação exata), o que normaliza o valor,
+e o expoente IEEE é corrigido somando o expoente IBM (base 16) convertido
+para base 2. Apenas valores fora do intervalo do float32 passam por um
+caminho lento.
+"""
+
+import numpy as np
+
+# Elementos decodificados por bloco; limita a memória temporária
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_SIGN_MASK = np.uint32(0x80000000)
+_MANTISSA_MASK = np.uint32(0x00ffffff)
+_FRACTION_MASK = np.uint32(0x007fffff)
+# expoente IEEE = expoente de float32(mantissa) + 4 * expoente IBM - 64 * 4 - 24
+_EXPONENT_BIAS = 280
+
+
+class _Workspace:
+    """
+    Buffers temporários reaproveitados entre blocos.
+    """
+
+    def __init__(self, size):
+        self.sign = np.empty(size, dtype=np.uint32)
+        self.exponent = np.empty(size, dtype=np.int32)
+        self.tmp = np.empty(size, dtype=np.uint32)
+        self.zero = np.empty(size, dtype=bool)
+        self.mask = np.empty(size, dtype=bool)
+
+    def view(self, n):
+        return self.sign[:n], self.exponent[:n], self.tmp[:n], self.zero[:n], self.mask[:n]
+
+
+def _decode_block(words, out, workspace):
+    """
+    Converte um bloco 1-D de palavras IBM (uint32 nativo) para float32 em `out`.
+    O conteúdo de `words` é substituído pela mantissa.
+    """
+    sign, exponent, tmp, zero, mask = workspace.view(words.size)
+    bits = out.view(np.uint32)
+
+    np.bitwise_and(words, _SIGN_MASK, out=sign)
+    # 4 * expoente IBM, ainda sem o deslocamento de 64
+    np.right_shift(words, 22, out=tmp)
+    np.bitwise_and(tmp, 0x1fc, out=tmp)
+    np.copyto(exponent, tmp, casting='unsafe')
+
+    # float32(mantissa) é exato e já normalizado
+    np.bitwise_and(words, _MANTISSA_MASK, out=words)
+    np.copyto(out, words, casting='unsafe')
+    np.equal(words, 0, out=zero)
+
+    np.right_shift(bits, 23, out=tmp)
+    exponent += tmp.view(np.int32)
+    exponent -= _EXPONENT_BIAS
+
+    np.left_shift(exponent, 23, out=tmp.view(np.int32))
+    np.bitwise_and(bits, _FRACTION_MASK, out=bits)
+    np.bitwise_or(bits, tmp, out=bits)
+    np.bitwise_or(bits, sign, out=bits)
+
+    # Zero IBM (mantissa nula) vira zero com sinal
+    if zero.any():
+        np.copyto(bits, sign, where=zero)
+
+    # Underflow (subnormal) e overflow: raros em dados sísmicos
+    np.less_equal(exponent, 0, out=mask)
+    mask |= exponent >= 255
+    mask &= ~zero
+    if mask.any():
+        idx = np.flatnonzero(mask)
+        mantissa = words[idx].astype(np.float64)
+        _, exponent2 = np.frexp(mantissa)
+        values = np.ldexp(mantissa, exponent[idx] - 126 - exponent2)
+        values[sign[idx] != 0] *= -1
+        out[idx] = values.astype(np.float32)
+
+
+def ibm_to_ieee(raw, out=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Converte IBM float para float32.
+
+    `raw` pode ser bytes (big-endian) ou um array de inteiros de 32 bits em
+    qualquer ordem de bytes, inclusive uma visão mapeada de arquivo com
+    linhas não contíguas. `out`, se fornecido, deve ser um array float32
+    C-contíguo com o mesmo formato e recebe o resultado. A conversão é feita
+    em blocos de `chunk_size` elementos para limitar a memória temporária.
+    """
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = np.frombuffer(raw, dtype='>u4')
+    raw = np.asarray(raw)
+    if raw.dtype.kind not in 'ui' or raw.dtype.itemsize != 4:
+        raise TypeError("IBM float deve ser fornecido como inteiros de 32 bits.")
+
+    if out is None:
+        out = np.empty(raw.shape, dtype=np.float32)
+    elif out.shape != raw.shape or out.dtype != np.float32 or not out.flags.c_contiguous:
+        raise ValueError("`out` deve ser float32, C-contíguo e com o mesmo formato da entrada.")
+
+    if raw.size == 0:
+        return out
+
+    rows = raw.reshape(-1, raw.shape[-1]) if raw.ndim > 1 else raw.reshape(1, -1)
+    flat_out = out.reshape(rows.shape)
+    n_rows, n_cols = rows.shape
+
+    if n_cols >= chunk_size:
+        block_size = chunk_size
+    else:
+        rows_per_chunk = max(1, chunk_size // n_cols)
+        block_size = min(rows_per_chunk, n_rows) * n_cols
+    workspace = _Workspace(block_size)
+    words = np.empty(block_size, dtype=np.uint32)
+
+    if n_cols >= chunk_size:
+        # Linhas longas: blocos ao longo de cada linha
+        for i in range(n_rows):
+            for start in range(0, n_cols, chunk_size):
+                stop = min(start + chunk_size, n_cols)
+                block = words[:stop - start]
+                block[...] = rows[i, start:stop]
+                _decode_block(block, flat_out[i, start:stop], workspace)
+    else:
+        for start in range(0, n_rows, rows_per_chunk):
+            stop = min(start + rows_per_chunk, n_rows)
+            n = (stop - start) * n_cols
+            block = words[:n].reshape(stop - start, n_cols)
+            block[...] = rows[start:stop]
+            _decode_block(words[:n], flat_out[start:stop].reshape(-1), workspace)
+
+    return out
+
+
+def ieee_to_ibm(values):
+    """
+    Converte float32/float64 para palavras IBM float (uint32 nativo).
+    Usado para gerar arquivos de teste e de benchmark no formato 1.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    words = np.zeros(values.shape, dtype=np.uint32)
+    nonzero = values != 0
+    magnitude = np.abs(values[nonzero])
+
+    mantissa, exponent2 = np.frexp(magnitude)
+    exponent16 = np.ceil(exponent2 / 4).astype(np.int64)
+    mantissa = mantissa * np.exp2(exponent2 - 4 * exponent16)
+    fraction = np.round(mantissa * (1 << 24)).astype(np.int64)
+
+    # Arredondamento pode levar a mantissa a 1.0
+    carry = fraction >= (1 << 24)
+    fraction[carry] >>= 4
+    exponent16[carry] += 1
+    exponent16 = np.clip(exponent16 + 64, 0, 127)
+
+    sign = (values[nonzero] < 0).astype(np.uint32) << 31
+    words[nonzero] = sign | (exponent16.astype(np.uint32) << 24) | fraction.astype(np.uint32)
+    return words
@@ -0,0 +1,117 @@
+"""
+Instrumentação das etapas de processamento.
+
+Cada etapa (leitura, decodificação, filtro, espectrograma, renderização,
+savefig...) é medida com tempo de parede e com o pico de memória residente
+do processo. Opcionalmente o pico de memória alocada por etapa é medido com
+tracemalloc, que é mais preciso mas deixa o código Python bem mais lento.
+Os resultados podem ser mostrados no console rich ou gravados em JSON.
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def max_rss_mb():
+    """
+    Pico de memória residente do processo até agora, em MB (None se indisponível).
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+class StageProfiler:
+    """
+    Mede o tempo e a memória de etapas sequenciais (não aninhadas).
+    Se um console rich for fornecido, mostra o progresso de cada etapa.
+    """
+
+    def __init__(self, label='', console=None, trace_memory=False):
+        self.label = label
+        self.console = console
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        status = self.console.status(f"[bold blue]{name}...[/bold blue]") if self.console else contextlib.nullcontext()
+        start = time.perf_counter()
+        try:
+            with status:
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            record = {'stage': name, 'seconds': seconds, 'max_rss_mb': max_rss_mb()}
+            if self.trace_memory:
+                record['peak_memory_mb'] = max(tracemalloc.get_traced_memory()[1] - baseline, 0) / (1024 * 1024)
+            self.records.append(record)
+            if self.console:
+                memory = f", pico alocado {record['peak_memory_mb']:.1f} MB" if self.trace_memory else ""
+                self.console.print(f"[green]✓ {name}[/green] {seconds:.3f} s{memory}")
+
+    @property
+    def total_seconds(self):
+        return sum(r['seconds'] for r in self.records)
+
+    def to_dict(self):
+        return {'label': self.label, 'total_seconds': self.total_seconds, 'stages': self.records}
+
+    def table(self, title=None):
+        """
+        Tabela rich com o tempo e o pico de memória de cada etapa.
+        """
+        from rich.table import Table
+
+        table = Table(title=title or f"Etapas: {self.label}")
+        table.add_column("Etapa", justify="left", style="cyan")
+        table.add_column("Tempo (s)", justify="right", style="magenta")
+        table.add_column("%", justify="right", style="yellow")
+        table.add_column("RSS máximo (MB)", justify="right", style="blue")
+        if self.trace_memory:
+            table.add_column("Pico alocado (MB)", justify="right", style="green")
+
+        total = self.total_seconds or 1.0
+        for r in self.records:
+            rss = r['max_rss_mb']
+            row = [r['stage'], f"{r['seconds']:.3f}", f"{100 * r['seconds'] / total:.1f}", "-" if rss is None else f"{rss:.1f}"]
+            if self.trace_memory:
+                row.append(f"{r['peak_memory_mb']:.1f}")
+            table.add_row(*row)
+        return table
+
+    def write_json(self, path):
+        write_profiles_json(path, [self.to_dict()])
+
+
+def timed(profiler, name):
+    """
+    Contexto de medição de uma etapa; não faz nada se profiler for None.
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
+
+
+def write_profiles_json(path, profiles):
+    """
+    Grava uma lista de perfis (StageProfiler.to_dict) em JSON.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(profiles, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,319 @@
+"""
+Modelagem direta de sismogramas sintéticos em um modelo de camadas planas.
+
+Para K tiros x N receptores x M interfaces, os tempos da onda direta, das
+ondas refratadas (frontais) e das reflexões são calculados de uma vez por
+broadcasting, como arrays (evento, traço). Os eventos viram impulsos com
+interpolação linear entre amostras e são convolvidos com a wavelet (Ricker
+ou fornecida) no domínio da frequência, com uma única rfft/irfft por bloco
+de traços. Os tiros são gerados em blocos, então o levantamento pode ter
+milhares de tiros e receptores sem que tudo fique na memória, e a gravação
+em SEG-Y (um arquivo por tiro, no layout de Data/Sismica Ativa) é feita em
+um pool de processos.
+
+As amplitudes são aproximadas: espalhamento geométrico 1/distância,
+coeficientes de reflexão de incidência normal (densidade de Gardner) e um
+fator fixo para as ondas frontais. As reflexões usam a hipérbole com a
+velocidade RMS, exata para a primeira interface.
+"""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+
+from .seg2 import COORDINATE_SCALAR
+from .segy_write import empty_trace_headers, write_segy
+
+HEAD_WAVE_FACTOR = 0.3
+
+
+def model_geophones_and_layers(num_geophones=8, num_layers=3, layer_depths=None):
+    """
+    Modela geofones e fonte, com camadas horizontais abaixo.
+    """
+    if layer_depths is None:
+        layer_depths = [-100, -200, -300]
+
+    geophone_positions = np.linspace(300, 1500, num_geophones)
+    source_position = 50
+
+    return geophone_positions, source_position, layer_depths
+
+
+def plot_geophones_and_layers(geophones, source, layers, show=True):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    ax.plot(source, 0, 'ro', markersize=10, label="Fonte (*)")
+    ax.text(source - 10, 10, '*', fontsize=15, color='red')
+
+    ax.plot(geophones, np.zeros_like(geophones), 'gv', markersize=8, label="Geofones (x)")
+    for x in geophones:
+        ax.text(x - 5, 10, 'x', fontsize=12, color='green')
+
+    for i, depth in enumerate(layers):
+        ax.axhline(depth, color='black', linestyle='--')
+        ax.text(20, depth + 10, f'Camada {i+1}', fontsize=10, color='black')
+
+    ax.set_xlim(0, 1800)
+    ax.set_ylim(layers[-1] - 50, 50)
+    ax.set_xlabel("Posição (m)", fontsize=12)
+    ax.set_ylabel("Profundidade (m)", fontsize=12)
+    ax.set_title("Fonte, Geofones e Camadas", fontsize=14, fontweight='bold')
+    ax.legend()
+
+    plt.grid(False)
+    if show:
+        plt.show()
+    return fig
+
+
+def layer_thicknesses(depths):
+    """
+    Espessuras das camadas a partir das profundidades das interfaces (positivas ou,
+    como em model_geophones_and_layers, negativas).
+    """
+    depths = np.abs(np.asarray(depths, dtype=np.float64))
+    if np.any(np.diff(depths) <= 0):
+        raise ValueError("As interfaces devem estar em ordem crescente de profundidade.")
+    return np.diff(depths, prepend=0.0)
+
+
+def _check_model(velocities, thicknesses):
+    velocities = np.asarray(velocities, dtype=np.float64)
+    thicknesses = np.asarray(thicknesses, dtype=np.float64)
+    if len(velocities) != len(thicknesses) + 1:
+        raise ValueError(f"São necessárias {len(thicknesses) + 1} velocidades para {len(thicknesses)} interfaces.")
+    if np.any(velocities <= 0):
+        raise ValueError("As velocidades devem ser positivas.")
+    return velocities, thicknesses
+
+
+def ricker(frequency, dt, length=None):
+    """
+    Wavelet de Ricker de fase zero com frequência de pico `frequency` (Hz).
+    Retorna (amostras, índice da amostra central).
+    """
+    length = length or 2.0 / frequency
+    half = int(round(length / 2 / dt))
+    t = np.arange(-half, half + 1) * dt
+    a = (np.pi * frequency * t) ** 2
+    return (1 - 2 * a) * np.exp(-a), half
+
+
+def direct_times(offsets, velocities):
+    return np.abs(offsets) / velocities[0]
+
+
+def refraction_times(offsets, velocities, thicknesses):
+    """
+    Tempos das ondas frontais em cada interface: (M, *offsets.shape). É np.inf onde
+    não há refração (inversão de velocidade ou afastamento menor que o crítico).
+    """
+    velocities, thicknesses = _check_model(velocities, thicknesses)
+    n = len(thicknesses)
+    refractor = velocities[1:]
+    # ratio[j, i] = v_i / v_(j+1), só para as camadas i <= j acima da interface j
+    above = np.tri(n, dtype=bool)
+    ratio = np.where(above, velocities[None, :n] / refractor[:, None], 0.0)
+    exists = np.all(ratio < 1, axis=1)
+    ratio = np.minimum(ratio, 1 - 1e-12)
+    cos = np.sqrt(1 - ratio ** 2)
+    intercept = np.sum(np.where(above, 2 * thicknesses * cos / velocities[:n], 0.0), axis=1)
+    critical = np.sum(np.where(above, 2 * thicknesses * ratio / cos, 0.0), axis=1)
+
+    x = np.abs(offsets)[None]
+    shape = (n,) + (1,) * np.ndim(offsets)
+    times = x / refractor.reshape(shape) + intercept.reshape(shape)
+    valid = exists.reshape(shape) & (x >= critical.reshape(shape))
+    return np.where(valid, times, np.inf)
+
+
+def reflection_times(offsets, velocities, thicknesses):
+    """
+    Tempos das reflexões em cada interface: (M, *offsets.shape), pela hipérbole
+    sqrt(t0**2 + x**2 / v_rms**2).
+    """
+    velocities, thicknesses = _check_model(velocities, thicknesses)
+    interval = 2 * thicknesses / velocities[:-1]
+    t0 = np.cumsum(interval)
+    vrms = np.sqrt(np.cumsum(velocities[:-1] ** 2 * interval) / t0)
+
+    shape = (len(thicknesses),) + (1,) * np.ndim(offsets)
+    x = np.asarray(offsets)[None]
+    return np.sqrt(t0.reshape(shape) ** 2 + (x / vrms.reshape(shape)) ** 2)
+
+
+def reflection_coefficients(velocities, densities=None):
+    """
+    Coeficientes de reflexão de incidência normal. Sem densidades, usa Gardner
+    (rho = 310 * v**0.25, em kg/m³).
+    """
+    velocities = np.asarray(velocities, dtype=np.float64)
+    densities = 310 * velocities ** 0.25 if densities is None else np.asarray(densities, dtype=np.float64)
+    impedance = velocities * densities
+    return (impedance[1:] - impedance[:-1]) / (impedance[1:] + impedance[:-1])
+
+
+def event_table(offsets, velocities, thicknesses, densities=None, min_distance=1.0):
+    """
+    Tempos e amplitudes de todos os eventos: dois arrays (1 + 2M, *offsets.shape),
+    na ordem onda direta, refrações, reflexões.
+    """
+    velocities, thicknesses = _check_model(velocities, thicknesses)
+    x = np.maximum(np.abs(offsets), min_distance)
+
+    direct = direct_times(offsets, velocities)[None]
+    refracted = refraction_times(offsets, velocities, thicknesses)
+    reflected = reflection_times(offsets, velocities, thicknesses)
+
+    shape = (len(thicknesses),) + (1,) * np.ndim(offsets)
+    # o caminho da reflexão é aproximado por v_rms * t, que cresce com o tempo
+    interval = 2 * thicknesses / velocities[:-1]
+    vrms = np.sqrt(np.cumsum(velocities[:-1] ** 2 * interval) / np.cumsum(interval))
+    reflected_amplitude = reflection_coefficients(velocities, densities).reshape(shape) / (vrms.reshape(shape) * reflected)
+
+    times = np.concatenate((direct, refracted, reflected))
+    amplitudes = np.concatenate((
+        1.0 / x[None],
+        np.broadcast_to(HEAD_WAVE_FACTOR / x, refracted.shape),
+        reflected_amplitude,
+    ))
+    return times, np.where(np.isfinite(times), amplitudes, 0.0)
+
+
+@functools.lru_cache(maxsize=16)
+def _wavelet_spectrum(wavelet, center, nfft):
+    padded = np.zeros(nfft)
+    padded[:len(wavelet)] = wavelet
+    # a amostra central vai para o índice 0: a convolução não desloca os eventos
+    return rfft(np.roll(padded, -center)).astype(np.complex64)
+
+
+def synthetic_traces(times, amplitudes, num_samples, dt, wavelet, center, delay=0.0):
+    """
+    Traços (T, num_samples) float32 com os eventos (E, T) convolvidos com a wavelet.
+    `center` é o índice da amostra da wavelet que marca o tempo do evento.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    n_traces = times.shape[1]
+    nfft = next_fast_len(num_samples + len(wavelet))
+
+    position = (times - delay) / dt
+    valid = np.isfinite(position) & (position >= 0) & (position < num_samples - 1)
+    position = np.where(valid, position, 0.0)
+    index = np.floor(position).astype(np.int64)
+    fraction = position - index
+    weights = np.where(valid, amplitudes, 0.0)
+    flat = (index + np.arange(n_traces) * nfft).ravel()
+
+    spikes = np.bincount(flat, (weights * (1 - fraction)).ravel(), minlength=n_traces * nfft)
+    spikes += np.bincount(flat + 1, (weights * fraction).ravel(), minlength=n_traces * nfft)
+    # precisão simples: metade do custo das FFTs, que dominam o tempo
+    spectrum = rfft(spikes.astype(np.float32).reshape(n_traces, nfft), axis=-1, overwrite_x=True)
+    spectrum *= _wavelet_spectrum(tuple(np.asarray(wavelet, dtype=np.float64)), int(center), nfft)
+    return np.ascontiguousarray(irfft(spectrum, n=nfft, axis=-1, overwrite_x=True)[:, :num_samples])
+
+
+def iter_shot_gathers(sources, receivers, velocities, depths, num_samples=2000, dt=0.002, frequency=30.0,
+                      wavelet=None, densities=None, noise=0.0, seed=0, chunk_traces=8192, shots=None):
+    """
+    Gera os gathers de tiro comum em blocos de tiros: (índices dos tiros, dados
+    (tiros, receptores, amostras)). `sources` e `receivers` são posições x (m) ao
+    longo da linha. `wavelet` é (amostras, índice central); o padrão é uma Ricker
+    de `frequency` Hz. `noise` é o desvio do ruído gaussiano relativo ao pico de
+    cada traço (o pico do tiro é o do traço mais próximo da fonte), com semente
+    fixa por tiro.
+    """
+    sources = np.asarray(sources, dtype=np.float64)
+    receivers = np.asarray(receivers, dtype=np.float64)
+    thicknesses = layer_thicknesses(depths)
+    velocities, thicknesses = _check_model(velocities, thicknesses)
+    wavelet, center = ricker(frequency, dt) if wavelet is None else wavelet
+    shots = np.arange(len(sources)) if shots is None else np.asarray(shots)
+    per_chunk = max(1, chunk_traces // len(receivers))
+
+    for start in range(0, len(shots), per_chunk):
+        chunk = shots[start:start + per_chunk]
+        offsets = receivers[None, :] - sources[chunk, None]
+        times, amplitudes = event_table(offsets.ravel(), velocities, thicknesses, densities)
+        data = synthetic_traces(times, amplitudes, num_samples, dt, wavelet, center)
+        data = data.reshape(len(chunk), len(receivers), num_samples)
+        if noise:
+            for row, shot in enumerate(chunk):
+                rng = np.random.default_rng([seed, int(shot)])
+                scale = noise * np.abs(data[row]).max(axis=-1, keepdims=True)
+                data[row] += rng.standard_normal(data[row].shape, dtype=np.float32) * scale.astype(np.float32)
+        yield chunk, data
+
+
+def shot_headers(shot, source, receivers):
+    """
+    Cabeçalhos de traço de um tiro, com as mesmas convenções da conversão SEG-2
+    (coordenadas em centímetros, escalar -100).
+    """
+    scale = -COORDINATE_SCALAR
+    headers = empty_trace_headers(len(receivers))
+    headers['field_record'] = shot + 1
+    headers['energy_source_point'] = shot + 1
+    headers['trace_number'] = np.arange(1, len(receivers) + 1)
+    headers['trace_id'] = 1
+    headers['vertical_stack'] = 1
+    headers['offset'] = np.round(receivers - source)
+    headers['elevation_scalar'] = COORDINATE_SCALAR
+    headers['coordinate_scalar'] = COORDINATE_SCALAR
+    headers['source_x'] = round(source * scale)
+    headers['receiver_x'] = np.round(receivers * scale)
+    headers['coordinate_units'] = 1
+    return headers
+
+
+def _textual_lines(velocities, depths, frequency, num_receivers, num_samples, sample_interval):
+    return [
+        "SYNTHETIC SHOT GATHER GENERATED BY SEIS-PRO",
+        "FLAT LAYERED MODEL",
+        "VELOCITIES (M/S) " + " ".join(f"{v:g}" for v in velocities),
+        "INTERFACE DEPTHS (M) " + " ".join(f"{abs(d):g}" for d in depths),
+        f"RICKER PEAK FREQUENCY {frequency:g} HZ",
+        f"TRACES {num_receivers}  SAMPLES {num_samples}  SAMPLE INTERVAL {sample_interval} US",
+        "SAMPLE FORMAT IEEE FLOAT 32 BITS",
+    ]
+
+
+def _write_shot_chunk(output_dir, sources, receivers, velocities, depths, num_samples, sample_interval, options, shots):
+    lines = _textual_lines(velocities, depths, options.get('frequency', 30.0), len(receivers), num_samples, sample_interval)
+    paths = []
+    for chunk, data in iter_shot_gathers(sources, receivers, velocities, depths, num_samples, sample_interval / 1e6, shots=shots, **options):
+        for shot, gather in zip(chunk, data):
+            path = os.path.join(output_dir, f"{shot + 1}.SGY")
+            write_segy(path, gather, sample_interval, shot_headers(int(shot), sources[shot], receivers), lines, job_id=1)
+            paths.append(path)
+    return paths
+
+
+def write_synthetic_survey(output_dir, sources, receivers, velocities, depths, num_samples=2000, sample_interval=2000,
+                           max_workers=None, **options):
+    """
+    Grava um arquivo SEG-Y por tiro (1.SGY, 2.SGY, ...) em `output_dir`, com os
+    tiros divididos entre processos. `options` vai para iter_shot_gathers
+    (frequency, wavelet, densities, noise, seed, chunk_traces).
+    Retorna a lista de arquivos gravados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    sources = np.asarray(sources, dtype=np.float64)
+    receivers = np.asarray(receivers, dtype=np.float64)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(sources)))
+
+    write = functools.partial(_write_shot_chunk, output_dir, sources, receivers, list(velocities), list(depths), num_samples, sample_interval, options)
+    groups = np.array_split(np.arange(len(sources)), max_workers * 4 if max_workers > 1 else 1)
+    groups = [group for group in groups if len(group)]
+    if max_workers == 1:
+        return [path for group in groups for path in write(group)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [path for paths in executor.map(write, groups) for path in paths]
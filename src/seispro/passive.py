@@ -0,0 +1,267 @@
+"""
+Processamento contínuo de registros passivos longos.
+
+Os arquivos (SEG-Y ou miniSEED, em ordem de tempo) são lidos como uma sequência
+de segmentos (canais x amostras) e remontados em janelas de tamanho fixo dentro
+de um único buffer pré-alocado. Cada janela passa uma vez pelo processamento:
+
+- passa-banda causal com o estado das seções de segunda ordem (zi) levado de
+  uma janela à seguinte, igual a filtrar o registro inteiro de uma vez;
+- envoltória de Hilbert da janela filtrada, com as últimas amostras da janela
+  anterior como contexto para não criar bordas no início de cada janela;
+- espectrograma incremental: só os quadros novos são transformados, e as
+  amostras que sobram no fim da janela ficam para o próximo quadro.
+
+O histórico recente (filtrado, envoltória e quadros do espectrograma) fica em
+buffers circulares de tamanho fixo, então a memória não cresce com a duração
+do registro.
+"""
+
+import glob
+import itertools
+import os
+
+import numpy as np
+from scipy.fft import next_fast_len
+from scipy.signal import hilbert, sosfilt
+
+from .filtering import bandpass_sos
+from .segy_mmap import open_segy_memmap
+from .segy_scan import SEGY_EXTENSIONS, sampling_parameters
+from .spectrogram import stft_power
+
+MSEED_EXTENSIONS = ('.mseed', '.MSEED', '.msd', '.MSD', '.miniseed')
+
+
+class RingBuffer:
+    """
+    Buffer circular pré-alocado de `capacity` colunas para (n_rows, tempo).
+    """
+
+    def __init__(self, n_rows, capacity, dtype=np.float32):
+        self._data = np.zeros((n_rows, capacity), dtype=dtype)
+        self._pos = 0
+        self.filled = 0
+        self.total = 0
+
+    @property
+    def capacity(self):
+        return self._data.shape[1]
+
+    def extend(self, block):
+        """
+        Acrescenta as colunas de `block`; as mais antigas são sobrescritas.
+        """
+        n = block.shape[1]
+        self.total += n
+        if n >= self.capacity:
+            self._data[:] = block[:, n - self.capacity:]
+            self._pos = 0
+            self.filled = self.capacity
+            return
+        first = min(n, self.capacity - self._pos)
+        self._data[:, self._pos:self._pos + first] = block[:, :first]
+        self._data[:, :n - first] = block[:, first:]
+        self._pos = (self._pos + n) % self.capacity
+        self.filled = min(self.capacity, self.filled + n)
+
+    def view(self):
+        """
+        Cópia do conteúdo em ordem cronológica: (n_rows, filled).
+        """
+        if self.filled < self.capacity:
+            return self._data[:, :self.filled].copy()
+        return np.concatenate((self._data[:, self._pos:], self._data[:, :self._pos]), axis=1)
+
+
+class RollingSpectrogram:
+    """
+    Espectrograma (média dos canais) atualizado janela a janela com
+    spectrogram.stft_power, só nos quadros novos. Guarda os últimos `max_frames`.
+    """
+
+    def __init__(self, nfft, noverlap, fs, max_frames=2048):
+        if not 0 <= noverlap < nfft:
+            raise ValueError("noverlap deve estar entre 0 e NFFT - 1.")
+        self.nfft = nfft
+        self.step = nfft - noverlap
+        self.fs = fs
+        self.freqs = np.fft.rfftfreq(nfft, 1.0 / fs)
+        self.frames = RingBuffer(len(self.freqs), max_frames)
+        self._pending = None
+
+    def update(self, block):
+        data = block if self._pending is None else np.concatenate((self._pending, block), axis=1)
+        n_frames = (data.shape[1] - self.nfft) // self.step + 1 if data.shape[1] >= self.nfft else 0
+        if n_frames > 0:
+            used = (n_frames - 1) * self.step + self.nfft
+            _, _, power = stft_power(data[:, :used], self.nfft, self.nfft - self.step, self.fs)
+            self.frames.extend(power.mean(axis=0).astype(np.float32))
+        self._pending = data[:, n_frames * self.step:].copy()
+
+    def times(self):
+        """
+        Instante (s, desde o início do registro) do centro de cada quadro guardado.
+        """
+        first = self.frames.total - self.frames.filled
+        return (self.nfft / 2 + self.step * np.arange(first, self.frames.total)) / self.fs
+
+
+class PassiveProcessor:
+    """
+    Filtro passa-banda, envoltória e espectrograma de um registro contínuo,
+    alimentados uma janela (n_channels, n_samples) por vez.
+    """
+
+    def __init__(self, n_channels, fs, freqmin, freqmax, corners=2, nfft=None, noverlap=None,
+                 history_seconds=600.0, envelope_context=256, max_frames=2048):
+        self.n_channels = n_channels
+        self.fs = fs
+        self.sos = bandpass_sos(float(freqmin), float(freqmax), float(fs), int(corners))
+        self._zi = np.zeros((self.sos.shape[0], n_channels, 2))
+        self._context = np.zeros((n_channels, envelope_context), dtype=np.float32)
+
+        history = max(1, int(round(history_seconds * fs)))
+        self.filtered = RingBuffer(n_channels, history)
+        self.envelope = RingBuffer(n_channels, history)
+
+        nfft = nfft or max(16, 1 << int(fs).bit_length())
+        noverlap = nfft // 2 if noverlap is None else noverlap
+        self.spectrogram = RollingSpectrogram(nfft, noverlap, fs, max_frames)
+
+        self.window_starts = []
+        self.window_rms = []
+        self.samples = 0
+
+    @property
+    def seconds(self):
+        return self.samples / self.fs
+
+    def process(self, window):
+        """
+        Processa a próxima janela e retorna (filtrado, envoltória) dela.
+        """
+        filtered, self._zi = sosfilt(self.sos, window, axis=-1, zi=self._zi)
+        filtered = filtered.astype(np.float32)
+
+        context_size = self._context.shape[1]
+        if context_size:
+            extended = np.concatenate((self._context, filtered), axis=1)
+            self._context = extended[:, -context_size:].copy()
+        else:
+            extended = filtered
+        analytic = hilbert(extended, N=next_fast_len(extended.shape[1]), axis=-1)
+        envelope = np.abs(analytic[:, context_size:extended.shape[1]]).astype(np.float32)
+
+        self.filtered.extend(filtered)
+        self.envelope.extend(envelope)
+        self.spectrogram.update(filtered)
+        self.window_starts.append(self.seconds)
+        self.window_rms.append(np.sqrt(np.mean(np.square(filtered, dtype=np.float64), axis=1)))
+        self.samples += window.shape[1]
+        return filtered, envelope
+
+    def history_times(self):
+        """
+        Tempo (s, desde o início do registro) de cada coluna do histórico filtrado.
+        """
+        first = self.filtered.total - self.filtered.filled
+        return np.arange(first, self.filtered.total) / self.fs
+
+
+def segy_segments(paths, chunk_samples=65536):
+    """
+    Segmentos (taxa de amostragem, bloco canais x amostras) de arquivos SEG-Y em
+    sequência no tempo: cada arquivo é um trecho de todos os canais.
+    """
+    for path in paths:
+        data, _, info = open_segy_memmap(path)
+        fs = sampling_parameters(info)['sample_rate']
+        for start in range(0, data.shape[1], chunk_samples):
+            yield fs, data[:, start:start + chunk_samples]
+
+
+def mseed_segments(paths):
+    """
+    Segmentos de arquivos miniSEED: cada arquivo vira um bloco com um canal por
+    código de estação/canal, cortado no trecho comum a todos.
+    """
+    import obspy
+
+    for path in paths:
+        stream = obspy.read(path)
+        stream.merge(fill_value=0)
+        stream.sort(['network', 'station', 'location', 'channel'])
+        n_samples = min(len(trace.data) for trace in stream)
+        block = np.empty((len(stream), n_samples), dtype=np.float32)
+        for row, trace in enumerate(stream):
+            block[row] = trace.data[:n_samples]
+        yield stream[0].stats.sampling_rate, block
+
+
+def iter_windows(segments, window_samples):
+    """
+    Remonta os segmentos em janelas (canais x window_samples). O mesmo buffer é
+    reutilizado a cada janela: quem precisar guardar uma janela deve copiá-la. A
+    última janela pode ser menor.
+    """
+    buffer = None
+    filled = 0
+    for _, segment in segments:
+        if buffer is None:
+            buffer = np.empty((segment.shape[0], window_samples), dtype=np.float32)
+        elif segment.shape[0] != buffer.shape[0]:
+            raise ValueError(f"Segmento com {segment.shape[0]} canais em um registro de {buffer.shape[0]}.")
+        offset = 0
+        while offset < segment.shape[1]:
+            n = min(window_samples - filled, segment.shape[1] - offset)
+            buffer[:, filled:filled + n] = segment[:, offset:offset + n]
+            filled += n
+            offset += n
+            if filled == window_samples:
+                yield buffer
+                filled = 0
+    if filled:
+        yield buffer[:, :filled]
+
+
+def list_passive_paths(directory):
+    """
+    Arquivos SEG-Y e miniSEED do diretório, em ordem alfabética (a ordem do tempo
+    nos nomes gerados pelos registradores).
+    """
+    return [
+        os.path.join(directory, f)
+        for f in sorted(os.listdir(directory)) if f.endswith(SEGY_EXTENSIONS + MSEED_EXTENSIONS)
+    ]
+
+
+def resolve_passive_paths(path):
+    """
+    Retorna os arquivos SEG-Y e miniSEED de um diretório ou de um padrão glob.
+    """
+    if os.path.isdir(path):
+        return list_passive_paths(path)
+    return sorted(f for f in glob.glob(path) if os.path.isfile(f))
+
+
+def open_window_stream(paths, window_seconds):
+    """
+    Abre os arquivos como uma sequência de janelas de `window_seconds`.
+    Retorna (taxa de amostragem, número de canais, gerador de janelas).
+    """
+    if not paths:
+        raise ValueError("Nenhum arquivo para processar.")
+    if all(p.endswith(MSEED_EXTENSIONS) for p in paths):
+        segments = mseed_segments(paths)
+    elif any(p.endswith(MSEED_EXTENSIONS) for p in paths):
+        raise ValueError("Não misture arquivos SEG-Y e miniSEED no mesmo registro.")
+    else:
+        segments = segy_segments(paths)
+
+    first = next(segments, None)
+    if first is None:
+        raise ValueError("Registro sem amostras.")
+    fs, block = first
+    window_samples = max(1, int(round(window_seconds * fs)))
+    return fs, block.shape[0], iter_windows(itertools.chain([first], segments), window_samples)
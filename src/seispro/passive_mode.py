@@ -0,0 +1,87 @@
+"""
+Modo passivo: processa os registros contínuos de um diretório (SEG-Y ou
+miniSEED) janela a janela e gera o gráfico de resumo, pela linha de comando
+(--passive) ou pela opção "Sismica Passiva" do modo interativo.
+"""
+
+import os
+import time
+
+from rich.console import Console
+from rich.tree import Tree
+
+from .instrument import StageProfiler, timed
+from .passive import PassiveProcessor, open_window_stream, resolve_passive_paths
+
+
+console = Console()
+
+STATUS_EVERY_WINDOWS = 50
+
+
+def stream_passive_record(paths, window_seconds=10.0, freqmin=1.0, freqmax=20.0, history_seconds=600.0,
+                          nfft=None, noverlap=None, profiler=None, status=None):
+    """
+    Passa todo o registro pelo PassiveProcessor. `status` (um rich Status) recebe
+    o tempo processado e a velocidade em relação ao tempo real.
+    Retorna (processador, segundos gastos).
+    """
+    start = time.perf_counter()
+    with timed(profiler, "processamento"):
+        fs, n_channels, windows = open_window_stream(paths, window_seconds)
+        processor = PassiveProcessor(n_channels, fs, freqmin, freqmax, nfft=nfft, noverlap=noverlap, history_seconds=history_seconds)
+        for count, window in enumerate(windows, 1):
+            processor.process(window)
+            if status is not None and count % STATUS_EVERY_WINDOWS == 0:
+                elapsed = time.perf_counter() - start
+                status.update(f"[bold blue]{processor.seconds / 3600:.2f} h processadas ({processor.seconds / elapsed:.0f}x tempo real)...[/bold blue]")
+    return processor, time.perf_counter() - start
+
+
+def summary_tree(paths, processor, seconds):
+    summary = Tree("[bold blue]Resumo do registro passivo[/bold blue]")
+    summary.add(f"[green]Arquivos: {len(paths)}[/green]")
+    summary.add(f"[green]Canais: {processor.n_channels} a {processor.fs:g} Hz[/green]")
+    summary.add(f"[green]Duração: {processor.seconds / 3600:.2f} h em {len(processor.window_rms)} janela(s)[/green]")
+    summary.add(f"[green]Tempo de processamento: {seconds:.2f} s ({processor.seconds / max(seconds, 1e-9):.0f}x tempo real)[/green]")
+    return summary
+
+
+def run_passive(args):
+    """
+    Processa o registro passivo de args.passive e grava o resumo em args.output_dir.
+    """
+    import matplotlib.pyplot as plt
+
+    from .plots import plot_passive_summary
+
+    plt.switch_backend("Agg")
+    paths = resolve_passive_paths(args.passive)
+    if not paths:
+        console.print(f"[bold red]Nenhum arquivo SEG-Y ou miniSEED encontrado em: {args.passive}[/bold red]")
+        return 1
+
+    directory = args.passive if os.path.isdir(args.passive) else os.path.dirname(paths[0])
+    label = os.path.basename(os.path.normpath(os.path.abspath(directory)))
+    profiler = StageProfiler(label, trace_memory=args.trace_memory)
+    console.print(f"[bold blue]Processando {len(paths)} arquivo(s) em janelas de {args.window:g} s...[/bold blue]")
+    try:
+        with console.status("[bold blue]Processando...[/bold blue]") as status:
+            processor, seconds = stream_passive_record(
+                paths, args.window, args.freqmin, args.freqmax, args.history,
+                nfft=args.nfft, noverlap=args.noverlap, profiler=profiler, status=status,
+            )
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Erro no registro passivo: {e}[/bold red]")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_file = os.path.join(args.output_dir, f"{label}_passiva.png")
+    plot_passive_summary(processor, cmap=args.cmap, output_file=output_file, title=f"Registro: {label}", show=False, profiler=profiler)
+
+    console.print(summary_tree(paths, processor, seconds))
+    console.print(f"[green]Gráfico gravado em: {output_file}[/green]")
+    console.print(profiler.table())
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
+    return 0
@@ -0,0 +1,73 @@
+"""
+Modo de picking: primeiras quebras de todos os arquivos SEG-Y de um diretório
+em um pool de processos, com os picks gravados em CSV ou .npz.
+"""
+
+import os
+import time
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+from .picking import pick_files, save_picks
+from .segy_scan import resolve_segy_paths
+
+
+console = Console()
+
+def picking_options(args):
+    """
+    Parâmetros de pick_first_breaks a partir dos argumentos da linha de comando.
+    """
+    return {'method': args.pick_method, 'sta': args.sta, 'lta': args.lta, 'window': args.energy_window, 'threshold': args.pick_threshold}
+
+def run_picking(args):
+    """
+    Faz o picking dos arquivos de args.pick_first_breaks e grava os picks.
+    """
+    segy_files = resolve_segy_paths(args.pick_first_breaks)
+    if not segy_files:
+        console.print(f"[bold red]Nenhum arquivo SEGY encontrado em: {args.pick_first_breaks}[/bold red]")
+        return 1
+
+    workers = max(1, min(args.workers, len(segy_files)))
+    console.print(f"[bold blue]Picking ({args.pick_method}) de {len(segy_files)} arquivo(s) com {workers} processo(s)...[/bold blue]")
+    start = time.perf_counter()
+    results = pick_files(segy_files, max_workers=workers, **picking_options(args))
+    elapsed = time.perf_counter() - start
+
+    output_file = args.picks_out or os.path.join(args.output_dir, 'primeiras_quebras.csv')
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    output_file = save_picks(output_file, results)
+
+    table = Table(title="Primeiras quebras")
+    table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Traços com pick", justify="center", style="magenta")
+    table.add_column("Primeiro pick (s)", justify="right", style="green")
+    table.add_column("Último pick (s)", justify="right", style="green")
+    failures, traces, picked = 0, 0, 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            table.add_row(result['file'], f"[red]erro: {result['error']}[/red]", "-", "-")
+            continue
+        picks = result['picks']
+        valid = picks[~np.isnan(picks)]
+        traces += len(picks)
+        picked += len(valid)
+        table.add_row(
+            result['file'], f"{len(valid)}/{len(picks)}",
+            f"{valid.min():.3f}" if len(valid) else "-", f"{valid.max():.3f}" if len(valid) else "-",
+        )
+    console.print(table)
+
+    summary = Tree("[bold blue]Resumo[/bold blue]")
+    summary.add(f"[green]Arquivos: {len(results) - failures}[/green]")
+    summary.add(f"[red]Falhas: {failures}[/red]")
+    summary.add(f"[green]Traços com pick: {picked} de {traces}[/green]")
+    summary.add(f"[green]Tempo total: {elapsed:.2f} s[/green]")
+    summary.add(f"[green]Picks gravados em: {output_file}[/green]")
+    console.print(summary)
+    return 1 if failures else 0
@@ -0,0 +1,201 @@
+"""
+Picking automático das primeiras quebras.
+
+Dois detectores sobre a matriz (n_traces, n_samples), em blocos de traços, com
+janelas calculadas por somas acumuladas da energia (uma diferença de cumsum
+por janela, sem laços sobre traços ou amostras):
+
+- STA/LTA clássico: média da energia em uma janela curta sobre a média em uma
+  janela longa, ambas terminando na amostra; a quebra é a primeira amostra em
+  que a razão passa do limiar;
+- razão de energia: energia da janela depois da amostra sobre a energia da
+  janela antes dela; a quebra é o máximo local da razão logo depois da
+  primeira amostra acima do limiar.
+
+Os arquivos de um diretório são divididos em grupos entre processos; em cada
+grupo os traços de todos os arquivos com a mesma amostragem são empilhados e
+processados de uma vez. Os picks podem ser gravados em CSV ou .npz.
+"""
+
+import csv
+import functools
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .reader import read_segy_file
+from .segy_scan import sampling_parameters
+from .velocity import trace_offsets
+
+# Limiar padrão de cada método
+PICK_THRESHOLDS = {'sta_lta': 4.0, 'energia': 10.0}
+
+
+def _energy_cumsum(data):
+    data = np.asarray(data, dtype=np.float64)
+    data = data - data.mean(axis=1, keepdims=True)
+    cumulative = np.zeros((data.shape[0], data.shape[1] + 1))
+    np.cumsum(data * data, axis=1, out=cumulative[:, 1:])
+    return cumulative
+
+
+def _trailing_mean(cumulative, n):
+    """
+    Média da energia nas `n` amostras que terminam em cada amostra; no início do
+    traço a janela cresce com as amostras disponíveis, para que primeiras quebras
+    próximas da fonte (antes de `n` amostras) também sejam detectadas.
+    """
+    n_samples = cumulative.shape[1] - 1
+    end = np.arange(1, n_samples + 1)
+    start = np.maximum(end - n, 0)
+    return (cumulative[:, end] - cumulative[:, start]) / (end - start)
+
+
+def sta_lta(data, nsta, nlta):
+    """
+    Razão STA/LTA clássica (n_traces, n_samples).
+    """
+    if not 0 < nsta < nlta:
+        raise ValueError("A janela curta (STA) deve ser menor que a longa (LTA).")
+    cumulative = _energy_cumsum(data)
+    sta = _trailing_mean(cumulative, nsta)
+    lta = _trailing_mean(cumulative, nlta)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(lta > 0, sta / lta, np.nan)
+
+
+def energy_ratio(data, n):
+    """
+    Razão entre a energia das `n` amostras a partir de cada amostra e a das `n`
+    anteriores (n_traces, n_samples); NaN onde alguma das janelas sai do traço.
+    """
+    cumulative = _energy_cumsum(data)
+    n_samples = cumulative.shape[1] - 1
+    ratio = np.full((cumulative.shape[0], n_samples), np.nan)
+    if 2 * n <= n_samples:
+        after = cumulative[:, 2 * n:] - cumulative[:, n:-n]
+        before = cumulative[:, n:-n] - cumulative[:, :-2 * n]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio[:, n:n_samples - n + 1] = np.where(before > 0, after / before, np.nan)
+    return ratio
+
+
+def _pick_block(data, fs, method, sta, lta, window, threshold):
+    """
+    Índice da primeira quebra e se houve disparo, para cada traço do bloco.
+    """
+    if method == 'sta_lta':
+        ratio = sta_lta(data, max(1, int(round(sta * fs))), max(2, int(round(lta * fs))))
+        triggered = np.nan_to_num(ratio) >= threshold
+        index = np.argmax(triggered, axis=1)
+        found = triggered[np.arange(len(index)), index]
+    else:
+        n = max(1, int(round(window * fs)))
+        ratio = np.nan_to_num(energy_ratio(data, n))
+        triggered = ratio >= threshold
+        first = np.argmax(triggered, axis=1)
+        found = triggered[np.arange(len(first)), first]
+        # máximo da razão nas n amostras a partir do disparo
+        columns = np.minimum(first[:, None] + np.arange(n), ratio.shape[1] - 1)
+        index = first + np.argmax(np.take_along_axis(ratio, columns, axis=1), axis=1)
+    return index, found
+
+
+def pick_first_breaks(data, fs, method='sta_lta', sta=0.02, lta=0.2, window=0.05, threshold=None, delay=0.0, chunk_traces=256):
+    """
+    Tempo (s) da primeira quebra de cada traço, NaN onde nada passou do limiar.
+    `method` é 'sta_lta' (janelas `sta` e `lta`, em s) ou 'energia' (janela `window`);
+    sem `threshold` vale o limiar padrão do método (PICK_THRESHOLDS).
+
+    Os traços são processados em blocos de `chunk_traces`, então `data` pode estar
+    mapeado do disco.
+    """
+    if method not in PICK_THRESHOLDS:
+        raise ValueError(f"Método de picking desconhecido: {method} (use {', '.join(PICK_THRESHOLDS)}).")
+    if threshold is None:
+        threshold = PICK_THRESHOLDS[method]
+    picks = np.empty(data.shape[0])
+    for start in range(0, data.shape[0], chunk_traces):
+        index, found = _pick_block(data[start:start + chunk_traces], fs, method, sta, lta, window, threshold)
+        picks[start:start + len(index)] = np.where(found, delay + index / fs, np.nan)
+    return picks
+
+
+def _pick_group(options, paths):
+    """
+    Lê um grupo de arquivos e faz o picking de todos os traços com a mesma
+    amostragem de uma vez. Arquivos com erro voltam com a chave 'error'.
+    """
+    results, stacks = {}, {}
+    for path in paths:
+        try:
+            data, headers, info = read_segy_file(path)
+            sampling = sampling_parameters(info)
+        except (OSError, ValueError, struct.error) as e:
+            results[path] = {'file': os.path.basename(path), 'error': str(e)}
+            continue
+        offsets = trace_offsets(headers, data.shape[0])
+        results[path] = {'file': os.path.basename(path), 'path': path, 'offsets': offsets, 'sample_rate': sampling['sample_rate']}
+        key = (data.shape[1], sampling['sample_rate'], sampling['delay'])
+        stacks.setdefault(key, []).append((path, np.asarray(data, dtype=np.float32)))
+
+    for (_, fs, delay), items in stacks.items():
+        picks = pick_first_breaks(np.concatenate([data for _, data in items]), fs, delay=delay, **options)
+        start = 0
+        for path, data in items:
+            results[path]['picks'] = picks[start:start + len(data)]
+            start += len(data)
+    return [results[path] for path in paths]
+
+
+def pick_files(paths, max_workers=None, **options):
+    """
+    Picking das primeiras quebras de todos os arquivos, em grupos divididos entre
+    processos. `options` vai para pick_first_breaks. Retorna, na ordem de `paths`,
+    dicionários com 'file', 'picks' (s, NaN sem pick) e 'offsets' (ou 'error').
+    """
+    paths = list(paths)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(paths)))
+    pick = functools.partial(_pick_group, options)
+    if max_workers == 1:
+        return pick(paths)
+    groups = [group for group in np.array_split(np.array(paths, dtype=object), max_workers * 4) if len(group)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return [result for results in executor.map(pick, [list(group) for group in groups]) for result in results]
+
+
+def save_picks(path, results):
+    """
+    Grava os picks em CSV (arquivo, traço, afastamento, tempo) ou, para .npz/.npy,
+    em um .npz com os nomes dos arquivos e uma matriz (arquivos, traços) preenchida
+    com NaN. Retorna o caminho gravado.
+    """
+    results = [r for r in results if 'picks' in r]
+    if path.endswith(('.npz', '.npy')):
+        num_traces = max((len(r['picks']) for r in results), default=0)
+        picks = np.full((len(results), num_traces), np.nan)
+        offsets = np.full((len(results), num_traces), np.nan)
+        for row, result in enumerate(results):
+            picks[row, :len(result['picks'])] = result['picks']
+            if result['offsets'] is not None:
+                offsets[row, :len(result['offsets'])] = result['offsets']
+        path = os.path.splitext(path)[0] + '.npz'
+        np.savez(path, files=np.array([r['file'] for r in results]), picks=picks, offsets=offsets)
+        return path
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['arquivo', 'traco', 'afastamento_m', 'tempo_s'])
+        for result in results:
+            offsets = result['offsets']
+            for trace, pick in enumerate(result['picks']):
+                writer.writerow([
+                    result['file'], trace + 1,
+                    '' if offsets is None else f"{offsets[trace]:g}",
+                    '' if np.isnan(pick) else f"{pick:.6f}",
+                ])
+    return path
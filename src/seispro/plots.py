@@ -0,0 +1,298 @@
+"""
+Gráficos do SEis-PRO: colagem com espectrograma, traço filtrado com envoltória,
+gather filtrado, espectros do gather, resumo do modo passivo e análise de
+velocidade.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from .chunked import display_factors, display_gather, peak_decimate, process_gather
+from .filtering import filter_and_envelope
+from .gain import condition_gather
+from .instrument import timed
+from .spectrogram import cached_spectrogram, plot_average_spectrum, plot_fx, plot_spectrogram
+from .velocity import nmo_correct, velocity_function, velocity_spectrum
+from .wiggle import plot_wiggle
+
+
+def plot_seismic_collage_with_spectrogram(data, traces_to_plot=[0, 1, 2], cmap='seismic', fs=24.0, nfft=800, noverlap=700, output_file='seismic_collage.png', segy_file_name='', show=True, profiler=None, source=None, delay=0.0, picks=None, gain=None, spectrogram_average=False, gain_out=None):
+    """
+    Colagem do gather: wiggle, intensidade, traços escolhidos e espectrograma. Se
+    `picks` (tempo da primeira quebra por traço, NaN sem pick) for dado, os picks
+    são marcados sobre o wiggle. Com `gain` (opções de seispro.gain.condition_gather,
+    como agc_window, balance, vmin, vmax e dx) o gather é condicionado antes, em
+    blocos de traços; `gain_out` (caminho .npy) recebe o gather condicionado, para
+    dados maiores que a memória.
+
+    O espectrograma é o de traces_to_plot[6]; com `spectrogram_average` é a média
+    da potência de todos os traços de traces_to_plot.
+    """
+    if gain:
+        with timed(profiler, "ganho"):
+            data = condition_gather(data, fs, out=gain_out, **gain)
+        # o espectrograma do gather condicionado não é o do arquivo bruto
+        if source is not None:
+            source = (source, tuple(sorted(gain.items())))
+    num_traces, num_samples = data.shape
+    t = delay + np.arange(num_samples) / fs
+
+    # Estatísticas e matriz de exibição em uma passada por blocos: o gather
+    # inteiro nunca precisa estar decodificado na memória
+    with timed(profiler, "estatísticas"):
+        summary = display_gather(data)
+    stats = summary['stats']
+
+    with timed(profiler, "renderização"):
+        fig, axs = plt.subplots(2, 2, figsize=(12, 10), constrained_layout=True)
+
+        plot_wiggle(axs[0, 0], data, t, max_amplitude=stats['max_abs'] or 1.0, lw=1.0)
+        axs[0, 0].set_title("Visualizador da Onda Sísmica", fontsize=12, fontweight='bold')
+        axs[0, 0].set_xlabel("Traços")
+        axs[0, 0].set_ylabel("Tempo [s]")
+        axs[0, 0].grid(True, linestyle='--', color='gray', alpha=0.5)
+        if picks is not None:
+            picked = ~np.isnan(picks)
+            axs[0, 0].scatter(np.flatnonzero(picked), picks[picked], marker='_', s=120, linewidths=2, color='red', zorder=3, label='Primeiras quebras')
+            axs[0, 0].legend(loc='lower right')
+
+        im = axs[0, 1].imshow(summary['display'].T, cmap=cmap, aspect='auto', interpolation='bilinear', vmin=stats['min'], vmax=stats['max'], extent=(-0.5, num_traces - 0.5, t[-1], t[0]))
+        fig.colorbar(im, ax=axs[0, 1], label='Amplitude')
+        axs[0, 1].set_title("Gráfico de Intensidade da Onda", fontsize=12, fontweight='bold')
+        axs[0, 1].set_xlabel("Traços")
+        axs[0, 1].set_ylabel("Tempo [s]")
+
+        for trace_idx in traces_to_plot:
+            if trace_idx < num_traces:
+                axs[1, 0].plot(t, data[trace_idx], color='black', label=f'Trace {trace_idx}', lw=0.5)
+        axs[1, 0].set_title("Gráfico das Ondas Sísmicas", fontsize=12, fontweight='bold')
+        axs[1, 0].set_xlabel("Tempo [s]")
+        axs[1, 0].set_ylabel("Amplitude")
+        axs[1, 0].grid(True, linestyle='-', color='black', alpha=0.5)
+
+    with timed(profiler, "espectrograma"):
+        # o painel mostra o sétimo traço escolhido; a média só se for pedida
+        if spectrogram_average:
+            spectrogram_traces = [i for i in traces_to_plot if i < num_traces]
+        else:
+            spectrogram_traces = [traces_to_plot[6]] if len(traces_to_plot) > 6 and traces_to_plot[6] < num_traces else []
+        if not spectrogram_traces:
+            axs[1, 1].set_title("Spectrogram: Trace index out of range", fontsize=12, fontweight='bold')
+        elif nfft > num_samples:
+            axs[1, 1].set_title(f"Espectrograma: NFFT maior que {num_samples} amostras", fontsize=12, fontweight='bold')
+        else:
+            freqs, times, power = cached_spectrogram(data, spectrogram_traces, nfft, noverlap, fs, source=source)
+            plot_spectrogram(axs[1, 1], freqs, times + delay, power, cmap=cmap)
+            title = f"Gráfico do Espectrograma (média de {len(spectrogram_traces)} traços)" if spectrogram_average else "Gráfico do Espectrograma"
+            axs[1, 1].set_title(title, fontsize=12, fontweight='bold')
+            axs[1, 1].set_xlabel("Tempo [s]")
+            axs[1, 1].set_ylabel("Frequência [hz]")
+
+    plt.figtext(0.5, 0.01, f"Arquivo utilizado: {segy_file_name}", ha="center", fontsize=10, color="blue")
+
+    with timed(profiler, "savefig"):
+        plt.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def plot_filtered_data_with_envelope(data, sample_rate, freqmin=1, freqmax=3, time_window=None, output_file=None, show=True, profiler=None, delay=0.0):
+    with timed(profiler, "filtro"):
+        data_filtered, data_envelope = filter_and_envelope(data, freqmin, freqmax, sample_rate, corners=2)
+
+    npts = len(data)
+    t = delay + np.arange(npts) / sample_rate
+
+    with timed(profiler, "renderização"):
+        fig = plt.figure()
+        plt.plot(t, data_filtered, 'k', label='Filtered Data')
+        plt.plot(t, data_envelope, 'k:', label='Envelope')
+        plt.title('Dados filtrados com Envoltória')
+        plt.ylabel('Amplitude')
+        plt.xlabel('Tempo [s]')
+        if time_window:
+            plt.xlim(time_window)
+        plt.legend()
+    if output_file:
+        with timed(profiler, "savefig"):
+            plt.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def plot_gather_filtered_with_envelope(data, sample_rate, freqmin=1, freqmax=3, time_window=None, cmap='inferno', output_file=None, segy_file_name='', show=True, profiler=None, workers=1, delay=0.0, filtered_out=None, envelope_out=None):
+    """
+    Filtra o gather inteiro e mostra lado a lado o wiggle filtrado e a envoltória de todos os traços.
+
+    Com `filtered_out` (caminho .npy) o gather é processado em blocos de traços por
+    seispro.chunked.process_gather, para dados maiores que a memória: o filtrado (e a
+    envoltória, se `envelope_out` for dado) é gravado em resolução total nesses .npy
+    mapeados, o wiggle lê deles só os traços exibidos e a envoltória é mostrada reduzida.
+    """
+    max_amplitude = None
+    with timed(profiler, "filtro"):
+        if filtered_out is not None:
+            summary = process_gather(data, sample_rate, freqmin, freqmax, corners=2, out=filtered_out, envelope=True, envelope_out=envelope_out)
+            data_filtered, envelope_image = summary['out'], summary['envelope_display']
+            max_amplitude = summary['stats']['max_abs'] or 1.0
+        else:
+            data_filtered, envelope_image = filter_and_envelope(data, freqmin, freqmax, sample_rate, corners=2, chunk_traces=256, workers=workers)
+
+    num_traces, num_samples = data_filtered.shape
+    t = delay + np.arange(num_samples) / sample_rate
+
+    with timed(profiler, "renderização"):
+        fig, axs = plt.subplots(1, 2, figsize=(14, 7), constrained_layout=True)
+
+        plot_wiggle(axs[0], data_filtered, t, max_amplitude=max_amplitude)
+        axs[0].set_title(f"Gather filtrado ({freqmin}-{freqmax} Hz)", fontsize=12, fontweight='bold')
+        axs[0].set_xlabel("Traços")
+        axs[0].set_ylabel("Tempo [s]")
+
+        im = axs[1].imshow(envelope_image.T, cmap=cmap, aspect='auto', extent=(-0.5, num_traces - 0.5, t[-1], t[0]))
+        fig.colorbar(im, ax=axs[1], label='Envoltória')
+        axs[1].set_title("Envoltória dos traços", fontsize=12, fontweight='bold')
+        axs[1].set_xlabel("Traços")
+        axs[1].set_ylabel("Tempo [s]")
+
+        if time_window:
+            axs[0].set_ylim(time_window[1], time_window[0])
+            axs[1].set_ylim(time_window[1], time_window[0])
+        fig.text(0.5, 0.005, f"Arquivo utilizado: {segy_file_name}", ha="center", fontsize=10, color="blue")
+
+    if output_file:
+        with timed(profiler, "savefig"):
+            fig.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def plot_gather_spectra(data, fs, cmap='inferno', output_file=None, segy_file_name='', show=True, profiler=None):
+    """
+    Espectro de amplitude médio do gather e amplitude f-x de todos os traços.
+    """
+    with timed(profiler, "renderização"):
+        fig, axs = plt.subplots(1, 2, figsize=(14, 6), constrained_layout=True)
+
+        plot_average_spectrum(axs[0], data, fs)
+        axs[0].set_title("Espectro Médio do Gather", fontsize=12, fontweight='bold')
+        axs[0].set_xlabel("Frequência [hz]")
+        axs[0].set_ylabel("Amplitude")
+        axs[0].grid(True, linestyle='--', color='gray', alpha=0.5)
+
+        im = plot_fx(axs[1], data, fs, cmap=cmap)
+        fig.colorbar(im, ax=axs[1], label='Amplitude [dB]')
+        axs[1].set_title("Amplitude f-x", fontsize=12, fontweight='bold')
+        axs[1].set_xlabel("Traços")
+        axs[1].set_ylabel("Frequência [hz]")
+        fig.text(0.5, 0.005, f"Arquivo utilizado: {segy_file_name}", ha="center", fontsize=10, color="blue")
+
+    if output_file:
+        with timed(profiler, "savefig"):
+            fig.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def plot_passive_summary(processor, cmap='inferno', output_file=None, title='', show=True, profiler=None, max_columns=2000):
+    """
+    Resumo do registro passivo processado em janelas: envoltória e traço filtrado
+    do histórico recente, RMS de cada janela ao longo de todo o registro e o
+    espectrograma incremental.
+    """
+    with timed(profiler, "renderização"):
+        t = processor.history_times()
+        _, sample_factor = display_factors((1, len(t)), 1, max_columns)
+        envelope = peak_decimate(processor.envelope.view(), 1, sample_factor)
+        filtered = processor.filtered.view()[0]
+
+        fig, axs = plt.subplots(2, 2, figsize=(14, 10), constrained_layout=True)
+
+        im = axs[0, 0].imshow(envelope, cmap=cmap, aspect='auto', interpolation='nearest',
+                              extent=(t[0], t[-1], processor.n_channels - 0.5, -0.5))
+        fig.colorbar(im, ax=axs[0, 0], label='Envoltória')
+        axs[0, 0].set_title("Envoltória dos canais (histórico recente)", fontsize=12, fontweight='bold')
+        axs[0, 0].set_xlabel("Tempo [s]")
+        axs[0, 0].set_ylabel("Canal")
+
+        axs[0, 1].plot(t[::sample_factor], peak_decimate(filtered[None], 1, sample_factor)[0], 'k', lw=0.5)
+        axs[0, 1].set_title("Canal 0 filtrado (histórico recente)", fontsize=12, fontweight='bold')
+        axs[0, 1].set_xlabel("Tempo [s]")
+        axs[0, 1].set_ylabel("Amplitude")
+
+        rms = np.array(processor.window_rms)
+        window_times = np.array(processor.window_starts)
+        axs[1, 0].fill_between(window_times / 3600, rms.min(axis=1), rms.max(axis=1), color='gray', alpha=0.4, label='Faixa dos canais')
+        axs[1, 0].plot(window_times / 3600, np.median(rms, axis=1), 'k', lw=1.0, label='Mediana')
+        axs[1, 0].set_title("RMS por janela (registro inteiro)", fontsize=12, fontweight='bold')
+        axs[1, 0].set_xlabel("Tempo [h]")
+        axs[1, 0].set_ylabel("RMS")
+        axs[1, 0].legend()
+
+        spectrogram = processor.spectrogram
+        if spectrogram.frames.filled:
+            plot_spectrogram(axs[1, 1], spectrogram.freqs, spectrogram.times(), spectrogram.frames.view()[None], cmap=cmap)
+        axs[1, 1].set_title("Espectrograma médio (incremental)", fontsize=12, fontweight='bold')
+        axs[1, 1].set_xlabel("Tempo [s]")
+        axs[1, 1].set_ylabel("Frequência [hz]")
+
+        fig.text(0.5, 0.005, title, ha="center", fontsize=10, color="blue")
+
+    if output_file:
+        with timed(profiler, "savefig"):
+            fig.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+def plot_velocity_analysis(data, offsets, fs, vmin=200.0, vmax=4000.0, num_velocities=100, window=0.02, cmap='jet', output_file=None, segy_file_name='', show=True, profiler=None, delay=0.0, offsets_source=''):
+    """
+    Análise de velocidade do gather: wiggle original, espectro de velocidade
+    (semblance) com a função v(t0) escolhida e o gather corrigido de NMO com ela.
+    """
+    dt = 1.0 / fs
+    with timed(profiler, "semblance"):
+        spectrum = velocity_spectrum(data, offsets, dt, vmin, vmax, num_velocities, delay, window)
+    with timed(profiler, "nmo"):
+        velocity = velocity_function(spectrum)
+        corrected = nmo_correct(data, offsets, velocity, dt, delay)
+
+    t = spectrum['times']
+    with timed(profiler, "renderização"):
+        fig, axs = plt.subplots(1, 3, figsize=(16, 8), constrained_layout=True, sharey=True)
+
+        plot_wiggle(axs[0], np.asarray(data, dtype=np.float32), t)
+        axs[0].set_title("Gather", fontsize=12, fontweight='bold')
+        axs[0].set_xlabel("Traços")
+        axs[0].set_ylabel("Tempo [s]")
+
+        velocities = spectrum['velocities']
+        im = axs[1].imshow(spectrum['semblance'].T, cmap=cmap, aspect='auto', interpolation='bilinear', vmin=0, vmax=1,
+                           extent=(velocities[0], velocities[-1], t[-1], t[0]))
+        axs[1].plot(velocity, t, 'w', lw=1.5, label='v(t0) para NMO')
+        fig.colorbar(im, ax=axs[1], label='Semblance')
+        axs[1].set_title("Espectro de Velocidade", fontsize=12, fontweight='bold')
+        axs[1].set_xlabel("Velocidade [m/s]")
+        axs[1].legend(loc='lower left')
+
+        plot_wiggle(axs[2], corrected, t)
+        axs[2].set_title("Gather corrigido de NMO", fontsize=12, fontweight='bold')
+        axs[2].set_xlabel("Traços")
+        axs[2].set_ylim(t[-1], t[0])
+
+        geometry = f" — afastamentos: {offsets_source}" if offsets_source else ""
+        fig.text(0.5, 0.005, f"Arquivo utilizado: {segy_file_name}{geometry}", ha="center", fontsize=10, color="blue")
+
+    if output_file:
+        with timed(profiler, "savefig"):
+            fig.savefig(output_file)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return spectrum
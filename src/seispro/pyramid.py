@@ -0,0 +1,281 @@
+"""
+Pirâmide de decimação para visualizar seções grandes.
+
+O nível 0 é a própria matriz (n_traces, n_samples). Cada nível seguinte reduz o
+anterior por 2 no eixo mais longo (nos dois, se forem parecidos) e guarda, para
+cada célula, o mínimo, o máximo e o RMS das amostras originais que ela cobre,
+em um array float32 (3, linhas, colunas). Os níveis são calculados bloco a
+bloco de traços sobre o nível anterior, sem carregar a matriz inteira, e podem
+ser gravados como .npy ao lado da matriz decodificada no cache (abertos
+mapeados nas próximas vezes).
+
+A leitura é por ladrilhos de `tile` x `tile` células: para a janela visível é
+escolhido o nível em que cada pixel cobre cerca de uma célula e só os
+ladrilhos que cruzam a janela são lidos, com os mais recentes em um LRU. A
+imagem devolvida tem no máximo o tamanho da tela, qualquer que seja o tamanho
+da seção.
+"""
+
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .chunked import iter_blocks
+
+TILE = 256
+PYRAMID_CHUNK_TRACES = 256
+MAX_CACHED_TILES = 256
+
+PYRAMID_INFO_FILE_NAME = 'pyramid.json'
+# Formato dos níveis gravados: pirâmides de outra versão são recalculadas
+PYRAMID_VERSION = 2
+DISPLAY_MODES = ('pico', 'rms')
+
+# Planos de cada nível
+MIN, MAX, RMS = range(3)
+
+
+def level_factors(shape, tile=TILE):
+    """
+    Fatores de redução acumulados (traços, amostras) de cada nível, do nível 0 até o
+    primeiro que cabe em um ladrilho. Cada nível reduz por 2 o eixo mais longo, e os
+    dois quando eles têm tamanhos parecidos, para que seções muito mais largas que
+    longas (ou o contrário) tenham níveis com células equilibradas.
+    """
+    n_traces, n_samples = shape
+    factors = [(1, 1)]
+    while True:
+        trace_factor, sample_factor = factors[-1]
+        rows, cols = -(-n_traces // trace_factor), -(-n_samples // sample_factor)
+        if rows <= tile and cols <= tile:
+            return factors
+        halve_rows = rows > tile and 2 * rows > cols
+        halve_cols = cols > tile and 2 * cols > rows
+        factors.append((trace_factor * (2 if halve_rows else 1), sample_factor * (2 if halve_cols else 1)))
+
+
+def _as_cells(block):
+    block = np.asarray(block, dtype=np.float32)
+    return np.stack((block, block, np.abs(block)))
+
+
+def _cell_counts(n, factor, start, stop):
+    """
+    Número de amostras originais cobertas por cada célula [start, stop) de um eixo
+    de `n` amostras reduzido por `factor` (a última célula pode cobrir menos).
+    """
+    return np.minimum(factor, n - np.arange(start, stop) * factor)
+
+
+def _reduce_cells(cells, trace_step, sample_step, row_counts, col_counts):
+    """
+    Junta grupos trace_step x sample_step de células (3, linhas, colunas): mínimo
+    dos mínimos, máximo dos máximos e RMS da energia somada sobre o número de
+    amostras originais (`row_counts` e `col_counts` por linha e coluna de `cells`),
+    para que as células parciais das bordas tenham o RMS exato.
+    """
+    _, rows, cols = cells.shape
+    out_rows, out_cols = -(-rows // trace_step), -(-cols // sample_step)
+    pad = (out_rows * trace_step - rows, out_cols * sample_step - cols)
+    counts = np.outer(row_counts, col_counts).astype(np.float64)
+    energy = np.square(cells[RMS], dtype=np.float64) * counts
+    if any(pad):
+        cells = np.pad(cells, ((0, 0), (0, pad[0]), (0, pad[1])), mode='edge')
+        energy = np.pad(energy, ((0, pad[0]), (0, pad[1])))
+        counts = np.pad(counts, ((0, pad[0]), (0, pad[1])))
+    groups = cells.reshape(3, out_rows, trace_step, out_cols, sample_step)
+    reduced = np.empty((3, out_rows, out_cols), dtype=np.float32)
+    groups[MIN].min(axis=(1, 3), out=reduced[MIN])
+    groups[MAX].max(axis=(1, 3), out=reduced[MAX])
+    energy = energy.reshape(out_rows, trace_step, out_cols, sample_step).sum(axis=(1, 3))
+    counts = counts.reshape(out_rows, trace_step, out_cols, sample_step).sum(axis=(1, 3))
+    reduced[RMS] = np.sqrt(energy / counts)
+    return reduced
+
+
+def _level_blocks(level, chunk_rows):
+    """
+    Percorre um nível em blocos de linhas: (fatia de linhas, células (3, linhas, colunas)).
+    """
+    if level.ndim == 2:
+        for rows, _, block in iter_blocks(level, chunk_rows):
+            yield rows, _as_cells(block)
+        return
+    for start in range(0, level.shape[1], chunk_rows):
+        rows = slice(start, min(start + chunk_rows, level.shape[1]))
+        yield rows, np.asarray(level[:, rows])
+
+
+def _level_path(directory, level):
+    return os.path.join(directory, f'pyramid_{level}.npy')
+
+
+def _summary(cells):
+    return {
+        'min': float(cells[MIN].min()),
+        'max': float(cells[MAX].max()),
+        'max_abs': float(max(abs(cells[MIN].min()), abs(cells[MAX].max()))),
+        'max_rms': float(cells[RMS].max()),
+    }
+
+
+def build_pyramid(data, directory=None, tile=TILE, chunk_traces=PYRAMID_CHUNK_TRACES):
+    """
+    Calcula os níveis da pirâmide de `data` (array, np.memmap ou IBMTraceArray).
+    Com `directory` os níveis são gravados nele como .npy, e o pyramid.json, gravado
+    por último, marca a pirâmide como completa; sem ele ficam na memória.
+    """
+    factors = level_factors(data.shape, tile)
+    # blocos com grupos inteiros em todos os níveis
+    chunk_traces = max(factors[-1][0], chunk_traces // factors[-1][0] * factors[-1][0])
+    levels = [data]
+    for level in range(1, len(factors)):
+        trace_step = factors[level][0] // factors[level - 1][0]
+        sample_step = factors[level][1] // factors[level - 1][1]
+        source = levels[-1]
+        shape = (3, -(-source.shape[-2] // trace_step), -(-source.shape[-1] // sample_step))
+        if directory:
+            out = np.lib.format.open_memmap(_level_path(directory, level), mode='w+', dtype=np.float32, shape=shape)
+        else:
+            out = np.empty(shape, dtype=np.float32)
+        source_trace_factor, source_sample_factor = factors[level - 1]
+        col_counts = _cell_counts(data.shape[1], source_sample_factor, 0, source.shape[-1])
+        for rows, cells in _level_blocks(source, chunk_traces // source_trace_factor):
+            row_counts = _cell_counts(data.shape[0], source_trace_factor, rows.start, rows.stop)
+            out[:, rows.start // trace_step:-(-rows.stop // trace_step)] = _reduce_cells(cells, trace_step, sample_step, row_counts, col_counts)
+        if isinstance(out, np.memmap):
+            out.flush()
+        levels.append(out)
+
+    top = levels[-1] if len(levels) > 1 else _as_cells(data)
+    info = dict(_summary(top), shape=list(data.shape), tile=tile, factors=factors, version=PYRAMID_VERSION)
+    if directory:
+        with open(os.path.join(directory, PYRAMID_INFO_FILE_NAME), 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+    return Pyramid(levels, info)
+
+
+def load_pyramid(data, directory, tile=TILE):
+    """
+    Abre (mapeados) os níveis gravados em `directory`, ou None se não houver uma
+    pirâmide completa da matriz com este formato, este ladrilho e esta versão.
+    """
+    try:
+        with open(os.path.join(directory, PYRAMID_INFO_FILE_NAME), 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        if info.get('version') != PYRAMID_VERSION or tuple(info['shape']) != tuple(data.shape) or info['tile'] != tile:
+            return None
+        levels = [data] + [np.load(_level_path(directory, level), mmap_mode='r') for level in range(1, len(info['factors']))]
+    except (OSError, ValueError, KeyError):
+        return None
+    info['factors'] = [tuple(factor) for factor in info['factors']]
+    return Pyramid(levels, info)
+
+
+def open_pyramid(data, directory=None, tile=TILE):
+    """
+    Pirâmide de `data`: a gravada em `directory`, se houver, ou uma nova (gravada
+    em `directory`, se for dado).
+    """
+    if directory:
+        pyramid = load_pyramid(data, directory, tile)
+        if pyramid is not None:
+            return pyramid
+    return build_pyramid(data, directory, tile)
+
+
+def display_values(cells, mode='pico'):
+    """
+    Valor exibido de cada célula: 'pico' é o extremo de maior |amplitude| (com o
+    sinal), 'rms' é o RMS.
+    """
+    if mode == 'rms':
+        return cells[RMS]
+    if mode == 'pico':
+        return np.where(np.abs(cells[MIN]) > np.abs(cells[MAX]), cells[MIN], cells[MAX])
+    raise ValueError(f"Modo de exibição desconhecido: {mode} (use {', '.join(DISPLAY_MODES)}).")
+
+
+class Pyramid:
+    """
+    Níveis da pirâmide com leitura por ladrilhos e LRU dos ladrilhos lidos.
+    """
+
+    def __init__(self, levels, info, max_tiles=MAX_CACHED_TILES):
+        self.levels = levels
+        self.info = info
+        self.factors = [tuple(factor) for factor in info['factors']]
+        self.shape = tuple(levels[0].shape)
+        self.tile = info['tile']
+        self.max_tiles = max_tiles
+        self.tiles_read = 0
+        self._tiles = OrderedDict()
+
+    def choose_level(self, trace_span, sample_span, width_px, height_px):
+        """
+        Nível mais reduzido cujas células ainda não são maiores que um pixel na janela.
+        """
+        best = 0
+        for level, (trace_factor, sample_factor) in enumerate(self.factors):
+            if trace_factor <= max(1.0, trace_span / width_px) and sample_factor <= max(1.0, sample_span / height_px):
+                best = level
+        return best
+
+    def tile_cells(self, level, row, col):
+        """
+        Células (3, linhas, colunas) do ladrilho (row, col) do nível.
+        """
+        key = (level, row, col)
+        cells = self._tiles.get(key)
+        if cells is not None:
+            self._tiles.move_to_end(key)
+            return cells
+        rows = slice(row * self.tile, (row + 1) * self.tile)
+        cols = slice(col * self.tile, (col + 1) * self.tile)
+        if level == 0:
+            cells = _as_cells(self.levels[0][rows, cols])
+        else:
+            cells = np.array(self.levels[level][:, rows, cols])
+        self.tiles_read += 1
+        self._tiles[key] = cells
+        if len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+        return cells
+
+    def window(self, traces, samples, width_px, height_px, mode='pico'):
+        """
+        Imagem (traços, amostras) da janela de traços [traces[0], traces[1]) e de amostras
+        [samples[0], samples[1]) para uma tela de width_px x height_px pixels, com no
+        máximo width_px x height_px células. Retorna (imagem, nível, faixa de traços,
+        faixa de amostras), com as faixas em índices da matriz original nas bordas das
+        células (a última pode passar do fim).
+
+        Acima dos níveis que reduzem um só eixo as células do nível escolhido podem
+        ser menores que um pixel em um dos eixos; elas são então juntadas de novo, na
+        leitura, até o tamanho da tela.
+        """
+        level = self.choose_level(traces[1] - traces[0], samples[1] - samples[0], width_px, height_px)
+        trace_factor, sample_factor = self.factors[level]
+        n_rows, n_cols = self.levels[level].shape[-2:]
+        r0, r1 = traces[0] // trace_factor, min(-(-traces[1] // trace_factor), n_rows)
+        c0, c1 = samples[0] // sample_factor, min(-(-samples[1] // sample_factor), n_cols)
+
+        cells = np.empty((3, r1 - r0, c1 - c0), dtype=np.float32)
+        tile = self.tile
+        for row in range(r0 // tile, -(-r1 // tile)):
+            for col in range(c0 // tile, -(-c1 // tile)):
+                source = self.tile_cells(level, row, col)
+                a0, a1 = max(r0, row * tile), min(r1, row * tile + source.shape[1])
+                b0, b1 = max(c0, col * tile), min(c1, col * tile + source.shape[2])
+                cells[:, a0 - r0:a1 - r0, b0 - c0:b1 - c0] = source[:, a0 - row * tile:a1 - row * tile, b0 - col * tile:b1 - col * tile]
+        trace_step = max(1, -(-(r1 - r0) // max(1, int(width_px))))
+        sample_step = max(1, -(-(c1 - c0) // max(1, int(height_px))))
+        if trace_step > 1 or sample_step > 1:
+            row_counts = _cell_counts(self.shape[0], trace_factor, r0, r1)
+            col_counts = _cell_counts(self.shape[1], sample_factor, c0, c1)
+            cells = _reduce_cells(cells, trace_step, sample_step, row_counts, col_counts)
+        r1 = r0 + cells.shape[1] * trace_step
+        c1 = c0 + cells.shape[2] * sample_step
+        return display_values(cells, mode), level, (r0 * trace_factor, r1 * trace_factor), (c0 * sample_factor, c1 * sample_factor)
@@ -0,0 +1,75 @@
+"""
+Leitura dos arquivos SEGY para o processamento: mapeamento em memória, com o
+obspy como alternativa para os formatos que o leitor mapeado não suporta.
+"""
+
+import os
+
+import numpy as np
+
+from .instrument import timed
+from .segy_mmap import IBMTraceArray, open_segy_memmap
+
+
+def read_segy_file(file_path):
+    """
+    Abre o arquivo SEGY mapeado em memória e retorna (dados, cabeçalhos dos traços, resumo
+    dos cabeçalhos). Formatos que o leitor mapeado não suporta são lidos pelo obspy, e
+    nesse caso o segundo valor é o objeto SEGYFile.
+    """
+    try:
+        return open_segy_memmap(file_path)
+    except ValueError:
+        pass
+
+    from obspy.io.segy.segy import _read_segy
+
+    segy_file = _read_segy(file_path)
+    traces = segy_file.traces
+    data = np.array([trace.data for trace in traces])
+    info = {
+        'file': os.path.basename(file_path),
+        'num_traces': len(traces),
+        'num_samples': data.shape[1] if len(traces) else 0,
+        'sample_interval': segy_file.binary_file_header.sample_interval_in_microseconds
+            or (traces[0].header.sample_interval_in_ms_for_this_trace if len(traces) else 0),
+        'first_trace': {'delay': traces[0].header.delay_recording_time if len(traces) else 0},
+    }
+    return data, segy_file, info
+
+def fits_in_memory(shape, max_memory_mb):
+    """
+    Se a matriz float32 de formato `shape` cabe em `max_memory_mb` (None: sem limite).
+    Acima do limite os dados ficam mapeados e os modos os percorrem em blocos.
+    """
+    return max_memory_mb is None or int(np.prod(shape)) * 4 / (1024 * 1024) <= max_memory_mb
+
+
+def read_and_decode(segy_file_path, profiler=None, cache=None, max_memory_mb=None):
+    """
+    Lê o arquivo SEGY e decodifica as amostras para float32, medindo cada etapa.
+    Com um DecodedCache, a matriz já decodificada é aberta do cache (mapeada em
+    memória) quando o arquivo não mudou, e guardada nele caso contrário.
+
+    Se a matriz decodificada passar de `max_memory_mb`, os dados ficam mapeados do
+    arquivo (np.memmap ou IBMTraceArray) e são decodificados bloco a bloco por quem
+    os usa (ver seispro.chunked).
+    Retorna (dados, resumo dos cabeçalhos).
+    """
+    if cache is not None:
+        with timed(profiler, "cache"):
+            cached = cache.load(segy_file_path)
+        if cached is not None:
+            data, _, info = cached
+            return data, info
+
+    with timed(profiler, "leitura"):
+        data, headers, info = read_segy_file(segy_file_path)
+    out_of_core = not fits_in_memory((info['num_traces'], info['num_samples']), max_memory_mb) and isinstance(data, (np.memmap, IBMTraceArray))
+    if not out_of_core:
+        with timed(profiler, "decodificação"):
+            data = np.ascontiguousarray(data, dtype=np.float32)
+    if cache is not None:
+        with timed(profiler, "gravação do cache"):
+            cache.store(segy_file_path, data, headers, info)
+    return data, info
@@ -0,0 +1,354 @@
+"""
+Leitura de arquivos SEG-2 (os .dat da Geometrics) e conversão para SEG-Y rev1.
+
+O bloco descritor do arquivo (id 0x3a55) traz os ponteiros dos traços e as
+strings de aquisição (ACQUISITION_DATE, ACQUISITION_TIME, INSTRUMENT...); cada
+traço começa com um bloco descritor próprio (id 0x4422) com o número de
+amostras, o formato e as strings do traço (SAMPLE_INTERVAL, DELAY,
+CHANNEL_NUMBER, RECEIVER_LOCATION...). A conversão lê um traço por vez e o
+grava pelo SegyWriter, que junta os traços em blocos antes de escrever.
+"""
+
+import datetime
+import functools
+import glob
+import math
+import os
+import re
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .segy_index import XREF_FILE_NAME
+from .segy_write import SegyWriter
+
+SEG2_EXTENSIONS = ('.dat', '.DAT', '.sg2', '.SG2', '.seg2', '.SEG2')
+
+FILE_DESCRIPTOR_ID = 0x3a55
+TRACE_DESCRIPTOR_ID = 0x4422
+DESCRIPTOR_SIZE = 32
+
+# Código de formato SEG-2 -> tipo NumPy das amostras (3 é o inteiro de 20 bits empacotado)
+SEG2_DTYPES = {
+    1: 'i2',
+    2: 'i4',
+    4: 'f4',
+    5: 'f8',
+}
+
+MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+
+# Escalar de coordenadas e elevações gravado no SEG-Y (valores em centímetros)
+COORDINATE_SCALAR = -100
+
+
+def _parse_strings(block, byte_order, terminator):
+    """
+    Lê as strings de um bloco descritor: cada uma começa com o deslocamento (2 bytes)
+    até a próxima e tem a forma 'CHAVE valor'. Um deslocamento 0 encerra a lista.
+    """
+    strings = {}
+    offset = 0
+    while offset + 2 <= len(block):
+        (size,) = struct.unpack_from(byte_order + 'H', block, offset)
+        if size == 0:
+            break
+        text = block[offset + 2:offset + size].split(terminator, 1)[0]
+        key, _, value = text.decode('latin-1').replace('\x00', '').strip().partition(' ')
+        if key:
+            strings[key] = value.strip()
+        offset += size
+    return strings
+
+
+def read_seg2_header(file_path):
+    """
+    Lê o bloco descritor do arquivo SEG-2 e retorna a ordem dos bytes, os ponteiros
+    dos traços e as strings de aquisição.
+    """
+    with open(file_path, 'rb') as f:
+        block = f.read(DESCRIPTOR_SIZE)
+        if block[:2] == b'\x55\x3a':
+            byte_order = '<'
+        elif block[:2] == b'\x3a\x55':
+            byte_order = '>'
+        else:
+            raise ValueError(f"Arquivo SEG-2 inválido (bloco descritor): {file_path}")
+
+        revision, pointer_block_size, num_traces = struct.unpack_from(byte_order + 'HHH', block, 2)
+        if num_traces * 4 > pointer_block_size:
+            raise ValueError(f"SEG-2 com {num_traces} traços e só {pointer_block_size // 4} ponteiros: {file_path}")
+        terminator = block[9:9 + block[8]] or b'\x00'
+
+        pointers = struct.unpack_from(f"{byte_order}{num_traces}I", f.read(pointer_block_size))
+        strings_end = min(pointers) if pointers else os.path.getsize(file_path)
+        strings = _parse_strings(f.read(max(strings_end - f.tell(), 0)), byte_order, terminator)
+
+    return {
+        'file': os.path.basename(file_path),
+        'byte_order': byte_order,
+        'revision': revision,
+        'num_traces': num_traces,
+        'trace_pointers': pointers,
+        'terminator': terminator,
+        'strings': strings,
+    }
+
+
+def _unpack_20bit(raw, byte_order, num_samples):
+    """
+    Formato 3: a cada 10 bytes, uma palavra com 4 expoentes de 4 bits seguida de 4
+    mantissas de 16 bits em complemento de um.
+    """
+    words = np.frombuffer(raw, dtype=byte_order + 'i2', count=num_samples * 5 // 4).reshape(-1, 5)
+    exponents = words[:, :1].astype(np.int32) & 0xffff
+    shifts = (exponents >> np.array([0, 4, 8, 12])) & 0xf
+    mantissas = words[:, 1:].astype(np.int32)
+    mantissas += mantissas < 0
+    return (mantissas << shifts).ravel()
+
+
+def decode_seg2_samples(raw, format_code, num_samples, byte_order='<'):
+    """
+    Converte o bloco de dados de um traço SEG-2 para um array NumPy.
+    """
+    if format_code == 3:
+        if num_samples % 4:
+            raise ValueError(f"Formato SEG-2 3 exige número de amostras múltiplo de 4 ({num_samples}).")
+        return _unpack_20bit(raw, byte_order, num_samples)
+    if format_code not in SEG2_DTYPES:
+        raise ValueError(f"Formato de amostra SEG-2 desconhecido: {format_code}")
+    return np.frombuffer(raw, dtype=byte_order + SEG2_DTYPES[format_code], count=num_samples)
+
+
+def _sample_bytes(format_code, num_samples):
+    if format_code == 3:
+        return num_samples * 5 // 2
+    if format_code not in SEG2_DTYPES:
+        raise ValueError(f"Formato de amostra SEG-2 desconhecido: {format_code}")
+    return num_samples * np.dtype(SEG2_DTYPES[format_code]).itemsize
+
+
+def iter_seg2_traces(file_path, header=None, buffering=1 << 20):
+    """
+    Percorre os traços de um arquivo SEG-2 na ordem dos ponteiros: (strings do traço, amostras).
+    """
+    if header is None:
+        header = read_seg2_header(file_path)
+    byte_order = header['byte_order']
+
+    with open(file_path, 'rb', buffering=buffering) as f:
+        for pointer in header['trace_pointers']:
+            f.seek(pointer)
+            block = f.read(DESCRIPTOR_SIZE)
+            if len(block) < DESCRIPTOR_SIZE or struct.unpack_from(byte_order + 'H', block)[0] != TRACE_DESCRIPTOR_ID:
+                raise ValueError(f"Bloco descritor de traço inválido na posição {pointer} de {file_path}")
+            block_size, _, num_samples = struct.unpack_from(byte_order + 'HII', block, 2)
+            format_code = block[12]
+
+            strings = _parse_strings(f.read(block_size - DESCRIPTOR_SIZE), byte_order, header['terminator'])
+            size = _sample_bytes(format_code, num_samples)
+            raw = f.read(size)
+            if len(raw) < size:
+                raise ValueError(f"Traço truncado na posição {pointer} de {file_path}")
+            yield strings, decode_seg2_samples(raw, format_code, num_samples, byte_order)
+
+
+def acquisition_datetime(strings):
+    """
+    Data e hora de aquisição das strings ACQUISITION_DATE (ex.: 03/NOV/2023) e
+    ACQUISITION_TIME (ex.: 11:12:47), ou None se ausentes ou ilegíveis.
+    """
+    date = [p for p in re.split(r'[, ./-]+', strings.get('ACQUISITION_DATE', '')) if p]
+    time = [int(p) for p in re.split(r'\D+', strings.get('ACQUISITION_TIME', '')) if p][:3]
+    if len(date) < 3 or date[1][:3].upper() not in MONTHS:
+        return None
+    try:
+        return datetime.datetime(int(date[2]), MONTHS[date[1][:3].upper()], int(date[0]), *time)
+    except ValueError:
+        return None
+
+
+def _float(strings, key, default=0.0):
+    try:
+        return float(strings[key].split()[0])
+    except (KeyError, IndexError, ValueError):
+        return default
+
+
+def _location(strings, key):
+    """
+    Coordenadas (x, y, z) de RECEIVER_LOCATION / SOURCE_LOCATION; faltantes valem 0.
+    """
+    values = []
+    for part in strings.get(key, '').split()[:3]:
+        try:
+            values.append(float(part))
+        except ValueError:
+            break
+    return values + [0.0] * (3 - len(values))
+
+
+def _field_record(file_path, strings):
+    value = strings.get('SHOT_SEQUENCE_NUMBER', '') or os.path.splitext(os.path.basename(file_path))[0]
+    return int(value) if value.isdigit() else 0
+
+
+def seg2_trace_header(strings, index, field_record=0, acquired=None):
+    """
+    Cabeçalho de traço SEG-Y (campos de TRACE_HEADER_FIELDS) a partir das strings SEG-2.
+    """
+    receiver = _location(strings, 'RECEIVER_LOCATION')
+    source = _location(strings, 'SOURCE_LOCATION')
+    dx, dy = receiver[0] - source[0], receiver[1] - source[1]
+    scale = -COORDINATE_SCALAR
+
+    header = {
+        'field_record': field_record,
+        'trace_number': int(_float(strings, 'CHANNEL_NUMBER', index + 1)),
+        'trace_id': 1,
+        'vertical_stack': int(_float(strings, 'STACK', 1)),
+        'offset': round(math.copysign(math.hypot(dx, dy), dx)),
+        'receiver_elevation': round(receiver[2] * scale),
+        'source_elevation': round(source[2] * scale),
+        'elevation_scalar': COORDINATE_SCALAR,
+        'coordinate_scalar': COORDINATE_SCALAR,
+        'source_x': round(source[0] * scale),
+        'source_y': round(source[1] * scale),
+        'receiver_x': round(receiver[0] * scale),
+        'receiver_y': round(receiver[1] * scale),
+        'coordinate_units': 1,
+        'delay': round(_float(strings, 'DELAY') * 1000),
+    }
+    if acquired is not None:
+        header.update({
+            'year': acquired.year,
+            'day': acquired.timetuple().tm_yday,
+            'hour': acquired.hour,
+            'minute': acquired.minute,
+            'second': acquired.second,
+        })
+    return header
+
+
+def _textual_lines(header, num_samples, sample_interval):
+    strings = header['strings']
+    return [
+        f"CLIENT     {strings.get('CLIENT', 'Not Specified')}",
+        f"COMPANY    {strings.get('COMPANY', 'Not Specified')}",
+        f"LINE       {strings.get('LINE_ID', 'Not Specified')}",
+        f"JOB        {strings.get('JOB_ID', 'Not Specified')}",
+        f"RECORDING SYSTEM   {strings.get('INSTRUMENT', 'Not Specified')}",
+        f"OBSERVER           {strings.get('OBSERVER', 'Not Specified')}",
+        f"DATE RECORDED      {strings.get('ACQUISITION_DATE', 'Not Specified')}",
+        f"TIME RECORDED      {strings.get('ACQUISITION_TIME', 'Not Specified')}",
+        f"TRACE SORT         {strings.get('TRACE_SORT', 'Not Specified')}",
+        f"UNITS              {strings.get('UNITS', 'Not Specified')}",
+        f"TRACES {header['num_traces']}  SAMPLES {num_samples}  SAMPLE INTERVAL {sample_interval} US",
+        "SAMPLE FORMAT IEEE FLOAT 32 BITS",
+        f"CONVERTED FROM SEG-2 {header['file']} BY SEIS-PRO",
+    ]
+
+
+def convert_seg2_to_segy(seg2_path, segy_path, buffer_traces=256):
+    """
+    Converte um arquivo SEG-2 para SEG-Y rev1 (formato 5) traço a traço, com data,
+    hora e amostragem das strings SEG-2. O arquivo é escrito em um nome temporário e
+    renomeado no final. Retorna um resumo da conversão.
+    """
+    header = read_seg2_header(seg2_path)
+    acquired = acquisition_datetime(header['strings'])
+    field_record = _field_record(seg2_path, header['strings'])
+    job_id = header['strings'].get('JOB_ID', '')
+
+    tmp_path = segy_path + '.tmp'
+    writer = None
+    try:
+        for index, (strings, samples) in enumerate(iter_seg2_traces(seg2_path, header)):
+            sample_interval = round(_float(strings, 'SAMPLE_INTERVAL') * 1e6)
+            if sample_interval <= 0:
+                raise ValueError(f"Traço {index + 1} sem SAMPLE_INTERVAL em {seg2_path}")
+            if writer is None:
+                writer = SegyWriter(
+                    tmp_path, len(samples), sample_interval,
+                    _textual_lines(header, len(samples), sample_interval),
+                    buffer_traces=buffer_traces,
+                    job_id=int(job_id) if job_id.isdigit() else 0,
+                    traces_per_ensemble=header['num_traces'],
+                )
+            elif len(samples) != writer.num_samples or sample_interval != writer.sample_interval:
+                raise ValueError(f"Traço {index + 1} com amostragem diferente dos demais em {seg2_path}")
+            writer.write_trace(samples, seg2_trace_header(strings, index, field_record, acquired))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(tmp_path)
+        raise
+    if writer is None:
+        raise ValueError(f"Arquivo SEG-2 sem traços: {seg2_path}")
+    writer.close()
+    os.replace(tmp_path, segy_path)
+
+    return {
+        'file': header['file'],
+        'output': segy_path,
+        'num_traces': writer.num_traces,
+        'num_samples': writer.num_samples,
+        'sample_interval': writer.sample_interval,
+        'acquired': acquired.isoformat() if acquired else None,
+    }
+
+
+def list_seg2_paths(directory):
+    """
+    Lista os caminhos dos arquivos SEG-2 do diretório em ordem alfabética.
+    """
+    return [
+        os.path.join(directory, f)
+        for f in sorted(os.listdir(directory)) if f.endswith(SEG2_EXTENSIONS)
+    ]
+
+
+def resolve_seg2_files(path):
+    """
+    Retorna os arquivos SEG-2 de um diretório ou de um padrão glob.
+    """
+    if os.path.isdir(path):
+        return list_seg2_paths(path)
+    return sorted(f for f in glob.glob(path) if os.path.isfile(f))
+
+
+def _convert_into(output_dir, seg2_path):
+    segy_path = os.path.join(output_dir, os.path.splitext(os.path.basename(seg2_path))[0] + '.SGY')
+    try:
+        return convert_seg2_to_segy(seg2_path, segy_path)
+    except (OSError, ValueError, struct.error) as e:
+        return {'file': os.path.basename(seg2_path), 'error': str(e)}
+
+
+def convert_seg2_files(seg2_paths, output_dir, max_workers=None):
+    """
+    Converte em paralelo (um processo por arquivo) uma lista de arquivos SEG-2 para
+    SEG-Y em `output_dir`, com o mesmo nome e extensão .SGY. O Xref.txt da pasta de
+    aquisição é copiado junto se o destino ainda não tiver um. Arquivos que falham
+    são retornados com a chave 'error'.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for directory in sorted({os.path.dirname(p) for p in seg2_paths}):
+        xref_path = os.path.join(directory, XREF_FILE_NAME)
+        if os.path.exists(xref_path) and not os.path.exists(os.path.join(output_dir, XREF_FILE_NAME)):
+            shutil.copy2(xref_path, output_dir)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(seg2_paths)))
+    convert = functools.partial(_convert_into, output_dir)
+    if max_workers == 1:
+        return [convert(path) for path in seg2_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(convert, seg2_paths, chunksize=max(1, len(seg2_paths) // (4 * max_workers))))
@@ -0,0 +1,170 @@
+"""
+Índice persistente dos cabeçalhos SEG-Y de um diretório.
+
+O resumo de cada arquivo fica salvo em um JSON compacto dentro do próprio
+diretório e só é recalculado quando o tamanho ou a data de modificação do
+arquivo mudam. O log de aquisição Xref.txt também é lido aqui.
+"""
+
+import datetime
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .segy_scan import list_segy_paths, scan_segy_header, scan_trace_geometry
+
+INDEX_FILE_NAME = '.seispro_index.json'
+INDEX_VERSION = 1
+
+XREF_FILE_NAME = 'Xref.txt'
+_XREF_LINE = re.compile(
+    r'^(?P<input_file>\S+)\s+(?P<job_id>\S+)\s+(?P<date>\d{2}/\w{3}/\d{4})\s+(?P<time>\d{2}:\d{2}:\d{2})\s+'
+    r'(?P<instrument>.+?)\s+(?P<sample_interval>\d+)uS\s+(?P<num_traces>\d+)\s+(?P<sort_order>\S+)\s+(?P<status>.+?)\s*$'
+)
+
+
+def _acquisition_datetime(first_trace):
+    """
+    Monta a data e hora de aquisição a partir do cabeçalho do primeiro traço, se preenchidas.
+    """
+    if not first_trace or first_trace['year'] <= 0 or first_trace['day'] <= 0:
+        return None
+    try:
+        acquired = datetime.datetime(first_trace['year'], 1, 1) + datetime.timedelta(
+            days=first_trace['day'] - 1,
+            hours=first_trace['hour'],
+            minutes=first_trace['minute'],
+            seconds=first_trace['second'],
+        )
+    except (OverflowError, ValueError):
+        return None
+    return acquired.isoformat()
+
+
+def summarize_segy_file(file_path):
+    """
+    Gera o resumo de um arquivo SEG-Y para o índice: cabeçalhos, data de aquisição e geometria.
+    """
+    stat = os.stat(file_path)
+    try:
+        info = scan_segy_header(file_path)
+        info['acquired'] = _acquisition_datetime(info['first_trace'])
+        info['geometry'] = scan_trace_geometry(file_path, info)
+    except (OSError, ValueError) as e:
+        info = {'file': os.path.basename(file_path), 'size': stat.st_size, 'error': str(e)}
+    info['mtime_ns'] = stat.st_mtime_ns
+    return info
+
+
+def _read_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get('version') != INDEX_VERSION:
+        return {}
+    return index.get('files', {})
+
+
+def _write_index(index_path, entries):
+    """
+    Grava o índice de forma atômica. Diretórios somente leitura são ignorados.
+    """
+    tmp_path = index_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': entries}, f, separators=(',', ':'))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def load_directory_index(directory, max_workers=None):
+    """
+    Retorna o resumo de todos os arquivos SEG-Y do diretório, relendo apenas os
+    arquivos novos ou cujo tamanho/mtime mudou desde a última execução.
+    """
+    index_path = os.path.join(directory, INDEX_FILE_NAME)
+    cached = _read_index(index_path)
+
+    entries = {}
+    stale = []
+    for path in list_segy_paths(directory):
+        name = os.path.basename(path)
+        stat = os.stat(path)
+        entry = cached.get(name)
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            entries[name] = entry
+        else:
+            stale.append(path)
+
+    if stale:
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for info in executor.map(summarize_segy_file, stale):
+                entries[info['file']] = info
+
+    if stale or len(entries) != len(cached):
+        _write_index(index_path, entries)
+
+    return [entries[name] for name in sorted(entries)]
+
+
+def read_xref(directory):
+    """
+    Lê o log de aquisição Xref.txt e retorna um dicionário indexado pelo nome
+    do arquivo sem extensão (ex.: '1' para 1.dat / 1.SGY).
+    """
+    xref_path = os.path.join(directory, XREF_FILE_NAME)
+    if not os.path.exists(xref_path):
+        return {}
+
+    entries = {}
+    with open(xref_path, 'r', encoding='latin-1') as f:
+        for line in f:
+            line = line.replace('\x00', '').rstrip()
+            if not line or line.startswith(('Input File', '-')):
+                continue
+            match = _XREF_LINE.match(line)
+            if match:
+                entry = match.groupdict()
+                entry['sample_interval'] = int(entry['sample_interval'])
+                entry['num_traces'] = int(entry['num_traces'])
+            else:
+                input_file, _, status = line.partition(' ')
+                entry = {'input_file': input_file, 'status': status.strip()}
+            entries[os.path.splitext(entry['input_file'])[0]] = entry
+    return entries
+
+
+def validate_against_xref(info, xref):
+    """
+    Compara o resumo dos cabeçalhos de um arquivo com a linha correspondente do
+    Xref.txt e retorna a lista de divergências (vazia se estiver tudo certo ou
+    se não houver Xref).
+    """
+    if not xref:
+        return []
+    entry = xref.get(os.path.splitext(info['file'])[0])
+    if entry is None:
+        return ["arquivo sem registro no Xref.txt"]
+    if 'instrument' not in entry:
+        return [f"Xref.txt: {entry['status']}"]
+    if 'error' in info:
+        return [f"cabeçalho ilegível: {info['error']}"]
+
+    problems = []
+    if info['sample_interval'] != entry['sample_interval']:
+        problems.append(f"intervalo de amostragem {info['sample_interval']} µs (Xref: {entry['sample_interval']} µs)")
+    if info['num_traces'] != entry['num_traces']:
+        problems.append(f"{info['num_traces']} traços (Xref: {entry['num_traces']})")
+
+    first_trace = info.get('first_trace') or {}
+    if any(first_trace.get(k) for k in ('hour', 'minute', 'second')):
+        header_time = f"{first_trace['hour']:02d}:{first_trace['minute']:02d}:{first_trace['second']:02d}"
+        if header_time != entry['time']:
+            problems.append(f"hora de aquisição {header_time} (Xref: {entry['time']})")
+    return problems
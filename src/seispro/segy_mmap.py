@@ -0,0 +1,153 @@
+"""
+Leitor SEG-Y por mapeamento de memória (np.memmap).
+
+Para arquivos com traços de tamanho fixo retorna uma visão (n_traces, n_samples)
+das amostras, pulando os 240 bytes de cabeçalho de cada traço, sem copiar o
+arquivo para a memória. Amostras em IBM float são convertidas sob demanda,
+em blocos de traços.
+"""
+
+import numpy as np
+
+from .ibm_float import ibm_to_ieee
+from .segy_scan import TRACE_HEADER_SIZE, scan_segy_header
+
+# Campos do cabeçalho de traço SEG-Y rev1: (nome, posição em bytes, tipo)
+TRACE_HEADER_FIELDS = [
+    ('trace_sequence_line', 0, 'i4'),
+    ('trace_sequence_file', 4, 'i4'),
+    ('field_record', 8, 'i4'),
+    ('trace_number', 12, 'i4'),
+    ('energy_source_point', 16, 'i4'),
+    ('cdp', 20, 'i4'),
+    ('cdp_trace', 24, 'i4'),
+    ('trace_id', 28, 'i2'),
+    ('vertical_stack', 30, 'i2'),
+    ('offset', 36, 'i4'),
+    ('receiver_elevation', 40, 'i4'),
+    ('source_elevation', 44, 'i4'),
+    ('source_depth', 48, 'i4'),
+    ('elevation_scalar', 68, 'i2'),
+    ('coordinate_scalar', 70, 'i2'),
+    ('source_x', 72, 'i4'),
+    ('source_y', 76, 'i4'),
+    ('receiver_x', 80, 'i4'),
+    ('receiver_y', 84, 'i4'),
+    ('coordinate_units', 88, 'i2'),
+    ('delay', 108, 'i2'),
+    ('num_samples', 114, 'u2'),
+    ('sample_interval', 116, 'u2'),
+    ('year', 156, 'i2'),
+    ('day', 158, 'i2'),
+    ('hour', 160, 'i2'),
+    ('minute', 162, 'i2'),
+    ('second', 164, 'i2'),
+    ('cdp_x', 180, 'i4'),
+    ('cdp_y', 184, 'i4'),
+    ('inline', 188, 'i4'),
+    ('crossline', 192, 'i4'),
+]
+
+# Código de formato -> tipo NumPy das amostras (sem a ordem dos bytes)
+FORMAT_DTYPES = {
+    1: 'u4',  # IBM float, convertido por ibm_float.ibm_to_ieee
+    2: 'i4',
+    3: 'i2',
+    5: 'f4',
+    6: 'f8',
+    8: 'i1',
+    10: 'u4',
+    11: 'u2',
+    16: 'u1',
+}
+
+
+def trace_header_dtype(byte_order='>'):
+    """
+    Tipo estruturado NumPy para o cabeçalho de traço de 240 bytes.
+    """
+    return np.dtype({
+        'names': [name for name, _, _ in TRACE_HEADER_FIELDS],
+        'formats': [byte_order + fmt for _, _, fmt in TRACE_HEADER_FIELDS],
+        'offsets': [offset for _, offset, _ in TRACE_HEADER_FIELDS],
+        'itemsize': TRACE_HEADER_SIZE,
+    })
+
+
+def trace_record_dtype(num_samples, sample_dtype, byte_order='>'):
+    """
+    Tipo estruturado de um traço completo: cabeçalho de 240 bytes seguido das amostras.
+    """
+    sample_dtype = np.dtype(sample_dtype).newbyteorder(byte_order)
+    return np.dtype({
+        'names': ['header', 'data'],
+        'formats': [trace_header_dtype(byte_order), (sample_dtype, (num_samples,))],
+        'offsets': [0, TRACE_HEADER_SIZE],
+        'itemsize': TRACE_HEADER_SIZE + num_samples * sample_dtype.itemsize,
+    })
+
+
+class IBMTraceArray:
+    """
+    Matriz (n_traces, n_samples) de amostras IBM float mapeadas do disco.
+    Só os traços acessados são convertidos para float32.
+    """
+
+    dtype = np.dtype(np.float32)
+    ndim = 2
+
+    def __init__(self, raw, chunk_traces=256):
+        self._raw = raw
+        self.shape = raw.shape
+        self.chunk_traces = chunk_traces
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        return ibm_to_ieee(self._raw[key])
+
+    def __iter__(self):
+        for _, block in self.iter_chunks():
+            yield from block
+
+    def __array__(self, dtype=None, copy=None):
+        out = ibm_to_ieee(self._raw, chunk_size=self.chunk_traces * self.shape[1])
+        return out if dtype is None else out.astype(dtype)
+
+    @property
+    def T(self):
+        return np.asarray(self).T
+
+    def iter_chunks(self, chunk_traces=None):
+        """
+        Percorre a matriz em blocos de traços já convertidos: (índice inicial, bloco).
+        """
+        chunk_traces = chunk_traces or self.chunk_traces
+        for start in range(0, self.shape[0], chunk_traces):
+            yield start, self[start:start + chunk_traces]
+
+
+def open_segy_memmap(file_path, info=None, chunk_traces=256):
+    """
+    Mapeia um arquivo SEG-Y de traços com tamanho fixo e retorna
+    (dados, cabeçalhos, resumo). Os dados são uma visão (n_traces, n_samples)
+    do arquivo (ou um IBMTraceArray para o formato 1) e os cabeçalhos um array
+    estruturado com os campos de TRACE_HEADER_FIELDS.
+    """
+    if info is None:
+        info = scan_segy_header(file_path)
+
+    format_code = info['format_code']
+    if format_code not in FORMAT_DTYPES:
+        raise ValueError(f"Formato SEG-Y {format_code} não suportado pelo leitor mapeado.")
+    if not info['regular']:
+        raise ValueError(f"Traços de tamanho variável em {file_path}.")
+
+    record = trace_record_dtype(info['num_samples'], FORMAT_DTYPES[format_code], info['byte_order'])
+    traces = np.memmap(file_path, dtype=record, mode='r', offset=info['data_offset'], shape=(info['num_traces'],))
+
+    data = traces['data']
+    if format_code == 1:
+        data = IBMTraceArray(data, chunk_traces=chunk_traces)
+    return data, traces['header'], info
@@ -0,0 +1,231 @@
+"""
+Leitura rápida de cabeçalhos SEG-Y.
+
+Lê apenas o cabeçalho textual (3200 bytes), o cabeçalho binário (400 bytes)
+e o cabeçalho do primeiro traço. O número de traços é calculado a partir do
+tamanho do arquivo, do número de amostras e do código de formato, sem
+decodificar nenhuma amostra.
+"""
+
+import glob
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+SEGY_EXTENSIONS = ('.SEGY', '.SGY')
+
+TEXTUAL_HEADER_SIZE = 3200
+BINARY_HEADER_SIZE = 400
+TRACE_HEADER_SIZE = 240
+
+# Código de formato -> bytes por amostra
+FORMAT_SAMPLE_SIZES = {
+    1: 4,   # IBM float
+    2: 4,   # inteiro 32 bits
+    3: 2,   # inteiro 16 bits
+    4: 4,   # ponto fixo com ganho (obsoleto)
+    5: 4,   # IEEE float
+    6: 8,   # IEEE double
+    8: 1,   # inteiro 8 bits
+    10: 4,  # inteiro 32 bits sem sinal
+    11: 2,  # inteiro 16 bits sem sinal
+    16: 1,  # inteiro 8 bits sem sinal
+}
+
+
+def _detect_byte_order(binary_header):
+    """
+    Descobre a ordem dos bytes pelo código de formato do cabeçalho binário.
+    """
+    for byte_order in ('>', '<'):
+        format_code = struct.unpack_from(byte_order + 'h', binary_header, 24)[0]
+        if format_code in FORMAT_SAMPLE_SIZES:
+            return byte_order, format_code
+    raise ValueError("Código de formato SEG-Y desconhecido no cabeçalho binário.")
+
+
+def _textual_encoding(textual_header):
+    """
+    Identifica se o cabeçalho textual está em EBCDIC ou ASCII.
+    """
+    # Em EBCDIC o espaço é 0x40 e o 'C' inicial é 0xC3
+    if textual_header[:1] == b'\xc3' or textual_header.count(b'\x40') > textual_header.count(b'\x20'):
+        return 'ebcdic'
+    return 'ascii'
+
+
+def scan_segy_header(file_path):
+    """
+    Lê somente os cabeçalhos de um arquivo SEG-Y e retorna um resumo em dicionário.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        textual_header = f.read(TEXTUAL_HEADER_SIZE)
+        binary_header = f.read(BINARY_HEADER_SIZE)
+        if len(binary_header) < BINARY_HEADER_SIZE:
+            raise ValueError(f"Arquivo SEG-Y truncado: {file_path}")
+
+        byte_order, format_code = _detect_byte_order(binary_header)
+
+        def binary_field(offset):
+            return struct.unpack_from(byte_order + 'h', binary_header, offset)[0]
+
+        sample_interval = binary_field(16)
+        num_samples = struct.unpack_from(byte_order + 'H', binary_header, 20)[0]
+        extended_headers = max(binary_field(304), 0)
+
+        data_offset = TEXTUAL_HEADER_SIZE + BINARY_HEADER_SIZE + extended_headers * TEXTUAL_HEADER_SIZE
+        f.seek(data_offset)
+        trace_header = f.read(TRACE_HEADER_SIZE)
+
+    first_trace = {}
+    if len(trace_header) == TRACE_HEADER_SIZE:
+        def trace_field(offset):
+            return struct.unpack_from(byte_order + 'h', trace_header, offset)[0]
+
+        first_trace = {
+            'delay': trace_field(108),
+            'num_samples': struct.unpack_from(byte_order + 'H', trace_header, 114)[0],
+            'sample_interval': trace_field(116),
+            'year': trace_field(156),
+            'day': trace_field(158),
+            'hour': trace_field(160),
+            'minute': trace_field(162),
+            'second': trace_field(164),
+        }
+        # Alguns equipamentos só preenchem os valores no cabeçalho do traço
+        num_samples = num_samples or first_trace['num_samples']
+        sample_interval = sample_interval or first_trace['sample_interval']
+
+    bytes_per_sample = FORMAT_SAMPLE_SIZES[format_code]
+    trace_size = TRACE_HEADER_SIZE + num_samples * bytes_per_sample
+    data_size = max(size - data_offset, 0)
+    num_traces = data_size // trace_size
+
+    return {
+        'file': os.path.basename(file_path),
+        'size': size,
+        'num_traces': num_traces,
+        'num_samples': num_samples,
+        'sample_interval': sample_interval,
+        'format_code': format_code,
+        'byte_order': byte_order,
+        'textual_encoding': _textual_encoding(textual_header),
+        'extended_headers': extended_headers,
+        'data_offset': data_offset,
+        'trace_size': trace_size,
+        'regular': data_size % trace_size == 0,
+        'first_trace': first_trace,
+    }
+
+
+def list_segy_paths(directory):
+    """
+    Lista os caminhos dos arquivos SEG-Y do diretório em ordem alfabética.
+    """
+    return [
+        os.path.join(directory, f)
+        for f in sorted(os.listdir(directory)) if f.endswith(SEGY_EXTENSIONS)
+    ]
+
+
+def resolve_segy_paths(path):
+    """
+    Retorna os arquivos SEG-Y de um diretório ou de um padrão glob.
+    """
+    if os.path.isdir(path):
+        return list_segy_paths(path)
+    return sorted(f for f in glob.glob(path) if os.path.isfile(f))
+
+
+def scan_segy_directory(directory, max_workers=None):
+    """
+    Lê em paralelo os cabeçalhos de todos os arquivos SEG-Y do diretório.
+    Arquivos ilegíveis são retornados com a chave 'error'.
+    """
+    paths = list_segy_paths(directory)
+
+    def scan(path):
+        try:
+            return scan_segy_header(path)
+        except (OSError, ValueError, struct.error) as e:
+            return {'file': os.path.basename(path), 'size': os.path.getsize(path), 'error': str(e)}
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(scan, paths))
+
+
+def _scaled(values, scalars):
+    """
+    Aplica o escalar de coordenadas do SEG-Y (negativo divide, positivo multiplica).
+    """
+    import numpy as np
+
+    scalars = scalars.astype(np.float64)
+    factor = np.ones_like(scalars)
+    factor[scalars > 0] = scalars[scalars > 0]
+    factor[scalars < 0] = -1.0 / scalars[scalars < 0]
+    return values * factor
+
+
+def scan_trace_geometry(file_path, info=None):
+    """
+    Lê apenas os campos de geometria dos cabeçalhos de todos os traços e retorna
+    os intervalos (mínimo, máximo) de offset e coordenadas de fonte e receptor.
+    """
+    import numpy as np
+
+    if info is None:
+        info = scan_segy_header(file_path)
+    if info['num_traces'] == 0:
+        return {}
+
+    bo = info['byte_order']
+    fields = {
+        'field_record': (8, 'i4'),
+        'cdp': (20, 'i4'),
+        'offset': (36, 'i4'),
+        'scalco': (70, 'i2'),
+        'source_x': (72, 'i4'),
+        'source_y': (76, 'i4'),
+        'receiver_x': (80, 'i4'),
+        'receiver_y': (84, 'i4'),
+    }
+    dtype = np.dtype({
+        'names': list(fields),
+        'formats': [bo + fmt for _, fmt in fields.values()],
+        'offsets': [offset for offset, _ in fields.values()],
+        'itemsize': info['trace_size'],
+    })
+    headers = np.memmap(file_path, dtype=dtype, mode='r', offset=info['data_offset'], shape=info['num_traces'])
+
+    geometry = {}
+    for name in fields:
+        if name == 'scalco':
+            continue
+        values = headers[name].astype(np.float64)
+        if name in ('source_x', 'source_y', 'receiver_x', 'receiver_y'):
+            values = _scaled(values, headers['scalco'])
+        geometry[name] = [float(values.min()), float(values.max())]
+    return geometry
+
+
+def sampling_parameters(info):
+    """
+    Parâmetros de amostragem de um resumo de cabeçalhos (scan_segy_header ou índice):
+    intervalo em µs, taxa em Hz, atraso de gravação em s, duração em s e dimensões.
+    """
+    sample_interval = info['sample_interval']
+    if sample_interval <= 0:
+        raise ValueError(f"Intervalo de amostragem inválido no cabeçalho de {info['file']}: {sample_interval}")
+    sample_rate = 1e6 / sample_interval
+    return {
+        'sample_interval': sample_interval,
+        'sample_rate': sample_rate,
+        'delay': info.get('first_trace', {}).get('delay', 0) / 1000.0,
+        'duration': info['num_samples'] / sample_rate,
+        'num_samples': info['num_samples'],
+        'num_traces': info['num_traces'],
+    }
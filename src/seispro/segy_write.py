@@ -0,0 +1,179 @@
+"""
+Escrita de arquivos SEG-Y rev1.
+
+Grava o cabeçalho textual (EBCDIC), o cabeçalho binário e os traços com
+cabeçalhos de 240 bytes e amostras em IEEE float 32 bits (formato 5), no
+mesmo layout dos arquivos de Data/Sismica Ativa. Os traços são acumulados em
+um buffer de registros (cabeçalho + amostras) e gravados em blocos, de modo
+que um arquivo pode ser escrito traço a traço sem chamadas pequenas de write.
+"""
+
+import os
+import struct
+
+import numpy as np
+
+from .segy_mmap import trace_header_dtype, trace_record_dtype
+from .segy_scan import BINARY_HEADER_SIZE
+
+# Campos do cabeçalho binário: nome -> (posição dentro dos 400 bytes, formato struct)
+BINARY_HEADER_FIELDS = {
+    'job_id': (0, 'i'),
+    'line_number': (4, 'i'),
+    'reel_number': (8, 'i'),
+    'traces_per_ensemble': (12, 'h'),
+    'aux_traces_per_ensemble': (14, 'h'),
+    'sample_interval': (16, 'h'),
+    'sample_interval_original': (18, 'h'),
+    'num_samples': (20, 'H'),
+    'num_samples_original': (22, 'H'),
+    'format_code': (24, 'h'),
+    'ensemble_fold': (26, 'h'),
+    'sort_code': (28, 'h'),
+    'measurement_system': (54, 'h'),
+    'revision': (300, 'H'),
+    'fixed_length': (302, 'h'),
+    'extended_headers': (304, 'h'),
+}
+
+TEXTUAL_LINES = 40
+TEXTUAL_LINE_SIZE = 80
+
+
+def textual_header(lines):
+    """
+    Monta o cabeçalho textual de 3200 bytes em EBCDIC. Cada linha recebe o prefixo
+    'Cnn' e é cortada em 80 caracteres; as linhas 39 e 40 identificam a revisão 1.
+    """
+    lines = list(lines)[:TEXTUAL_LINES - 2]
+    lines += [''] * (TEXTUAL_LINES - 2 - len(lines)) + ['SEG Y REV1', 'END TEXTUAL HEADER']
+    text = ''.join(
+        f"C{i:02d} {line}"[:TEXTUAL_LINE_SIZE].ljust(TEXTUAL_LINE_SIZE)
+        for i, line in enumerate(lines, 1)
+    )
+    return text.encode('cp037', errors='replace')
+
+
+def binary_header(num_samples, sample_interval, byte_order='>', **fields):
+    """
+    Monta o cabeçalho binário de 400 bytes (formato 5, traços de tamanho fixo, rev1).
+    Outros campos de BINARY_HEADER_FIELDS podem ser passados por nome.
+    """
+    values = {
+        'sample_interval': sample_interval,
+        'sample_interval_original': sample_interval,
+        'num_samples': num_samples,
+        'num_samples_original': num_samples,
+        'format_code': 5,
+        'ensemble_fold': 1,
+        'sort_code': 1,
+        'measurement_system': 1,
+        'revision': 0x0100,
+        'fixed_length': 1,
+    }
+    values.update(fields)
+
+    header = bytearray(BINARY_HEADER_SIZE)
+    for name, value in values.items():
+        offset, fmt = BINARY_HEADER_FIELDS[name]
+        struct.pack_into(byte_order + fmt, header, offset, value)
+    return bytes(header)
+
+
+def empty_trace_headers(num_traces, byte_order='>'):
+    """
+    Array estruturado de cabeçalhos de traço zerados, com os campos de TRACE_HEADER_FIELDS.
+    """
+    return np.zeros(num_traces, dtype=trace_header_dtype(byte_order))
+
+
+class SegyWriter:
+    """
+    Grava um arquivo SEG-Y rev1 traço a traço. Os traços ficam em um buffer de
+    `buffer_traces` registros e vão para o disco em um único write por bloco.
+
+    Os campos de sequência, número de amostras e intervalo de amostragem de cada
+    cabeçalho de traço são preenchidos automaticamente.
+    """
+
+    def __init__(self, path, num_samples, sample_interval, textual_lines=(), buffer_traces=256, byte_order='>', **binary_fields):
+        self.path = path
+        self.num_samples = num_samples
+        self.sample_interval = sample_interval
+        self.num_traces = 0
+        self._record = trace_record_dtype(num_samples, np.float32, byte_order)
+        self._buffer = np.zeros(buffer_traces, dtype=self._record)
+        self._pending = 0
+        self._file = open(path, 'wb')
+        self._file.write(textual_header(textual_lines))
+        self._file.write(binary_header(num_samples, sample_interval, byte_order, **binary_fields))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fill_headers(self, headers, start):
+        headers['trace_sequence_line'] = np.arange(start + 1, start + 1 + len(headers))
+        headers['trace_sequence_file'] = headers['trace_sequence_line']
+        headers['num_samples'] = self.num_samples
+        headers['sample_interval'] = self.sample_interval
+
+    def write_trace(self, samples, header=None):
+        """
+        Acrescenta um traço. `header` é um dicionário com campos de TRACE_HEADER_FIELDS.
+        """
+        if len(samples) != self.num_samples:
+            raise ValueError(f"Traço com {len(samples)} amostras em um arquivo de {self.num_samples}.")
+        record = self._buffer[self._pending:self._pending + 1]
+        record['header'] = 0
+        for name, value in (header or {}).items():
+            record['header'][name] = value
+        self._fill_headers(record['header'], self.num_traces)
+        record['data'][0] = samples
+        self._pending += 1
+        self.num_traces += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def write_traces(self, data, headers=None):
+        """
+        Acrescenta um bloco (n_traces, n_samples) de traços, com cabeçalhos opcionais
+        no formato de empty_trace_headers.
+        """
+        data = np.asarray(data)
+        if data.ndim != 2 or data.shape[1] != self.num_samples:
+            raise ValueError(f"Bloco de traços {data.shape} incompatível com {self.num_samples} amostras.")
+        self.flush()
+        block = np.zeros(len(data), dtype=self._record)
+        if headers is not None:
+            block['header'] = headers
+        self._fill_headers(block['header'], self.num_traces)
+        block['data'] = data
+        self._file.write(block.tobytes())
+        self.num_traces += len(data)
+
+    def flush(self):
+        if self._pending:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self._pending = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def write_segy(path, data, sample_interval, headers=None, textual_lines=(), **binary_fields):
+    """
+    Grava a matriz (n_traces, n_samples) em um arquivo SEG-Y rev1 de formato 5.
+    O arquivo é escrito em um nome temporário e renomeado no final.
+    """
+    data = np.asarray(data)
+    tmp_path = path + '.tmp'
+    binary_fields.setdefault('traces_per_ensemble', min(len(data), 32767))
+    with SegyWriter(tmp_path, data.shape[1], sample_interval, textual_lines, **binary_fields) as writer:
+        writer.write_traces(data, headers)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,188 @@
+"""
+Espectrogramas e espectros de gathers inteiros.
+
+As janelas de todos os traços são montadas como visões (stride tricks, sem
+cópia) e transformadas com uma única rfft em lote. Os espectrogramas ficam
+em um cache LRU limitado, indexado por (arquivo, traços, nfft, noverlap, fs),
+então mudar só o colormap ou redesenhar não recalcula nenhuma FFT.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def frame_traces(data, nfft, noverlap):
+    """
+    Janelas de `nfft` amostras com passo nfft - noverlap ao longo do tempo.
+    Retorna uma visão (n_traces, n_frames, nfft) sem copiar os dados.
+    """
+    data = np.atleast_2d(data)
+    if nfft > data.shape[-1]:
+        raise ValueError(f"NFFT ({nfft}) maior que o número de amostras ({data.shape[-1]}).")
+    if not 0 <= noverlap < nfft:
+        raise ValueError("noverlap deve estar entre 0 e NFFT - 1.")
+    return sliding_window_view(data, nfft, axis=-1)[:, ::nfft - noverlap, :]
+
+
+def stft_power(data, nfft, noverlap, fs, chunk_traces=64):
+    """
+    Densidade espectral de potência de todos os traços de `data`, com janela de
+    Hanning e a mesma escala do matplotlib.mlab.specgram.
+    Retorna (freqs, times, power) com power em (n_traces, n_freqs, n_frames).
+    """
+    data = np.atleast_2d(data)
+    window = np.hanning(nfft)
+    scale = 1.0 / (fs * np.sum(window ** 2))
+    step = nfft - noverlap
+
+    n_traces = data.shape[0]
+    n_frames = (data.shape[-1] - nfft) // step + 1
+    freqs = np.fft.rfftfreq(nfft, 1.0 / fs)
+    times = (nfft / 2 + step * np.arange(n_frames)) / fs
+
+    power = np.empty((n_traces, len(freqs), n_frames), dtype=np.float64)
+    for start in range(0, n_traces, chunk_traces):
+        frames = frame_traces(np.asarray(data[start:start + chunk_traces], dtype=np.float64), nfft, noverlap)
+        spectrum = np.fft.rfft(frames * window, axis=-1)
+        block = (spectrum.real ** 2 + spectrum.imag ** 2) * scale
+        # espectro unilateral: dobra tudo menos DC (e Nyquist, se nfft par)
+        block[..., 1:-1 if nfft % 2 == 0 else None] *= 2
+        power[start:start + chunk_traces] = block.transpose(0, 2, 1)
+    return freqs, times, power
+
+
+def _amplitude_blocks(data, chunk_traces):
+    """
+    Amplitude espectral dos traços em blocos: (índice inicial, bloco (traços, n_freqs)).
+    Só um bloco fica decodificado por vez, então `data` pode ser mapeado do disco.
+    """
+    if np.ndim(data) == 1:
+        data = np.asarray(data)[None]
+    for start in range(0, data.shape[0], chunk_traces):
+        yield start, np.abs(np.fft.rfft(np.asarray(data[start:start + chunk_traces], dtype=np.float64), axis=-1))
+
+
+def average_spectrum(data, fs, chunk_traces=256):
+    """
+    Espectro de amplitude médio de todos os traços: (freqs, amplitude).
+    """
+    n_samples = data.shape[-1]
+    total = np.zeros(n_samples // 2 + 1)
+    count = 0
+    for _, block in _amplitude_blocks(data, chunk_traces):
+        total += block.sum(axis=0)
+        count += len(block)
+    return np.fft.rfftfreq(n_samples, 1.0 / fs), total / max(count, 1)
+
+
+def fx_amplitude(data, fs, chunk_traces=256, max_traces=None):
+    """
+    Amplitude espectral de cada traço (domínio f-x): (freqs, (n_traces, n_freqs)).
+    Com `max_traces` os grupos de traços consecutivos são reduzidos ao máximo, para
+    que a matriz de exibição não cresça com o gather.
+    """
+    n_traces = data.shape[0] if np.ndim(data) > 1 else 1
+    n_samples = data.shape[-1]
+    factor = max(1, -(-n_traces // max_traces)) if max_traces else 1
+    chunk_traces = max(factor, chunk_traces // factor * factor)
+    amplitude = np.empty((-(-n_traces // factor), n_samples // 2 + 1))
+    for start, block in _amplitude_blocks(data, chunk_traces):
+        amplitude[start // factor:start // factor + -(-len(block) // factor)] = np.maximum.reduceat(block, np.arange(0, len(block), factor), axis=0)
+    return np.fft.rfftfreq(n_samples, 1.0 / fs), amplitude
+
+
+class SpectrogramCache:
+    """
+    Cache LRU de espectrogramas, limitado a `maxsize` entradas.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        value = compute()
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = SpectrogramCache()
+
+
+def _source_key(source):
+    """
+    Identifica o arquivo de origem pelo caminho, tamanho e mtime, para não
+    reaproveitar resultados de um arquivo que foi alterado. Em uma tupla, cada
+    elemento é identificado assim.
+    """
+    if isinstance(source, tuple):
+        return tuple(_source_key(part) for part in source)
+    if isinstance(source, str) and os.path.exists(source):
+        stat = os.stat(source)
+        return os.path.abspath(source), stat.st_size, stat.st_mtime_ns
+    return source
+
+
+def cached_spectrogram(data, traces, nfft, noverlap, fs, source=None, cache=None):
+    """
+    Espectrograma (freqs, times, power) dos traços `traces` de `data`. Se `source`
+    (caminho do arquivo ou outra chave) for fornecido, o resultado fica em cache.
+    """
+    traces = tuple(int(i) for i in traces)
+
+    def compute():
+        return stft_power(np.asarray(data[list(traces)]), nfft, noverlap, fs)
+
+    if source is None:
+        return compute()
+    cache = _cache if cache is None else cache
+    return cache.get((_source_key(source), traces, int(nfft), int(noverlap), float(fs)), compute)
+
+
+def plot_spectrogram(ax, freqs, times, power, cmap='inferno'):
+    """
+    Desenha a média da potência (em dB) dos traços já calculados.
+    """
+    power_db = 10 * np.log10(np.maximum(power.mean(axis=0), 1e-30))
+    extent = (times[0], times[-1], freqs[0], freqs[-1])
+    return ax.imshow(power_db, cmap=cmap, aspect='auto', origin='lower', extent=extent, interpolation='nearest')
+
+
+def plot_average_spectrum(ax, data, fs, color='black'):
+    freqs, amplitude = average_spectrum(data, fs)
+    ax.plot(freqs, amplitude, color=color, lw=1.0)
+    ax.set_xlim(freqs[0], freqs[-1])
+    return freqs, amplitude
+
+
+def plot_fx(ax, data, fs, cmap='inferno', max_traces=2000):
+    freqs, amplitude = fx_amplitude(data, fs, max_traces=max_traces)
+    amplitude_db = 20 * np.log10(np.maximum(amplitude / amplitude.max(), 1e-12))
+    n_traces = data.shape[0] if np.ndim(data) > 1 else 1
+    extent = (-0.5, n_traces - 0.5, freqs[0], freqs[-1])
+    return ax.imshow(amplitude_db.T, cmap=cmap, aspect='auto', origin='lower', extent=extent, vmin=-60, vmax=0)
+
+
+def default_nfft(num_samples):
+    """
+    NFFT padrão: maior potência de 2 que cabe cerca de 8 vezes no traço.
+    """
+    return min(num_samples, max(16, 1 << max(int(num_samples // 8).bit_length() - 1, 0)))
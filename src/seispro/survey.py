@@ -0,0 +1,259 @@
+"""
+Cubo do levantamento: todos os tiros de um diretório em um único array em disco.
+
+A ingestão grava em um diretório:
+
+- `cubo.npy`: float32 (tiros, traços, amostras), aberto com np.load(mmap_mode='r');
+- `cabecalhos.npy`: cabeçalhos de traço estruturados (tiros, traços);
+- `levantamento.json`: arquivo e traços de cada tiro, a amostragem, as linhas
+  do Xref.txt (com as divergências encontradas) e o tamanho e o mtime dos
+  arquivos de entrada, para saber se o cubo está atualizado;
+- uma cópia do Xref.txt.
+
+O cubo é alocado antes, com o tamanho final, e cada processo do pool abre a
+mesma matriz mapeada e copia as amostras do seu arquivo direto para a fatia do
+tiro, em blocos de traços, sem montar a matriz do arquivo na memória. Os tiros
+ficam na ordem numérica dos nomes (1, 2, ..., 10) e tiros com menos traços são
+completados com zeros.
+
+Depois da ingestão, receptor comum e afastamento comum são fatias do cubo, em
+vez de uma leitura por arquivo.
+"""
+
+import json
+import os
+import shutil
+import struct
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .segy_index import XREF_FILE_NAME, read_xref, validate_against_xref
+from .segy_mmap import trace_header_dtype
+from .segy_scan import sampling_parameters, scan_segy_header
+from .velocity import trace_offsets
+
+CUBE_FILE_NAME = 'cubo.npy'
+HEADERS_FILE_NAME = 'cabecalhos.npy'
+SURVEY_FILE_NAME = 'levantamento.json'
+SURVEY_VERSION = 1
+SURVEY_DIR_NAME = '.seispro_cubo'
+INGEST_CHUNK_TRACES = 256
+
+
+def default_survey_dir(directory):
+    """
+    Diretório padrão do cubo: .seispro_cubo dentro do diretório dos tiros.
+    """
+    return os.path.join(directory, SURVEY_DIR_NAME)
+
+
+def shot_order(path):
+    """
+    Chave de ordenação dos tiros: número do nome do arquivo (1.SGY, 2.SGY, ..., 10.SGY)
+    e, para nomes não numéricos, o próprio nome depois deles.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return (0, int(stem), stem) if stem.isdigit() else (1, 0, stem)
+
+
+def _source_stats(paths):
+    stats = {}
+    for path in paths:
+        stat = os.stat(path)
+        stats[os.path.abspath(path)] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def _scan(path):
+    try:
+        return path, scan_segy_header(path)
+    except (OSError, ValueError, struct.error) as e:
+        return path, {'file': os.path.basename(path), 'error': str(e)}
+
+
+def _ingest_shot(cube_dir, shot, path):
+    """
+    Copia as amostras e os cabeçalhos de um arquivo para a fatia `shot` do cubo.
+    """
+    from .reader import read_segy_file
+    from .segy_mmap import IBMTraceArray
+
+    try:
+        data, headers, _ = read_segy_file(path)
+        cube = np.load(os.path.join(cube_dir, CUBE_FILE_NAME), mmap_mode='r+')
+        num_traces = min(data.shape[0], cube.shape[1])
+        if isinstance(data, IBMTraceArray):
+            for start, block in data.iter_chunks(INGEST_CHUNK_TRACES):
+                stop = min(start + len(block), num_traces)
+                cube[shot, start:stop] = block[:stop - start]
+        else:
+            for start in range(0, num_traces, INGEST_CHUNK_TRACES):
+                stop = min(start + INGEST_CHUNK_TRACES, num_traces)
+                cube[shot, start:stop] = data[start:stop]
+        cube.flush()
+        del cube
+        if isinstance(headers, np.ndarray) and headers.dtype.names:
+            header_cube = np.load(os.path.join(cube_dir, HEADERS_FILE_NAME), mmap_mode='r+')
+            header_cube[shot, :num_traces] = headers[:num_traces]
+            header_cube.flush()
+    except (OSError, ValueError, struct.error) as e:
+        return {'file': os.path.basename(path), 'shot': shot, 'error': str(e)}
+    return {'file': os.path.basename(path), 'shot': shot, 'num_traces': num_traces}
+
+
+def ingest_survey(paths, survey_dir, max_workers=None, xref_directory=None):
+    """
+    Empilha os arquivos SEG-Y em um cubo (tiros, traços, amostras) em `survey_dir`.
+    Os tiros devem ter a mesma amostragem; vale a mais comum entre os arquivos e os
+    que divergem dela (ou não podem ser lidos) ficam de fora, com a chave 'error'.
+    `xref_directory` é onde procurar o Xref.txt (padrão: diretório do primeiro arquivo).
+    Retorna a lista de resultados por arquivo, na ordem dos tiros.
+    """
+    paths = sorted(paths, key=shot_order)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(32, max_workers * 4)) as executor:
+        scanned = list(executor.map(_scan, paths))
+
+    readable = [(path, info) for path, info in scanned if 'error' not in info]
+    errors = {path: info for path, info in scanned if 'error' in info}
+    if not readable:
+        return [errors[path] for path in paths]
+    layout = Counter((info['num_samples'], info['sample_interval']) for _, info in readable).most_common(1)[0][0]
+    shots = []
+    for path, info in readable:
+        if (info['num_samples'], info['sample_interval']) == layout:
+            shots.append((path, info))
+        else:
+            errors[path] = {'file': info['file'], 'error': f"amostragem diferente do levantamento ({info['num_samples']} amostras a {info['sample_interval']} µs)"}
+
+    os.makedirs(survey_dir, exist_ok=True)
+    # o json antigo sai antes: uma ingestão interrompida não passa por atualizada
+    survey_path = os.path.join(survey_dir, SURVEY_FILE_NAME)
+    if os.path.exists(survey_path):
+        os.remove(survey_path)
+    shape = (len(shots), max(info['num_traces'] for _, info in shots), layout[0])
+    np.lib.format.open_memmap(os.path.join(survey_dir, CUBE_FILE_NAME), mode='w+', dtype=np.float32, shape=shape).flush()
+    np.lib.format.open_memmap(os.path.join(survey_dir, HEADERS_FILE_NAME), mode='w+', dtype=trace_header_dtype('='), shape=shape[:2]).flush()
+
+    workers = max(1, min(max_workers, len(shots)))
+    shot_paths = [path for path, _ in shots]
+    if workers == 1:
+        written = [_ingest_shot(survey_dir, shot, path) for shot, path in enumerate(shot_paths)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = list(executor.map(_ingest_shot, [survey_dir] * len(shots), range(len(shots)), shot_paths))
+
+    xref_directory = xref_directory or os.path.dirname(paths[0])
+    xref = read_xref(xref_directory)
+    if xref:
+        shutil.copy2(os.path.join(xref_directory, XREF_FILE_NAME), os.path.join(survey_dir, XREF_FILE_NAME))
+
+    records = []
+    for (path, info), result in zip(shots, written):
+        result['problems'] = validate_against_xref(info, xref)
+        records.append({
+            'file': info['file'],
+            'path': os.path.abspath(path),
+            'num_traces': result.get('num_traces', 0),
+            'xref': xref.get(os.path.splitext(info['file'])[0]),
+            'problems': result['problems'],
+            'error': result.get('error'),
+        })
+    sampling = sampling_parameters(shots[0][1])
+    with open(survey_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': SURVEY_VERSION,
+            'shape': list(shape),
+            'sample_interval': sampling['sample_interval'],
+            'sample_rate': sampling['sample_rate'],
+            'delay': sampling['delay'],
+            'shots': records,
+            # todos os arquivos de entrada, inclusive os que ficaram de fora
+            'sources': _source_stats(paths),
+        }, f, ensure_ascii=False)
+
+    results = {path: result for path, result in zip(shot_paths, written)}
+    results.update(errors)
+    return [results[path] for path in paths]
+
+
+def survey_is_current(survey_dir, paths):
+    """
+    True se o cubo em `survey_dir` foi gravado a partir exatamente destes arquivos,
+    sem mudanças de tamanho ou mtime desde então.
+    """
+    try:
+        with open(os.path.join(survey_dir, SURVEY_FILE_NAME), 'r', encoding='utf-8') as f:
+            survey = json.load(f)
+        return survey.get('version') == SURVEY_VERSION and survey['sources'] == _source_stats(paths)
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+class Survey:
+    """
+    Cubo de um levantamento aberto do disco (mapeado em memória).
+    """
+
+    def __init__(self, survey_dir, mmap_mode='r'):
+        with open(os.path.join(survey_dir, SURVEY_FILE_NAME), 'r', encoding='utf-8') as f:
+            self.info = json.load(f)
+        self.directory = survey_dir
+        self.data = np.load(os.path.join(survey_dir, CUBE_FILE_NAME), mmap_mode=mmap_mode)
+        self.headers = np.load(os.path.join(survey_dir, HEADERS_FILE_NAME), mmap_mode=mmap_mode)
+        self.shots = self.info['shots']
+        self.sample_rate = self.info['sample_rate']
+        self.delay = self.info['delay']
+        self.num_traces = np.array([shot['num_traces'] for shot in self.shots])
+        self._offsets = None
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def shot(self, index):
+        """
+        Gather do tiro `index` (traços, amostras), só com os traços gravados.
+        """
+        return self.data[index, :self.num_traces[index]]
+
+    def common_receiver(self, trace):
+        """
+        Gather de receptor comum (tiros, amostras): o canal `trace` de todos os tiros
+        (com o arranjo de receptores fixo, o mesmo receptor).
+        """
+        return self.data[:, trace]
+
+    @property
+    def offsets(self):
+        """
+        Afastamentos (tiros, traços) dos cabeçalhos, NaN nos traços não gravados, ou
+        None se os cabeçalhos não tiverem geometria.
+        """
+        if self._offsets is None:
+            offsets = trace_offsets(np.asarray(self.headers), None)
+            if offsets is None:
+                return None
+            offsets[np.arange(self.shape[1]) >= self.num_traces[:, None]] = np.nan
+            self._offsets = offsets
+        return self._offsets
+
+    def common_offset(self, offset, tolerance=None):
+        """
+        Gather de afastamento comum: em cada tiro, o traço de afastamento mais próximo
+        de `offset`. Retorna (dados (tiros, amostras), afastamentos, índices dos traços);
+        com `tolerance` os tiros sem traço a menos de `tolerance` m ficam de fora.
+        """
+        offsets = self.offsets
+        if offsets is None:
+            raise ValueError("Os cabeçalhos do levantamento não têm afastamentos nem coordenadas.")
+        distance = np.abs(np.nan_to_num(offsets, nan=np.inf) - offset)
+        traces = np.argmin(distance, axis=1)
+        shots = np.arange(self.shape[0])
+        if tolerance is not None:
+            shots = shots[distance[shots, traces] <= tolerance]
+            traces = traces[shots]
+        return self.data[shots, traces], offsets[shots, traces], traces
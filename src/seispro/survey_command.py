@@ -0,0 +1,58 @@
+"""
+Modo de ingestão: empilha os tiros de um diretório no cubo do levantamento,
+em um pool de processos, e mostra o resultado de cada arquivo.
+"""
+
+import os
+import time
+
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+from .segy_scan import resolve_segy_paths
+from .survey import Survey, default_survey_dir, ingest_survey
+
+
+console = Console()
+
+def run_ingest(args):
+    """
+    Grava o cubo dos arquivos de args.ingest_survey em args.survey_out.
+    """
+    segy_files = resolve_segy_paths(args.ingest_survey)
+    if not segy_files:
+        console.print(f"[bold red]Nenhum arquivo SEGY encontrado em: {args.ingest_survey}[/bold red]")
+        return 1
+
+    survey_dir = args.survey_out or default_survey_dir(os.path.dirname(segy_files[0]))
+    workers = max(1, min(args.workers, len(segy_files)))
+    console.print(f"[bold blue]Empilhando {len(segy_files)} tiro(s) em {survey_dir} com {workers} processo(s)...[/bold blue]")
+    start = time.perf_counter()
+    results = ingest_survey(segy_files, survey_dir, max_workers=workers)
+    elapsed = time.perf_counter() - start
+
+    table = Table(title="Ingestão do levantamento")
+    table.add_column("Arquivo", justify="left", style="cyan", no_wrap=True)
+    table.add_column("Posição no cubo", justify="center", style="magenta")
+    table.add_column("Traços", justify="center", style="yellow")
+    table.add_column("Validação (Xref)", justify="left")
+    failures = 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            table.add_row(result['file'], "-", f"[red]erro: {result['error']}[/red]", "-")
+            continue
+        validation = "[green]ok[/green]" if not result['problems'] else "[yellow]" + "; ".join(result['problems']) + "[/yellow]"
+        table.add_row(result['file'], str(result['shot'] + 1), str(result['num_traces']), validation)
+    console.print(table)
+
+    summary = Tree("[bold blue]Resumo[/bold blue]")
+    summary.add(f"[green]Tiros no cubo: {len(results) - failures}[/green]")
+    summary.add(f"[red]Falhas: {failures}[/red]")
+    if failures < len(results):
+        survey = Survey(survey_dir)
+        summary.add(f"[green]Cubo: {' x '.join(map(str, survey.shape))} (tiros x traços x amostras), {survey.data.nbytes / (1024 * 1024):.1f} MB[/green]")
+    summary.add(f"[green]Tempo total: {elapsed:.2f} s[/green]")
+    console.print(summary)
+    return 1 if failures else 0
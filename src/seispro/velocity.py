@@ -0,0 +1,242 @@
+"""
+Correção NMO e análise de velocidade por semblance.
+
+Os gathers são as matrizes (n_traces, n_samples) do read_segy_file, com os
+afastamentos tirados dos cabeçalhos de traço (offset ou coordenadas de fonte e
+receptor) ou, se os cabeçalhos não tiverem geometria, da geometria de
+modelling.model_geophones_and_layers.
+
+A semblance é calculada para um bloco de velocidades de uma vez: os tempos
+sqrt(t0**2 + x**2 / v**2) de todas as velocidades, traços e amostras formam um
+único array (float32), a interpolação linear é um take no gather com colunas de
+zeros no fim, para não precisar de máscara fora do traço, e as somas na
+janela deslizante vêm de somas acumuladas (uma diferença de cumsum por janela),
+sem laços sobre amostras. Vários gathers (tiros ou CMPs) podem ser analisados
+em um pool de processos.
+"""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .segy_scan import _scaled
+
+# Elementos (velocidades x traços x amostras) por bloco da semblance
+SEMBLANCE_CHUNK_ELEMENTS = 1 << 21
+
+
+def trace_offsets(headers, num_traces):
+    """
+    Afastamentos (m) dos traços a partir dos cabeçalhos: o campo offset ou, se ele
+    estiver zerado, a distância entre fonte e receptor. Retorna None se os cabeçalhos
+    não tiverem geometria.
+    """
+    if isinstance(headers, np.ndarray) and headers.dtype.names:
+        offsets = headers['offset'].astype(np.float64)
+        if np.any(offsets):
+            return offsets
+        scalars = headers['coordinate_scalar']
+        dx = _scaled(headers['receiver_x'].astype(np.float64), scalars) - _scaled(headers['source_x'].astype(np.float64), scalars)
+        dy = _scaled(headers['receiver_y'].astype(np.float64), scalars) - _scaled(headers['source_y'].astype(np.float64), scalars)
+        if np.any(dx) or np.any(dy):
+            return np.copysign(np.hypot(dx, dy), dx)
+        return None
+    if hasattr(headers, 'traces'):
+        # SEGYFile do obspy
+        offsets = np.array([
+            trace.header.distance_from_center_of_the_source_point_to_the_center_of_the_receiver_group
+            for trace in headers.traces[:num_traces]
+        ], dtype=np.float64)
+        return offsets if np.any(offsets) else None
+    return None
+
+
+def model_offsets(num_traces):
+    """
+    Afastamentos da geometria padrão de model_geophones_and_layers com `num_traces` geofones.
+    """
+    from .modelling import model_geophones_and_layers
+
+    geophones, source, _ = model_geophones_and_layers(num_geophones=num_traces)
+    return geophones - source
+
+
+def gather_offsets(headers, num_traces):
+    """
+    Afastamentos dos cabeçalhos ou, na falta deles, da geometria do modelo.
+    Retorna (afastamentos, origem: 'cabeçalhos' ou 'modelo').
+    """
+    offsets = trace_offsets(headers, num_traces)
+    if offsets is not None:
+        return offsets, 'cabeçalhos'
+    return model_offsets(num_traces), 'modelo'
+
+
+def file_offsets(segy_file_path, num_traces):
+    """
+    gather_offsets com os cabeçalhos do arquivo SEG-Y (só os cabeçalhos são lidos).
+    """
+    from .reader import read_segy_file
+
+    _, headers, _ = read_segy_file(segy_file_path)
+    return gather_offsets(headers, num_traces)
+
+
+def _interpolate(data, positions):
+    """
+    Interpolação linear de `data` (n_traces, n_samples) nas posições fracionárias
+    não negativas (..., n_traces, n_samples). Depois do fim do traço o resultado é 0.
+    """
+    n_traces, n_samples = data.shape
+    # duas colunas de zeros no fim: posições além do traço caem nelas sem máscara
+    padded = np.zeros((n_traces, n_samples + 2), dtype=np.float32)
+    padded[:, :n_samples] = data
+    positions = np.minimum(positions, np.float32(n_samples))
+    index = positions.astype(np.intp)
+    fraction = positions - index
+    index += np.arange(n_traces)[:, None] * (n_samples + 2)
+    low = padded.take(index)
+    high = padded.take(index + 1)
+    high -= low
+    high *= fraction
+    high += low
+    return high
+
+
+def nmo_positions(data_shape, offsets, velocities, dt, delay=0.0):
+    """
+    Posições (em amostras) de sqrt(t0**2 + x**2 / v**2) para cada t0 do gather, em
+    float32, e o estiramento (t - t0) / t0. `velocities` é um escalar, um array
+    (n_samples,) de v(t0) ou um array (n_velocities, 1, 1) para várias de uma vez.
+    """
+    t0 = (delay + np.arange(data_shape[1]) * dt).astype(np.float32)
+    slowness = (1.0 / np.asarray(velocities, dtype=np.float64)).astype(np.float32)
+    offsets = np.asarray(offsets, dtype=np.float32)[:, None]
+    times = np.sqrt(t0 ** 2 + (offsets * slowness) ** 2)
+    # em t0 = 0 o estiramento é inf ou nan e a amostra sempre cai no silenciamento
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stretch = (times - t0) / np.abs(t0)
+    times -= np.float32(delay)
+    times /= np.float32(dt)
+    return times, stretch
+
+
+def nmo_correct(data, offsets, velocity, dt, delay=0.0, stretch_mute=0.5):
+    """
+    Correção NMO do gather com velocidade constante ou v(t0) (array por amostra).
+    Amostras com estiramento (t - t0) / t0 acima de `stretch_mute` são zeradas.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    positions, stretch = nmo_positions(data.shape, offsets, velocity, dt, delay)
+    corrected = _interpolate(data, positions)
+    if stretch_mute:
+        corrected[stretch > stretch_mute] = 0
+    return corrected
+
+
+def _window_sum(x, half):
+    """
+    Soma em uma janela de 2 * half + 1 amostras centrada em cada amostra (último
+    eixo), por diferença de somas acumuladas.
+    """
+    cumulative = np.cumsum(x, axis=-1, dtype=np.float64)
+    cumulative = np.concatenate((np.zeros(x.shape[:-1] + (1,)), cumulative), axis=-1)
+    n = x.shape[-1]
+    upper = np.minimum(np.arange(n) + half + 1, n)
+    lower = np.maximum(np.arange(n) - half, 0)
+    return cumulative[..., upper] - cumulative[..., lower]
+
+
+def semblance(data, offsets, velocities, dt, delay=0.0, window=0.02, stretch_mute=0.5):
+    """
+    Semblance (n_velocities, n_samples) do gather, com janela de `window` segundos.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    velocities = np.asarray(velocities, dtype=np.float64)
+    n_traces, n_samples = data.shape
+    half = max(0, int(round(window / dt / 2)))
+
+    result = np.empty((len(velocities), n_samples))
+    chunk = max(1, SEMBLANCE_CHUNK_ELEMENTS // (n_traces * n_samples))
+    for start in range(0, len(velocities), chunk):
+        positions, stretch = nmo_positions(data.shape, offsets, velocities[start:start + chunk, None, None], dt, delay)
+        corrected = _interpolate(data, positions)
+        live = positions <= n_samples - 1
+        if stretch_mute:
+            live &= stretch <= stretch_mute
+            corrected *= live
+        stack = corrected.sum(axis=1, dtype=np.float64)
+        energy = np.einsum('vij,vij->vj', corrected, corrected, dtype=np.float64)
+        count = live.sum(axis=1)
+        numerator = _window_sum(stack ** 2, half)
+        denominator = _window_sum(count * energy, half)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[start:start + chunk] = np.where(denominator > 0, numerator / denominator, 0.0)
+    return result
+
+
+def velocity_spectrum(data, offsets, dt, vmin=200.0, vmax=4000.0, num_velocities=100, delay=0.0, window=0.02, stretch_mute=0.5):
+    """
+    Espectro de velocidade do gather: dicionário com 'velocities', 'times',
+    'semblance' (n_velocities, n_samples) e 'picks' (velocidade de maior semblance
+    em cada tempo).
+    """
+    velocities = np.linspace(vmin, vmax, num_velocities)
+    values = semblance(data, offsets, velocities, dt, delay, window, stretch_mute)
+    return {
+        'velocities': velocities,
+        'times': delay + np.arange(values.shape[1]) * dt,
+        'semblance': values,
+        'picks': velocities[np.argmax(values, axis=0)],
+    }
+
+
+def velocity_function(spectrum, threshold=0.5):
+    """
+    Função v(t0) para a correção NMO a partir do espectro: nos tempos em que a
+    semblance máxima passa de `threshold` vezes o máximo do espectro vale o pico
+    da semblance; entre eles a velocidade é interpolada linearmente.
+    """
+    values = spectrum['semblance']
+    strongest = values.max(axis=0)
+    picked = strongest >= threshold * strongest.max() if strongest.max() > 0 else np.zeros_like(strongest, dtype=bool)
+    if not picked.any():
+        return np.full(len(spectrum['times']), spectrum['velocities'][len(spectrum['velocities']) // 2])
+    return np.interp(spectrum['times'], spectrum['times'][picked], spectrum['picks'][picked])
+
+
+def _spectrum_of(options, gather):
+    data, offsets, dt = gather
+    return velocity_spectrum(data, offsets, dt, **options)
+
+
+def velocity_spectra(gathers, max_workers=None, **options):
+    """
+    Espectros de velocidade de vários gathers (tiros ou CMPs), dados como
+    (dados, afastamentos, dt), em um pool de processos. `options` vai para
+    velocity_spectrum.
+    """
+    gathers = list(gathers)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(gathers)))
+    compute = functools.partial(_spectrum_of, options)
+    if max_workers == 1:
+        return [compute(gather) for gather in gathers]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(compute, gathers))
+
+
+def split_gathers(data, headers, offsets, key='cdp'):
+    """
+    Separa os traços em gathers pelo campo `key` dos cabeçalhos (por exemplo 'cdp'
+    ou 'field_record'). Retorna [(valor, dados, afastamentos)] em ordem de valor.
+    """
+    values = np.asarray(headers[key])
+    return [
+        (int(value), np.asarray(data[rows]), offsets[rows])
+        for value in np.unique(values)
+        for rows in [np.flatnonzero(values == value)]
+    ]
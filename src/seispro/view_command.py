@@ -0,0 +1,44 @@
+"""
+Modo de visualização: abre uma seção SEG-Y no visualizador interativo com
+pirâmide de decimação (guardada no cache de matrizes decodificadas).
+"""
+
+import os
+
+from rich.console import Console
+
+from .decode_cache import DecodedCache
+from .instrument import StageProfiler
+from .reader import read_and_decode
+from .segy_scan import sampling_parameters, scan_segy_header
+from .viewer import show_section
+
+
+console = Console()
+
+def run_view(args):
+    """
+    Abre args.view no visualizador interativo.
+    """
+    segy_file_path = args.view
+    if not os.path.isfile(segy_file_path):
+        console.print(f"[bold red]Arquivo SEGY não encontrado: {segy_file_path}[/bold red]")
+        return 1
+    segy_file_name = os.path.basename(segy_file_path)
+    profiler = StageProfiler(segy_file_name, console=console, trace_memory=args.trace_memory)
+
+    sampling = sampling_parameters(scan_segy_header(segy_file_path))
+    fs = args.fs or sampling['sample_rate']
+    cache = None if args.no_cache else DecodedCache(args.cache_dir, args.cache_max_mb)
+    data, _ = read_and_decode(segy_file_path, profiler, cache, args.max_memory_mb)
+    pyramid_dir = cache.pyramid_dir(segy_file_path) if cache is not None else None
+    if pyramid_dir is None:
+        console.print("[bold yellow]Sem cache: a pirâmide é calculada na memória e não será guardada.[/bold yellow]")
+
+    viewer = show_section(data, fs, delay=sampling['delay'], pyramid_dir=pyramid_dir, cmap=args.cmap, mode=args.view_mode, segy_file_name=segy_file_name, profiler=profiler)
+    console.print(profiler.table())
+    if viewer.redraw_seconds:
+        console.print(f"[blue]Redesenhos: {len(viewer.redraw_seconds)}, máximo {max(viewer.redraw_seconds) * 1000:.1f} ms, {viewer.pyramid.tiles_read} ladrilho(s) lido(s)[/blue]")
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
+    return 0
@@ -0,0 +1,121 @@
+"""
+Visualizador interativo de seções grandes, com zoom e pan.
+
+A imagem de intensidade vem da pirâmide de decimação (seispro.pyramid): a cada
+mudança dos limites do eixo só o nível e os ladrilhos da janela visível são
+lidos e a AxesImage recebe uma matriz do tamanho da tela, então o tempo de
+redesenho não cresce com a seção. A roda do mouse aproxima e afasta em torno
+do cursor; o pan e o zoom por retângulo são os da barra do matplotlib.
+"""
+
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from .instrument import timed
+from .pyramid import open_pyramid
+from .wiggle import axes_pixel_size
+
+ZOOM_STEP = 1.25
+
+
+class SectionViewer:
+    """
+    Liga os limites de `ax` à pirâmide: a imagem é refeita para a janela visível.
+    """
+
+    def __init__(self, ax, pyramid, fs, delay=0.0, cmap='gray', mode='pico', xlabel="Traços"):
+        self.ax = ax
+        self.pyramid = pyramid
+        self.fs = fs
+        self.delay = delay
+        self.mode = mode
+        self.level = None
+        self.redraw_seconds = []
+        self._window = None
+
+        n_traces, n_samples = pyramid.shape
+        info = pyramid.info
+        limits = (0.0, info['max_rms']) if mode == 'rms' else (info['min'], info['max'])
+        self.image = ax.imshow(np.zeros((1, 1), dtype=np.float32), cmap=cmap, aspect='auto', interpolation='nearest', vmin=limits[0], vmax=limits[1] or 1.0)
+        ax.set_autoscale_on(False)
+        ax.set_xlim(-0.5, n_traces - 0.5)
+        ax.set_ylim(self._time(n_samples), self._time(0))
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel("Tempo [s]")
+
+        ax.callbacks.connect('xlim_changed', self._on_limits)
+        ax.callbacks.connect('ylim_changed', self._on_limits)
+        canvas = ax.figure.canvas
+        canvas.mpl_connect('scroll_event', self._on_scroll)
+        canvas.mpl_connect('resize_event', self._on_limits)
+        self.update()
+
+    def _time(self, sample_edge):
+        # borda da amostra: a amostra i ocupa [i - 0,5, i + 0,5) / fs
+        return self.delay + (sample_edge - 0.5) / self.fs
+
+    def update(self):
+        """
+        Lê a janela visível da pirâmide e atualiza a imagem. Retorna o nível exibido.
+        """
+        start = time.perf_counter()
+        n_traces, n_samples = self.pyramid.shape
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        traces = (max(0, int(np.floor(x0 + 0.5))), min(n_traces, int(np.ceil(x1 + 0.5))))
+        samples = (max(0, int(np.floor((y0 - self.delay) * self.fs + 0.5))), min(n_samples, int(np.ceil((y1 - self.delay) * self.fs + 0.5))))
+        if traces[0] >= traces[1] or samples[0] >= samples[1]:
+            return self.level
+
+        width_px, height_px = axes_pixel_size(self.ax)
+        image, level, trace_range, sample_range = self.pyramid.window(traces, samples, width_px, height_px, self.mode)
+        window = (level, trace_range, sample_range)
+        if window == self._window:
+            return self.level
+        self._window = window
+        self.level = level
+        self.image.set_data(image.T)
+        self.image.set_extent((trace_range[0] - 0.5, trace_range[1] - 0.5, self._time(sample_range[1]), self._time(sample_range[0])))
+        # redução efetiva da imagem, que pode juntar mais células que o nível
+        trace_factor = (trace_range[1] - trace_range[0]) // max(1, image.shape[0])
+        sample_factor = (sample_range[1] - sample_range[0]) // max(1, image.shape[1])
+        self.ax.set_title(f"Nível {level} (1:{trace_factor} traços, 1:{sample_factor} amostras)", fontsize=10)
+        # só a leitura da janela e a troca da imagem; o desenho fica com o backend
+        self.redraw_seconds.append(time.perf_counter() - start)
+        self.ax.figure.canvas.draw_idle()
+        return self.level
+
+    def _on_limits(self, _event):
+        self.update()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        scale = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        self.ax.set_xlim(event.xdata + (x0 - event.xdata) * scale, event.xdata + (x1 - event.xdata) * scale)
+        self.ax.set_ylim(event.ydata + (y0 - event.ydata) * scale, event.ydata + (y1 - event.ydata) * scale)
+
+
+def show_section(data, fs, delay=0.0, pyramid_dir=None, cmap='gray', mode='pico', segy_file_name='', show=True, profiler=None, xlabel="Traços"):
+    """
+    Abre o visualizador interativo do gather (n_traces, n_samples). A pirâmide é lida
+    de `pyramid_dir` ou calculada (e gravada nele, se for dado). Retorna o SectionViewer.
+    """
+    with timed(profiler, "pirâmide"):
+        pyramid = open_pyramid(data, pyramid_dir)
+
+    with timed(profiler, "renderização"):
+        fig, ax = plt.subplots(figsize=(12, 8), constrained_layout=True)
+        viewer = SectionViewer(ax, pyramid, fs, delay, cmap, mode, xlabel)
+        fig.colorbar(viewer.image, ax=ax, label='RMS' if mode == 'rms' else 'Amplitude')
+        fig.suptitle(f"Seção: {segy_file_name}", fontsize=12, fontweight='bold')
+
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return viewer
@@ -0,0 +1,105 @@
+"""
+Renderização rápida de wiggle / área variável para gathers grandes.
+
+Todos os traços são desenhados em uma única LineCollection (e uma única
+PolyCollection para o preenchimento), em vez de um Line2D por traço. Antes
+de desenhar, os traços e as amostras são decimados conforme a resolução do
+eixo em pixels, então o tempo de renderização depende do tamanho da imagem
+e não do tamanho do gather.
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+
+def axes_pixel_size(ax):
+    """
+    Largura e altura do eixo em pixels.
+    """
+    bbox = ax.get_window_extent()
+    return max(int(bbox.width), 1), max(int(bbox.height), 1)
+
+
+def decimate_traces(n_traces, width_px, min_px_per_trace=2.0):
+    """
+    Índices dos traços a desenhar, com no máximo um traço a cada `min_px_per_trace` pixels.
+    """
+    step = max(1, int(np.ceil(n_traces * min_px_per_trace / width_px)))
+    return np.arange(0, n_traces, step)
+
+
+def decimate_samples(data, t, height_px):
+    """
+    Reduz o eixo do tempo para cerca de 2 pontos por pixel, mantendo o mínimo e o
+    máximo de cada intervalo para não perder os picos.
+    """
+    n_samples = data.shape[1]
+    k = int(np.ceil(n_samples / height_px))
+    if k < 2:
+        return data, t
+
+    n_bins = int(np.ceil(n_samples / k))
+    pad = n_bins * k - n_samples
+    if pad:
+        data = np.pad(data, ((0, 0), (0, pad)), mode='edge')
+        t = np.pad(t, (0, pad), mode='edge')
+    blocks = data.reshape(data.shape[0], n_bins, k)
+
+    decimated = np.empty((data.shape[0], n_bins, 2), dtype=data.dtype)
+    decimated[:, :, 0] = blocks.min(axis=2)
+    decimated[:, :, 1] = blocks.max(axis=2)
+    # a ordem mín/máx em cada intervalo segue a ordem em que ocorrem
+    swap = blocks.argmin(axis=2) > blocks.argmax(axis=2)
+    decimated[swap] = decimated[swap][:, ::-1]
+
+    t_blocks = t.reshape(n_bins, k)
+    t_decimated = np.stack([t_blocks[:, 0], t_blocks[:, -1]], axis=1)
+    return decimated.reshape(data.shape[0], -1), t_decimated.reshape(-1)
+
+
+def plot_wiggle(ax, data, t=None, scale=1.0, max_amplitude=None, fill=True, color='black',
+                fill_color='black', lw=0.5, min_px_per_trace=2.0, rasterized=True):
+    """
+    Desenha o gather (n_traces, n_samples) como wiggle com área variável no eixo `ax`.
+    O traço i fica centrado em x = i e o tempo cresce para baixo.
+    Retorna a LineCollection e a PolyCollection (ou None se fill=False).
+    """
+    n_traces, n_samples = data.shape
+    if t is None:
+        t = np.arange(n_samples)
+    t = np.asarray(t, dtype=np.float64)
+
+    if max_amplitude is None:
+        max_amplitude = float(np.max(np.abs(data))) or 1.0
+
+    width_px, height_px = axes_pixel_size(ax)
+    trace_idx = decimate_traces(n_traces, width_px, min_px_per_trace)
+    # com traços decimados cada wiggle pode ocupar o espaço dos traços omitidos
+    trace_scale = scale * (trace_idx[1] - trace_idx[0] if len(trace_idx) > 1 else 1) / max_amplitude
+
+    traces = np.asarray(data[trace_idx], dtype=np.float32)
+    traces, tt = decimate_samples(traces, t, height_px)
+
+    offsets = trace_idx.astype(np.float64)[:, None]
+    x = offsets + traces * trace_scale
+    segments = np.empty(x.shape + (2,))
+    segments[..., 0] = x
+    segments[..., 1] = tt
+
+    lines = LineCollection(segments, colors=color, linewidths=lw, rasterized=rasterized)
+    ax.add_collection(lines)
+
+    polys = None
+    if fill:
+        # polígono da parte positiva de cada traço, fechado pela linha de base
+        verts = np.empty((len(trace_idx), 2 * len(tt), 2))
+        verts[:, :len(tt), 0] = offsets + np.clip(traces, 0, None) * trace_scale
+        verts[:, :len(tt), 1] = tt
+        verts[:, len(tt):, 0] = offsets
+        verts[:, len(tt):, 1] = tt[::-1]
+        polys = PolyCollection(verts, facecolors=fill_color, edgecolors='none', rasterized=rasterized)
+        ax.add_collection(polys)
+
+    ax.set_xlim(-1, n_traces)
+    ax.set_ylim(t[-1], t[0])
+    return lines, polys